@@ -0,0 +1,157 @@
+"""
+Alert clips decoded and Opus-encoded once, played from memory.
+
+Each clip is encoded by ffmpeg with the same settings discord.FFmpegOpusAudio
+uses, once, into an on-disk Ogg Opus cache keyed by the file's hash and the
+encoder settings (<cache>/<name>-<key>.ogg). Later starts only parse the
+cached file, so no ffmpeg is needed until a clip changes. Playing an alert is
+then PreparedOpusAudio: an AudioSource handing out the prepared packets, no
+process start, no decode.
+
+Clips are chosen by event kind ("center", "tribemember", "player", "beep",
+...), with "default" as the fallback.
+"""
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import time
+
+import discord
+from discord.oggparse import OggStream
+
+import metrics
+
+ENCODER_ARGS = ("-map_metadata", "-1", "-f", "opus", "-c:a", "libopus", "-ar", "48000", "-ac", "2",
+                "-loglevel", "warning", "-fec", "true", "-packet_loss", "15", "-blocksize", "8192")
+FRAME_SEC = 0.02   # one Opus packet per 20 ms frame
+
+_H_FIRST_PACKET = metrics.stage("audio_first_packet")   # play requested -> first packet read by the player
+
+def file_key(path: str, bitrate: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    h.update(repr((ENCODER_ARGS, bitrate)).encode())
+    return h.hexdigest()[:16]
+
+def encode(path: str, ffmpeg: str, bitrate: int = 128) -> bytes:
+    """Ogg Opus bytes of `path`."""
+    args = [ffmpeg, "-i", path, *ENCODER_ARGS, "-b:a", f"{bitrate}k", "pipe:1"]
+    proc = subprocess.run(args, stdin=subprocess.DEVNULL, capture_output=True, timeout=60)
+    if proc.returncode != 0 or not proc.stdout:
+        raise RuntimeError(f"ffmpeg failed ({proc.returncode}): {proc.stderr.decode(errors='replace')[:300]}")
+    return proc.stdout
+
+def parse_packets(ogg: bytes) -> list[bytes]:
+    """Audio packets of an Ogg Opus stream (OpusHead / OpusTags headers dropped)."""
+    return [p for p in OggStream(io.BytesIO(ogg)).iter_packets()
+            if p and not p.startswith((b"OpusHead", b"OpusTags"))]
+
+class PreparedOpusAudio(discord.AudioSource):
+    """
+    Plays a prepared packet list; `requested_at` (perf_counter) times the first
+    packet. read() runs on the voice player thread, so it only records
+    first_packet_ms; the play's after= callback logs it.
+    """
+
+    def __init__(self, packets: list[bytes], name: str = "", requested_at: float | None = None):
+        self.packets = packets
+        self.name = name
+        self.requested_at = requested_at
+        self._i = 0
+        self.first_packet_ms: float | None = None
+
+    def read(self) -> bytes:
+        if self._i >= len(self.packets):
+            return b""
+        if self._i == 0 and self.requested_at is not None:
+            dt = time.perf_counter() - self.requested_at
+            _H_FIRST_PACKET.observe(dt)
+            self.first_packet_ms = dt * 1000.0
+        pkt = self.packets[self._i]
+        self._i += 1
+        return pkt
+
+    def is_opus(self) -> bool:
+        return True
+
+class AlertSounds:
+    """
+    sounds    : {event kind: audio file}, "default" used for kinds without their own clip
+    cache_dir : encoded clips (<name>-<key>.ogg)
+    ffmpeg    : executable, only needed for clips missing from the cache (looked up on PATH
+                again on every attempt if not given)
+    retry_sec : after a clip failed to load, retry_due() stays False this long
+    """
+
+    def __init__(self, sounds: dict[str, str], cache_dir: str, ffmpeg: str | None = None, bitrate: int = 128,
+                 retry_sec: float = 60.0):
+        self.sounds = dict(sounds)
+        self.cache_dir = cache_dir
+        self.ffmpeg = ffmpeg
+        self.bitrate = bitrate
+        self.retry_sec = retry_sec
+        self.clips: dict[str, list[bytes]] = {}   # audio file -> packets
+        self.prepared = False   # every clip loaded
+        self._retry_at = 0.0
+
+    def _load(self, path: str) -> list[bytes]:
+        key = file_key(path, self.bitrate)
+        stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+        cached = os.path.join(self.cache_dir, f"{stem}-{key}.ogg")
+        if os.path.exists(cached):
+            with open(cached, "rb") as f:
+                return parse_packets(f.read())
+        ffmpeg = self.ffmpeg or shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise RuntimeError("ffmpeg not found and no cached encoding")
+        ogg = encode(path, ffmpeg, self.bitrate)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = cached + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(ogg)
+        os.replace(tmp, cached)
+        for name in os.listdir(self.cache_dir):   # older encodings of the same clip
+            if name.startswith(stem + "-") and name.endswith(".ogg") and name != os.path.basename(cached):
+                os.remove(os.path.join(self.cache_dir, name))
+        return parse_packets(ogg)
+
+    def prepare(self) -> bool:
+        """Loads the clips not loaded yet (blocking: run it off the event loop); True once all are."""
+        for path in sorted(set(self.sounds.values())):
+            if path in self.clips:
+                continue
+            t0 = time.perf_counter()
+            try:
+                if not os.path.exists(path):
+                    raise FileNotFoundError(path)
+                self.clips[path] = self._load(path)
+            except Exception as e:
+                print(f"[VOICE] {os.path.basename(path)}: not prepared ({type(e).__name__}: {e})")
+                continue
+            n = len(self.clips[path])
+            print(f"[VOICE] {os.path.basename(path)}: {n} packets ({n * FRAME_SEC:.1f}s) ready "
+                  f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        self.prepared = all(path in self.clips for path in self.sounds.values())
+        if not self.prepared:
+            self._retry_at = time.monotonic() + self.retry_sec
+        return self.prepared
+
+    def retry_due(self) -> bool:
+        """Some clip is not loaded and the last failed attempt is retry_sec old."""
+        return not self.prepared and time.monotonic() >= self._retry_at
+
+    def path_for(self, kind: str) -> str | None:
+        return self.sounds.get(kind) or self.sounds.get("default")
+
+    def source(self, kind: str, requested_at: float | None = None) -> PreparedOpusAudio | None:
+        """In-memory source for this event kind (else the default clip); None if neither is prepared."""
+        for path in (self.sounds.get(kind), self.sounds.get("default")):
+            packets = self.clips.get(path) if path else None
+            if packets:
+                return PreparedOpusAudio(packets, name=f"{kind} ({os.path.basename(path)})",
+                                         requested_at=requested_at)
+        return None
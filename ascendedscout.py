@@ -1,16 +1,36 @@
 import cv2
 import numpy as np
 import pytesseract
-from mss import mss
 import time
 import re
 import os
 import unicodedata
+import argparse
+import atexit
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import ocr_backend
+import preprocess
+import line_cache
+import center_dedup
+import change_detect
+import scheduler
+import capture_pipeline
+import events
+import journal
+import event_store
+import checkpoint
+import frame_source
+import glyph_prefilter
+import calibrate
+import metrics
+import zones as zone_config
 
 # --------------------------------------------------------------------
 # 1) TESSERACT CONFIG
 # --------------------------------------------------------------------
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+# OCR backend: ASCENDEDSCOUT_OCR_BACKEND = auto | tesserocr | pytesseract (see ocr_backend.py)
 
 # --------------------------------------------------------------------
 # 2) LOGS PATHS
@@ -20,20 +40,61 @@ tribemembers_log_path = os.path.join(base_log_path, "tribemembers_log.txt")
 players_log_path      = os.path.join(base_log_path, "players_log.txt")
 center_log_path       = os.path.join(base_log_path, "center_log.txt")
 
+# Journal (see journal.py): open handles, batched flushes, rotation.
+JOURNAL_FLUSH_POLICY  = "interval"   # "event" | "interval" | "count"
+JOURNAL_FLUSH_MS      = 100
+JOURNAL_FLUSH_EVERY   = 20
+JOURNAL_FSYNC         = False
+JOURNAL_ROTATE_BYTES  = 5 * 1024 * 1024
+JOURNAL_ROTATE_SEC    = None
+JOURNAL_KEEP          = 5
+
 # --------------------------------------------------------------------
-# 2.1) CLEAR LOGS FILES ON STARTUP
+# 2.1) START FRESH LOG FILES ON STARTUP
+#      (the previous session is rotated to .1 ... .JOURNAL_KEEP, not deleted)
 # --------------------------------------------------------------------
 def clear_log_files():
     os.makedirs(base_log_path, exist_ok=True)
     for p in (tribemembers_log_path, players_log_path, center_log_path):
         try:
-            if os.path.exists(p):
-                os.remove(p)
+            journal.rotate_file(p, JOURNAL_KEEP)
             with open(p, 'w', encoding='utf-8'):
                 pass
         except Exception as e:
             print(f"[WARN] Unable to clear {p}: {e}")
 
+# --------------------------------------------------------------------
+# 2.2) WARM RESTART (see checkpoint.py)
+#      A recent checkpoint keeps the logs (the bot resumes its tail) and
+#      restores the center dedup window, so lines still on screen are not
+#      posted again; otherwise the logs are rotated as above.
+# --------------------------------------------------------------------
+CHECKPOINT_ENABLED      = True
+CHECKPOINT_FILE         = "scout_checkpoint.json"
+CHECKPOINT_INTERVAL_SEC = 5
+CHECKPOINT_MAX_AGE_SEC  = 15 * 60
+CHECKPOINT_MAX_KEYS     = 512    # newest center timestamps kept
+
+def checkpoint_state() -> dict:
+    with _center_dedup_lock:
+        return {"center_dedup": CENTER_DEDUP.export(CHECKPOINT_MAX_KEYS)}
+
+def start_session() -> checkpoint.Checkpointer | None:
+    """Warm start from the checkpoint, else clear_log_files(); returns the running checkpointer."""
+    if not CHECKPOINT_ENABLED:
+        clear_log_files()
+        return None
+    path = os.path.join(base_log_path, CHECKPOINT_FILE)
+    state = checkpoint.load(path, CHECKPOINT_MAX_AGE_SEC)
+    if state is None:
+        clear_log_files()
+    else:
+        with _center_dedup_lock:
+            CENTER_DEDUP.restore(state.get("center_dedup", {}))
+        print(f"[CHECKPOINT] warm start: logs kept, {len(CENTER_DEDUP)} center timestamps, "
+              f"game day {CENTER_DEDUP.current_day}")
+    return checkpoint.Checkpointer(path, checkpoint_state, CHECKPOINT_INTERVAL_SEC).start()
+
 # --------------------------------------------------------------------
 # 3) OCR PREPROCESSING
 # --------------------------------------------------------------------
@@ -85,6 +146,8 @@ def normalize_ocr_text(s: str) -> str:
 
 # --------------------------------------------------------------------
 # 4) CHANGE DETECTION
+#    The capture pipeline uses change_detect.ChangeDetector (dirty boxes, noise filtered);
+#    has_new_notification() is the original whole-frame boolean test.
 # --------------------------------------------------------------------
 def has_new_notification(current_frame, previous_frame, threshold=50):
     frame_delta = cv2.absdiff(current_frame, previous_frame)
@@ -101,7 +164,11 @@ RE_TS = re.compile(r"Day\s+(\d+),\s+(\d{2})[.:](\d{2})[.:](\d{2})", re.IGNORECAS
 
 RE_OBJ = re.compile(r"Your\s+'([^']{2,80})'\s+was\s+destroyed!?", re.IGNORECASE)
 
-CENTER_SEEN_TS = set()
+_H_PARSE = metrics.stage("parse")   # OCR text -> events, center and top
+
+# shared with the bot: similar objects at the same in-game second are one event
+CENTER_DEDUP = center_dedup.CenterDedup()
+_center_dedup_lock = threading.Lock()  # several center zones may share it
 
 def _center_ts_key_from_match(m: re.Match) -> str:
     day, hh, mm, ss = m.groups()
@@ -120,28 +187,83 @@ def _normalize_center_ocr(s: str) -> str:
     s = re.sub(r"\s+", " ", s).strip()
     return s
 
-def _ocr_center_all(image_bgra) -> str:
-    texts = []
-    for color in ("red", "blue", "green"):
-        try:
-            pre = preprocess_image_for_colored_text(image_bgra, color=color)
-            txt = pytesseract.image_to_string(pre, config="--oem 3 --psm 6 -l eng").strip()
-            if txt:
-                texts.append(txt)
-        except Exception as e:
-            print(f"[OCR center {color}] error: {e}")
+# Center OCR passes run in parallel on a small worker pool.
+# "first sufficient" mode: stop as soon as one pass yields a valid
+# "Day N, HH:MM:SS ... Your 'OBJ' was destroyed!" segment. Only
+# CENTER_OCR_PARALLEL passes are in flight at once, the pass that wins most
+# often first; the next one starts when a pass comes back without a line.
+CENTER_OCR_CONFIG = "--oem 3 --psm 6 -l eng"
+CENTER_PASSES = ("red", "blue", "green", "general")
+CENTER_OCR_FIRST_SUFFICIENT = True
+CENTER_OCR_PARALLEL = 2
+
+_center_pool = ThreadPoolExecutor(max_workers=len(CENTER_PASSES), thread_name_prefix="ocr-center")
+_center_lock = threading.Lock()  # wins / pending are shared by the zone workers
+_center_pass_wins = {p: 0 for p in CENTER_PASSES}
+_center_pending: dict[str, set] = {}  # zone -> passes still running after an early exit
+
+def _ocr_center_pass(pre, name: str, config: str = CENTER_OCR_CONFIG) -> str:
     try:
-        pre = preprocess_image_general(image_bgra)
-        txt = pytesseract.image_to_string(pre, config="--oem 3 --psm 6 -l eng").strip()
-        if txt:
-            texts.append(txt)
+        with metrics.stage("ocr", name).time():
+            return ocr_backend.image_to_string(pre, config=config).strip()
     except Exception as e:
-        print(f"[OCR center general] error: {e}")
+        print(f"[OCR center {name}] error: {e}")
+        return ""
+
+def _center_pass_order(passes=CENTER_PASSES) -> list[str]:
+    # stable sort: ties keep the configured (default red/blue/green/general) order
+    with _center_lock:
+        wins = dict(_center_pass_wins)
+    return sorted(passes, key=lambda p: -wins.get(p, 0))
+
+def _center_variants(image_bgra, zone: str = "center"):
+    # passes left running by an early exit still read the segmenter buffers
+    with _center_lock:
+        pending = _center_pending.pop(zone, set())
+    wait(pending)
+    return preprocess.get_segmenter(zone, _zone_spec(zone).scale).run(image_bgra)
+
+def _ocr_center_variants(variants: dict, first_sufficient: bool | None = None, zone: str = "center") -> str:
+    if first_sufficient is None:
+        first_sufficient = CENTER_OCR_FIRST_SUFFICIENT
+    spec = _zone_spec(zone)
+    passes = spec.passes or CENTER_PASSES
+    config = spec.ocr or CENTER_OCR_CONFIG
+    order = _center_pass_order(passes)
+    width = CENTER_OCR_PARALLEL if first_sufficient else len(order)
+    futures: dict = {}
+    running: set = set()
+    results: dict[str, str] = {}
+    while order or running:
+        while order and len(running) < max(1, width):
+            p = order.pop(0)
+            fut = _center_pool.submit(_ocr_center_pass, variants[p], p, config)
+            futures[fut] = p
+            running.add(fut)
+        done, running = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            results[futures[fut]] = fut.result()
+        winner = next((futures[f] for f in done if first_sufficient and results[futures[f]]
+                       and _center_text_sufficient(results[futures[f]])), None)
+        if winner:
+            with _center_lock:
+                _center_pass_wins[winner] = _center_pass_wins.get(winner, 0) + 1
+                _center_pending.setdefault(zone, set()).update(f for f in running if not f.cancel())
+            break
+    texts = [results[p] for p in passes if results.get(p)]
     fused = " ".join(texts)
     if fused:
-        print(f"[OCR center | fused] => {fused}")
+        print(f"[OCR {zone} | fused] => {fused}")
     return fused
 
+def _ocr_center_all(image_bgra, first_sufficient: bool | None = None, zone: str = "center") -> str:
+    try:
+        variants = _center_variants(image_bgra, zone)
+    except Exception as e:
+        print(f"[OCR {zone} preprocess] error: {e}")
+        return ""
+    return _ocr_center_variants(variants, first_sufficient, zone)
+
 def _valid_object(name: str) -> bool:
     name = name.strip()
     if not (3 <= len(name) <= 80):
@@ -154,23 +276,9 @@ def _valid_object(name: str) -> bool:
         return False
     return True
 
-def process_center_frame(image_bgra):
-    """
-    - Fused OCR (colors + general)
-    - Normalization
-    - Split by timestamp: for EACH segment, search for
-      "Your 'OBJ' was destroyed!" ; if nothing -> ignore (no more empty lines)
-    - Dedup by timestamp (key = Day-HH:MM:SS)
-    """
-    raw = _ocr_center_all(image_bgra)
-    if not raw:
-        return
-
-    text = _normalize_center_ocr(raw)
+def _iter_center_segments(text: str):
+    """Yields (timestamp match, object) for each valid destroyed segment of normalized text."""
     ts_matches = list(RE_TS.finditer(text))
-    if not ts_matches:
-        return
-
     for i, m in enumerate(ts_matches):
         seg_start = m.start()
         seg_end   = ts_matches[i+1].start() if i+1 < len(ts_matches) else len(text)
@@ -178,21 +286,130 @@ def process_center_frame(image_bgra):
 
         obj_m = RE_OBJ.search(seg)
         if not obj_m:
-
             continue
 
         obj = obj_m.group(1).strip()
         if not _valid_object(obj):
             continue
+        yield m, obj
 
-        key = _center_ts_key_from_match(m)
-        if key in CENTER_SEEN_TS:
-            continue
+def _center_text_sufficient(raw: str) -> bool:
+    return next(_iter_center_segments(_normalize_center_ocr(raw)), None) is not None
 
-        line = f"Day {key.split('-')[0]}, {key.split('-')[1]}: Your '{obj}' was destroyed!"
-        write_to_file(center_log_path, line)
-        CENTER_SEEN_TS.add(key)
-        print(f"[CENTER DESTROY] => {line}")
+def _parse_center_text(raw: str) -> tuple[tuple[str, str], ...]:
+    """raw OCR text -> ((ts key, object), ...)"""
+    if not raw:
+        return ()
+    with _H_PARSE.time():
+        text = _normalize_center_ocr(raw)
+        return tuple((_center_ts_key_from_match(m), obj) for m, obj in _iter_center_segments(text))
+
+# Incremental mode: the center frame is cut into notification bands, each band
+# gets a perceptual signature and only bands missing from the cache go to OCR.
+# A cached band is reused as is only when it scrolled up; otherwise (see
+# LineResultCache) its timestamp line is read again before trusting it.
+CENTER_INCREMENTAL = True
+BAND_MARGIN = 3
+_center_line_caches: dict[str, line_cache.LineResultCache] = {}
+
+def _center_line_cache(zone: str) -> line_cache.LineResultCache:
+    cache = _center_line_caches.get(zone)
+    if cache is None:
+        cache = _center_line_caches[zone] = line_cache.LineResultCache(max_entries=256, max_age_sec=600)
+    return cache
+
+def _band_in_boxes(band, boxes) -> bool:
+    y0, y1, x0, x1 = band
+    return any(y0 < by + bh and by < y1 and x0 < bx + bw and bx < x1 for bx, by, bw, bh in boxes)
+
+def _changed_rows(boxes) -> list[tuple[int, int]] | None:
+    return [(by, by + bh) for _, by, _, bh in boxes] if boxes else None
+
+def _band_rows(ink, y0: int, y1: int, scale: int) -> tuple[int, int]:
+    """Variant rows (upscaled by `scale`) of ink rows y0..y1, with a small margin."""
+    return max(0, y0 - BAND_MARGIN) * scale, min(ink.shape[0], y1 + BAND_MARGIN) * scale
+
+def _verify_cached_band(variants, ink, band, cached: tuple, scale: int, zone: str) -> tuple | None:
+    """
+    Untrusted cache hit: OCR only the band's first text line (the timestamp).
+    Returns the cached parse if the timestamps read are the same, the new parse
+    if that line held the whole notification, None if the band must be OCR'd.
+    """
+    y0, y1, x0, x1 = band
+    lines = line_cache.split_line_bands(ink[y0:y1, x0:x1], merge_gap_ratio=0)
+    ly0, ly1 = lines[0][:2] if lines else (0, y1 - y0)
+    r0, r1 = _band_rows(ink, y0 + ly0, y0 + ly1, scale)
+    raw = _ocr_center_variants({p: v[r0:r1] for p, v in variants.items()}, first_sufficient=False, zone=zone)
+    parsed = _parse_center_text(raw)
+    if parsed:
+        return parsed
+    keys = {_center_ts_key_from_match(m) for m in RE_TS.finditer(_normalize_center_ocr(raw))} if raw else set()
+    return cached if keys == {key for key, _ in cached} else None
+
+def _ocr_center_incremental(image_bgra, boxes=None, zone: str = "center") -> list[tuple[str, str]]:
+    variants = _center_variants(image_bgra, zone)
+    seg = preprocess.get_segmenter(zone, _zone_spec(zone).scale)
+    ink = seg.ink_mask()
+    cache = _center_line_cache(zone)
+    cache.new_frame(_changed_rows(boxes))
+    found = []
+    for band in line_cache.split_line_bands(ink):
+        y0, y1, x0, x1 = band
+        if boxes and not _band_in_boxes(band, boxes):
+            continue  # unchanged band, already handled on an earlier frame
+        sig = line_cache.band_signature(ink[y0:y1, x0:x1])
+        hit = cache.get(sig, (y0, y1))
+        parsed = None
+        if hit is not None:
+            entry_id, parsed, trusted = hit
+            if not trusted:
+                parsed = _verify_cached_band(variants, ink, band, parsed, seg.scale, zone)
+                if parsed is not None:
+                    cache.confirm(entry_id, (y0, y1))
+        if parsed is None:
+            # variants are upscaled (seg.scale); crop full-width rows with a small margin
+            r0, r1 = _band_rows(ink, y0, y1, seg.scale)
+            raw = _ocr_center_variants({p: v[r0:r1] for p, v in variants.items()}, zone=zone)
+            parsed = _parse_center_text(raw)
+            cache.put(sig, parsed, (y0, y1))
+        found.extend(parsed)
+    return found
+
+def process_center_frame(image_bgra, boxes=None, zone: str = "center"):
+    """
+    - zone: name of a center-parser zone (own segmenter, line cache and passes)
+    - boxes (optional): changed regions; bands / rows outside them are skipped
+    - Glyph prefilter (if templates exist): no "was destroyed" / "Day" phrase -> no OCR
+    - Incremental mode: only bands not seen before are OCR'd (cached results otherwise)
+    - Fused OCR (colors + general), passes in parallel
+    - Normalization
+    - Split by timestamp: for EACH segment, search for
+      "Your 'OBJ' was destroyed!" ; if nothing -> ignore (no more empty lines)
+    - Dedup by timestamp + fuzzy object name (center_dedup)
+    """
+    if _prefilter_lines(_zone_spec(zone), image_bgra, boxes, max_lines=1) == []:
+        if CENTER_INCREMENTAL:  # lines in the changed rows are gone: forget where they were
+            _center_line_cache(zone).new_frame(_changed_rows(boxes))
+        return  # no notification phrase in the changed rows
+    if CENTER_INCREMENTAL:
+        try:
+            found = _ocr_center_incremental(image_bgra, boxes, zone)
+        except Exception as e:
+            print(f"[OCR {zone} incremental] error: {e}")
+            return
+    else:
+        if boxes:
+            y0, y1 = change_detect.boxes_row_span(boxes, image_bgra.shape[0], margin=BAND_MARGIN)
+            image_bgra = image_bgra[y0:y1]
+        found = _parse_center_text(_ocr_center_all(image_bgra, zone=zone))
+
+    for key, obj in found:
+        day, clock = key.split('-')
+        with _center_dedup_lock:
+            new = CENTER_DEDUP.should_post(int(day), clock, obj)
+        if not new:
+            continue
+        emit_event(events.DestroyedEvent(int(day), clock, obj))
 
 # --------------------------------------------------------------------
 # 6) TOP: joined/left (tolerant regex) — no filter
@@ -208,85 +425,285 @@ PAT_TRIBE = re.compile(
 )
 
 def process_top_line(text):
-    text_clean = normalize_ocr_text(text)
-    for match in PAT_TRIBE.finditer(text_clean):
-        tribemember_flag = bool(match.group(1))
-        player = match.group(2)
-        action = match.group(3).lower()
-        tribemember = "Tribemember " if tribemember_flag else ""
-        log_text = f"{tribemember}{player} has {action} this Ark."
-        file_path = tribemembers_log_path if tribemember_flag else players_log_path
-        write_to_file(file_path, log_text)
-        print(f"[TRIBE/PLAYER] => {log_text}")
+    with _H_PARSE.time():
+        text_clean = normalize_ocr_text(text)
+        matches = [(bool(m.group(1)), m.group(2), m.group(3).lower()) for m in PAT_TRIBE.finditer(text_clean)]
+    for tribemember_flag, player, action in matches:
+        emit_event(events.PlayerEvent(player, action, tribemember_flag))
 
 # --------------------------------------------------------------------
 # 7) OCR ROUTING
+#    Zones come from zones.json (see zones.py); each zone's parser picks the
+#    handler, its preprocess chain / passes / OCR config are applied here.
 # --------------------------------------------------------------------
-def process_notification(image_bgra, zone):
+TOP_CROP_MARGIN = 6
+PLAYER_OCR_CONFIG = "--oem 3 --psm 7 -l eng"
+
+# Glyph prefilter (glyph_prefilter.py): changed rows without a notification phrase skip
+# preprocessing and OCR. "auto" = on for the parsers that have templates in assets/glyphs.
+GLYPH_PREFILTER = os.getenv("ASCENDEDSCOUT_PREFILTER", "auto")   # "auto" | "on" | "off"
+
+_zone_specs: dict[str, zone_config.ZoneSpec] = {z.name: z for z in zone_config.DEFAULT_ZONES}
+_zone_chains: dict[str, object] = {}
+_zone_prefilters: dict[str, glyph_prefilter.GlyphPrefilter | None] = {}
+
+def set_zones(specs):
+    global _zone_specs
+    _zone_specs = {z.name: z for z in specs}
+    _zone_chains.clear()
+    _zone_prefilters.clear()
+
+def _zone_spec(zone: str) -> zone_config.ZoneSpec:
+    spec = _zone_specs.get(zone)
+    if spec is None:
+        # unknown name (e.g. a replay with other zones): treat "top*" as player, anything else as center
+        parser = "player" if zone.startswith("top") else "center"
+        spec = _zone_specs[zone] = zone_config.ZoneSpec(zone, {"top": 0, "left": 0, "width": 1, "height": 1}, parser)
+    return spec
+
+def _zone_chain(spec: zone_config.ZoneSpec):
+    chain = _zone_chains.get(spec.name)
+    if chain is None:
+        chain = _zone_chains[spec.name] = preprocess.build_chain(spec.preprocess)
+    return chain
+
+def _zone_prefilter(spec: zone_config.ZoneSpec):
+    if GLYPH_PREFILTER == "off":
+        return None
+    if spec.name not in _zone_prefilters:
+        pf = glyph_prefilter.for_parser(spec.parser)
+        if pf is None and GLYPH_PREFILTER == "on":
+            print(f"[PREFILTER] {spec.name}: no templates in {glyph_prefilter.default_dir()}, prefilter off")
+        _zone_prefilters[spec.name] = pf
+    return _zone_prefilters[spec.name]
+
+def _prefilter_lines(spec, image_bgra, boxes=None, max_lines=None) -> list[tuple[int, int]] | None:
+    """None: no prefilter for this zone; []: no notification phrase, skip OCR; else the phrase lines."""
+    pf = _zone_prefilter(spec)
+    if pf is None:
+        return None
+    rows = change_detect.boxes_row_span(boxes, image_bgra.shape[0], margin=TOP_CROP_MARGIN) if boxes else None
+    with metrics.stage("prefilter", spec.parser).time():
+        return pf.lines(image_bgra, rows, max_lines=max_lines)
+
+def _process_player_zone(image_bgra, spec, boxes=None):
+    spans = _prefilter_lines(spec, image_bgra, boxes)
+    if spans is None:
+        spans = [change_detect.boxes_row_span(boxes, image_bgra.shape[0], margin=TOP_CROP_MARGIN)] if boxes \
+            else [(0, image_bgra.shape[0])]
+    # one OCR call per phrase line: the player config reads a single line (--psm 7)
+    for y0, y1 in spans:
+        with metrics.stage("preprocess", spec.parser).time():
+            pre = _zone_chain(spec)(image_bgra[y0:y1])
+        with metrics.stage("ocr", spec.parser).time():
+            txt = ocr_backend.image_to_string(pre, config=spec.ocr or PLAYER_OCR_CONFIG).strip()
+        if not txt:
+            continue
+        print(f"[OCR {spec.name} | general] => {txt}")
+        process_top_line(txt)
+
+def _process_center_zone(image_bgra, spec, boxes=None):
+    process_center_frame(image_bgra, boxes, zone=spec.name)
+
+ZONE_HANDLERS = {"player": _process_player_zone, "center": _process_center_zone}
+
+def process_notification(image_bgra, zone, boxes=None):
+    """
+    boxes (optional): changed regions from change_detect.ChangeDetector.
+    OCR is restricted to the rows they cover (full width, so a line whose
+    player name alone changed is still read whole).
+    """
     try:
-        if zone == "top":
-            pre = preprocess_line_top(image_bgra)
-            cfg = "--oem 3 --psm 7 -l eng"
-            txt = pytesseract.image_to_string(pre, config=cfg).strip()
-            if not txt:
-                return
-            print(f"[OCR top | general] => {txt}")
-            process_top_line(txt)
-        elif zone == "center":
-            process_center_frame(image_bgra)
+        spec = _zone_spec(zone)
+        ZONE_HANDLERS[spec.parser](image_bgra, spec, boxes)
     except Exception as e:
         print(f"OCR error: {e}")
 
 # --------------------------------------------------------------------
-# 8) FILE WRITING
+# 8) EVENT OUTPUT: in-process bus (events.BUS) + log files as journal
 # --------------------------------------------------------------------
+JOURNAL_ENABLED = True
+# Indexed history for the bot's !history / !losses / !top-raid-times (see event_store.py);
+# kept across sessions, unlike the log files.
+STORE_ENABLED = os.getenv("ASCENDEDSCOUT_EVENTS_DB", "") != "off"
+
+def _journal_path(event) -> str:
+    if event.kind == "center":
+        return center_log_path
+    return tribemembers_log_path if event.kind == "tribemember" else players_log_path
+
+def emit_event(event):
+    line = event.line()
+    if JOURNAL_ENABLED:
+        write_to_file(_journal_path(event), line)
+    if STORE_ENABLED:
+        get_store().add(event)
+    events.publish(event)
+    tag = "CENTER DESTROY" if event.kind == "center" else "TRIBE/PLAYER"
+    print(f"[{tag}] => {line}")
+
+_journal = None
+_journal_lock = threading.Lock()
+
+def get_journal() -> journal.JournalWriter:
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = journal.JournalWriter(
+                flush_policy=JOURNAL_FLUSH_POLICY, flush_interval_ms=JOURNAL_FLUSH_MS,
+                flush_every=JOURNAL_FLUSH_EVERY, fsync=JOURNAL_FSYNC,
+                rotate_bytes=JOURNAL_ROTATE_BYTES, rotate_interval_sec=JOURNAL_ROTATE_SEC,
+                keep=JOURNAL_KEEP)
+            atexit.register(_journal.close)
+        return _journal
+
+_store = None
+
+def get_store() -> event_store.EventStore:
+    global _store
+    with _journal_lock:
+        if _store is None:
+            _store = event_store.EventStore()
+            atexit.register(_store.close)
+        return _store
+
 def write_to_file(file_path, text):
     if not text.strip():
         return
-    dir_path = os.path.dirname(file_path)
-    if dir_path and not os.path.exists(dir_path):
-        os.makedirs(dir_path, exist_ok=True)
-    with open(file_path, 'a', encoding='utf-8') as f:
-        f.write(text + "\n")
+    get_journal().write(file_path, text)
 
 # --------------------------------------------------------------------
 # 9) MAIN LOOP
 # --------------------------------------------------------------------
-def main():
-    clear_log_files()
-
-    top_zone    = {'top': 0,   'left': 750, 'width': 550, 'height': 100}
-    center_zone = {'top': 211, 'left': 772, 'width': 374, 'height': 539}
-
-    sct = mss()
-    previous_frame_top = None
-    previous_frame_center = None
-
+# Capture scheduling (see scheduler.py): 1 Hz when idle, ~12 Hz right after a change.
+SCHED_IDLE_INTERVAL   = 1.0
+SCHED_ACTIVE_INTERVAL = 0.08
+SCHED_CPU_BUDGET      = 0.5    # fraction of one core
+SCHED_LATENCY_BUDGET  = None   # seconds, caps the idle interval
+SCHED_REPORT_SEC      = 60
+
+# Capture runs on its own thread and feeds one OCR worker per zone (see capture_pipeline.py).
+# Default queue policy per parser (a zone's "queue" overrides it): top lines come and go,
+# so keep a short backlog; the center stack keeps its history on screen, so only the
+# newest frame (with the union of dirty regions) matters.
+ZONE_QUEUE_POLICIES = {"player": "drop-oldest", "center": "coalesce"}
+
+# Frames a change must persist before change_detect reports it, per parser. Each extra
+# frame filters flicker that reverts by then, and delays every notification by one capture
+# interval. The center stack stays on screen, so 2 costs nothing and keeps blinks away from
+# its OCR; a top line can be replaced by the next message within a frame, and the glyph
+# prefilter already drops non-join changes there before OCR, so top zones report at once.
+ZONE_CHANGE_PERSISTENCE = {"player": 1, "center": 2}
+
+# Live capture: zones calibrated for another resolution are recalibrated at startup and
+# whenever the monitor size changes (see calibrate.py). ASCENDEDSCOUT_CALIBRATE=off disables it.
+CALIBRATE_AUTO       = os.getenv("ASCENDEDSCOUT_CALIBRATE", "auto") != "off"
+RESOLUTION_CHECK_SEC = 5
+
+def _calibrate(specs, zones_path) -> bool:
     try:
-        while True:
+        return calibrate.ensure_calibrated(specs, zones_path)
+    except Exception as e:
+        print(f"[CALIBRATE] skipped: {type(e).__name__}: {e}")
+        return False
 
-            scr_top = sct.grab(top_zone)
-            cur_top = np.array(scr_top)
-            if previous_frame_top is not None and has_new_notification(cur_top, previous_frame_top):
-                process_notification(cur_top, "top")
-            previous_frame_top = cur_top
+def _build_pipeline(source, specs):
+    set_zones(specs)
+    zones = zone_config.resolve(specs)
+    policies = {z.name: z.queue or ZONE_QUEUE_POLICIES[z.parser] for z in specs}
+    persistence = {z.name: ZONE_CHANGE_PERSISTENCE[z.parser] for z in specs}
+    print("[ZONES] " + " | ".join(f"{z.name} ({z.parser}) {zones[z.name]}" for z in specs))
+    sched = scheduler.AdaptiveScheduler(
+        zones, idle_interval=SCHED_IDLE_INTERVAL, active_interval=SCHED_ACTIVE_INTERVAL,
+        cpu_budget=SCHED_CPU_BUDGET, latency_budget=SCHED_LATENCY_BUDGET)
+    pipe = capture_pipeline.CapturePipeline(source, zones, process_notification,
+                                            scheduler=sched, policies=policies,
+                                            persistence=persistence)
+    return pipe, sched
+
+def main(source=None, record_path=None, zones_path=None):
+    """
+    source      : frame_source.FrameSource (default: live mss capture)
+    record_path : optional capture file receiving every grabbed frame
+    zones_path  : zone config (default zones.json / ASCENDEDSCOUT_ZONES, see zones.py)
+    """
+    ckpt = start_session()
 
-            scr_center = sct.grab(center_zone)
-            cur_center = np.array(scr_center)
-            if previous_frame_center is not None and has_new_notification(cur_center, previous_frame_center):
-                process_notification(cur_center, "center")
-            previous_frame_center = cur_center
+    specs = zone_config.load_zones(zones_path)
+    source = source or frame_source.MssSource()
+    auto_calibrate = CALIBRATE_AUTO and source.live
+    if auto_calibrate:
+        _calibrate(specs, zones_path)
+        try:
+            screen = calibrate.screen_size()
+        except Exception as e:
+            print(f"[CALIBRATE] no resolution tracking: {type(e).__name__}: {e}")
+            auto_calibrate = False
+    if record_path:
+        source = frame_source.RecordingSource(source, record_path)
+    pipe, sched = _build_pipeline(source, specs)
+    t_start = time.perf_counter()
+    next_report = time.monotonic() + SCHED_REPORT_SEC
+    next_screen_check = time.monotonic() + RESOLUTION_CHECK_SEC
 
-            time.sleep(1)
+    try:
+        pipe.start()
+        while pipe.alive():
+            pipe.join(timeout=1.0)
+            if auto_calibrate and time.monotonic() >= next_screen_check:
+                next_screen_check = time.monotonic() + RESOLUTION_CHECK_SEC
+                size = calibrate.screen_size()
+                if size != screen:
+                    print(f"[CALIBRATE] resolution {screen[0]}x{screen[1]} -> {size[0]}x{size[1]}")
+                    screen = size
+                    if _calibrate(specs, zones_path):
+                        pipe.stop()
+                        pipe.join(timeout=5.0)
+                        pipe, sched = _build_pipeline(source, specs)
+                        pipe.start()
+            if source.live and time.monotonic() >= next_report:
+                print(f"[SCHED] {sched.summary()}")
+                print(f"[QUEUE] {pipe.summary()}")
+                for name, pf in list(_zone_prefilters.items()):
+                    if pf is not None:
+                        print(f"[PREFILTER] {name} {pf.stats()}")
+                js = get_journal().stats()
+                print(f"[JOURNAL] lines={js['lines']} flushes={js['flushes']} rotations={js['rotations']} "
+                      f"flush p50={js['flush_p50_ms']:.2f}ms p95={js['flush_p95_ms']:.2f}ms")
+                if _store is not None:
+                    print(f"[STORE] {_store.stats()}")
+                if ckpt is not None:
+                    print(f"[CHECKPOINT] {ckpt.stats()}")
+                next_report = time.monotonic() + SCHED_REPORT_SEC
     except KeyboardInterrupt:
         print("Interrupted by user.")
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        pipe.stop()
+        pipe.join(timeout=5.0)
+        source.close()
+        get_journal().flush()
+        if _store is not None:
+            _store.flush()
+        if ckpt is not None:
+            ckpt.stop()
+        if not source.live:
+            elapsed = time.perf_counter() - t_start
+            frames = pipe.frames_captured
+            print(f"[SOURCE] {frames} frames in {elapsed:.2f}s ({frames / max(elapsed, 1e-9):.1f} frames/s)")
         print("AscendedScout stopped.")
 
 # --------------------------------------------------------------------
 # 10) ENTRY POINT
 # --------------------------------------------------------------------
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    ap = argparse.ArgumentParser(description="AscendedScout OCR monitor")
+    ap.add_argument("--source", default="live",
+                    help="'live' (default), a PNG frame directory, a .ascap capture file or a video file")
+    ap.add_argument("--record", metavar="PATH", help="record grabbed frames to a .ascap capture file")
+    ap.add_argument("--fast", action="store_true", help="replay as fast as possible instead of real time")
+    ap.add_argument("--zones", metavar="PATH", help="zone config (default: zones.json next to this script)")
+    args = ap.parse_args()
+    main(frame_source.open_source(args.source, realtime=not args.fast), record_path=args.record,
+         zones_path=args.zones)
@@ -0,0 +1 @@
+"""Benchmarks for the AscendedScout OCR pipeline. Run modules with `python -m bench.<name>`."""
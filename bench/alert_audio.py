@@ -0,0 +1,85 @@
+"""
+Time to first Opus packet of an alert: per-alert ffmpeg vs prepared clip.
+
+"ffmpeg" is what play_alert_audio did before alert_audio.py: build a
+discord.FFmpegOpusAudio (starts ffmpeg, decodes and encodes the file) and read
+its first packet. "prepared" builds alert_audio.PreparedOpusAudio from the
+clip loaded at startup and reads its first packet. --load N keeps N processes
+spinning meanwhile, like the OCR workers do. Also reports the one-time cost
+of preparing the clip, cold (ffmpeg encode) and warm (on-disk cache).
+
+    python -m bench.alert_audio [--file "../assets/ALERT NUKE.mp3"] [--reps 20] [--load 4]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import time
+
+import discord
+
+import alert_audio
+from bench.stats import StageStats, format_row
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(10_000))
+
+def first_packet_ffmpeg(path: str, ffmpeg: str) -> float:
+    t0 = time.perf_counter()
+    src = discord.FFmpegOpusAudio(path, executable=ffmpeg)
+    try:
+        src.read()
+        return time.perf_counter() - t0
+    finally:
+        src.cleanup()
+
+def first_packet_prepared(sounds: alert_audio.AlertSounds) -> float:
+    t0 = time.perf_counter()
+    src = sounds.source("center")
+    src.read()
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--file", default=os.path.join(os.path.dirname(__file__), "..", "..", "assets", "ALERT NUKE.mp3"))
+    ap.add_argument("--ffmpeg", default=os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg"))
+    ap.add_argument("--reps", type=int, default=20)
+    ap.add_argument("--load", type=int, default=0, help="busy processes running during the measurement")
+    args = ap.parse_args()
+    if not args.ffmpeg:
+        raise SystemExit("[BENCH] ffmpeg not found (FFMPEG_PATH / PATH)")
+    if not os.path.exists(args.file):
+        raise SystemExit(f"[BENCH] no such file: {args.file}")
+
+    stop = mp.Event()
+    spinners = [mp.Process(target=_spin, args=(stop,), daemon=True) for _ in range(args.load)]
+    for p in spinners:
+        p.start()
+    try:
+        with tempfile.TemporaryDirectory() as cache:
+            prep = {name: StageStats(name) for name in ("prepare.cold", "prepare.warm")}
+            for _ in range(3):
+                shutil.rmtree(cache, ignore_errors=True)
+                for name in ("prepare.cold", "prepare.warm"):
+                    sounds = alert_audio.AlertSounds({"center": args.file}, cache, ffmpeg=args.ffmpeg)
+                    with prep[name].time():
+                        sounds.prepare()
+            stages = {name: StageStats(name) for name in ("first_packet.ffmpeg", "first_packet.prepared")}
+            for _ in range(args.reps):
+                stages["first_packet.ffmpeg"].samples_ms.append(first_packet_ffmpeg(args.file, args.ffmpeg) * 1000.0)
+                stages["first_packet.prepared"].samples_ms.append(first_packet_prepared(sounds) * 1000.0)
+    finally:
+        stop.set()
+        for p in spinners:
+            p.join()
+
+    n = len(sounds.clips[args.file])
+    print(f"[BENCH] {os.path.basename(args.file)}: {n} packets ({n * alert_audio.FRAME_SEC:.1f}s), "
+          f"{sum(map(len, sounds.clips[args.file])) / 1024:.0f} KiB in memory, load={args.load}")
+    for s in (*prep.values(), *stages.values()):
+        print(f"[BENCH] {format_row(s.summary())}")
+
+if __name__ == "__main__":
+    main()
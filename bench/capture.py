@@ -0,0 +1,95 @@
+"""
+Capture-layer cost per frame: bytes allocated (tracemalloc peak during the
+grab) and grab latency, with a stand-in for mss that returns real
+mss.screenshot.ScreenShot objects cut from a static 1920x1080 screen.
+
+Modes:
+- legacy : one grab per zone + np.array() copy (the original main loop)
+- view   : MssSource, union grabs viewed in place (default)
+- pool   : MssSource(pool_size=4), union grabs copied into reusable buffers
+
+The "mss" row is the stand-in alone (the bytearray mss itself allocates).
+
+    python -m bench.capture [--frames 300] [--overlap]
+"""
+import argparse
+import tracemalloc
+
+import numpy as np
+from mss.screenshot import ScreenShot
+
+import frame_source
+import zones as zone_config
+from bench.stats import StageStats, format_row
+
+class FakeSct:
+    """Same contract as mss: a fresh bytearray per grab."""
+
+    def __init__(self, height: int = 1080, width: int = 1920, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.screen = rng.integers(0, 255, (height, width, 4), np.uint8)
+        self._regions: dict[tuple, bytes] = {}  # stands in for the X image / DIB section
+
+    def grab(self, monitor: dict) -> ScreenShot:
+        t, l, h, w = monitor["top"], monitor["left"], monitor["height"], monitor["width"]
+        region = self._regions.get((t, l, h, w))
+        if region is None:
+            region = self._regions[(t, l, h, w)] = self.screen[t:t + h, l:l + w].tobytes()
+        return ScreenShot(bytearray(region), monitor)
+
+    def close(self):
+        pass
+
+def _legacy_grab(sct, zones):
+    return {name: np.array(sct.grab(z)) for name, z in zones.items()}
+
+def measure(name: str, grab, release, frames: int) -> dict:
+    stats = StageStats(name)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            with stats.time():
+                out = grab()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+            for frame in out.values():
+                release(frame)
+            del out
+    finally:
+        tracemalloc.stop()
+    r = stats.summary()
+    r["alloc_kb"] = float(np.median(peaks)) / 1024.0
+    return r
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--overlap", action="store_true", help="add two zones overlapping the center zone")
+    args = ap.parse_args()
+
+    zones = zone_config.resolve(zone_config.DEFAULT_ZONES)
+    if args.overlap:
+        c = zones["center"]
+        zones["center.top"] = {**c, "height": c["height"] // 2}
+        zones["center.wide"] = {**c, "left": c["left"] - 40, "width": c["width"] + 80}
+    sct = FakeSct()
+    px_kb = sum(z["width"] * z["height"] * 4 for z in zones.values()) / 1024.0
+    print(f"[BENCH] zones={len(zones)} grab groups={len(frame_source.plan_grabs(zones))} "
+          f"zone pixels={px_kb:.0f} KB/frame")
+
+    rows = [measure("mss", lambda: {n: sct.grab(z) for n, z in zones.items()}, lambda f: None, args.frames),
+            measure("legacy", lambda: _legacy_grab(sct, zones), lambda f: None, args.frames)]
+    for mode, pool_size in (("view", 0), ("pool", 4)):
+        src = frame_source.MssSource(pool_size=pool_size)
+        src._sct = sct
+        rows.append(measure(mode, lambda: src.grab(zones)[1], src.release, args.frames))
+        if src.pool is not None:
+            print(f"[BENCH] pool {src.pool.stats()}")
+    for r in rows:
+        print(f"[BENCH] {format_row(r)}  alloc={r['alloc_kb']:8.0f} KB/frame")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Worst-case warm-restart checkpoint (checkpoint.py): size, save and load time.
+
+Fills the bot's dedup windows to their caps (every remembered line, the
+newest CHECKPOINT_MAX_KEYS center timestamps with --per-key objects each) and
+times checkpoint.save / load + restore.
+
+    python -m bench.checkpoint [--reps 50] [--per-key 4]
+"""
+import argparse
+import os
+import tempfile
+
+import center_dedup
+import checkpoint
+import ttl_cache
+from bench.stats import StageStats, format_row
+
+LINE_DEDUPE_MAX = 4096      # bot.py
+CHECKPOINT_MAX_KEYS = 512   # bot.py / ascendedscout.py
+
+def build(per_key: int) -> dict:
+    lines = ttl_cache.TTLCache(45, LINE_DEDUPE_MAX, stable_keys=True)
+    for i in range(LINE_DEDUPE_MAX):
+        lines.add(f"Tribemember Survivor{i:05d} has joined this Ark.")
+    dedup = center_dedup.CenterDedup(max_keys=2048, per_key=32)
+    for i in range(2048):
+        for j in range(per_key):
+            dedup.should_post(100 + i // 1000, f"{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+                              f"Metal Wall {j}")
+    return {"offsets": {f"/logs/{n}_log.txt": [123456, 98765] for n in ("tribemembers", "players", "center")},
+            "lines": lines.export(), "center_dedup": dedup.export(CHECKPOINT_MAX_KEYS)}
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--reps", type=int, default=50)
+    ap.add_argument("--per-key", type=int, default=4, help="objects destroyed per game second")
+    args = ap.parse_args()
+    state = build(args.per_key)
+    stages = {name: StageStats(name) for name in ("save", "load+restore")}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bot_checkpoint.json")
+        for _ in range(args.reps):
+            with stages["save"].time():
+                size = checkpoint.save(path, state)
+            with stages["load+restore"].time():
+                loaded = checkpoint.load(path, 60)
+                ttl_cache.TTLCache(45, LINE_DEDUPE_MAX, stable_keys=True).restore(loaded["lines"])
+                center_dedup.CenterDedup().restore(loaded["center_dedup"])
+    print(f"[BENCH] {len(state['lines'])} lines + {len(state['center_dedup']['seen'])} center timestamps "
+          f"x {args.per_key} objects: {size / 1024:.0f} KiB")
+    for s in stages.values():
+        print(f"[BENCH] {format_row(s.summary())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Center dedup on a long synthetic raid session: every destruction is observed
+several times (the notification stays on screen for a few frames) with OCR
+noise, bursts destroy many objects in the same second, and the game day rolls
+over regularly (--day-misreads of the observations read a later day number, which
+must not be taken as a rollover). Compares the previous difflib / unbounded-dict dedup with
+center_dedup.CenterDedup on throughput, accuracy and retained keys.
+
+    python -m bench.dedup [--days 30] [--events-per-day 2000] [--repeats 4] [--noise 0.3] [--day-misreads 0.002]
+"""
+import argparse
+import difflib
+import random
+
+import center_dedup
+from bench.stats import StageStats, format_row
+from bench.synthetic import OBJECTS
+
+EXTRA_OBJECTS = ["Metal Foundation", "Metal Ceiling", "Stone Ceiling", "Wooden Wall", "Tek Wall",
+                 "Metal Doorframe", "Stone Pillar", "Vault", "Auto Turret", "Plant Species X",
+                 "Tek Forcefield", "Metal Ramp", "Industrial Forge", "Cryofridge"]
+OCR_CONFUSIONS = [("l", "I"), ("o", "0"), ("m", "rn"), ("e", "c"), ("a", "o"), ("i", "l"), ("S", "5")]
+
+class LegacyDedup:
+    """The bot's previous center dedup: difflib ratio, per-timestamp lists never evicted."""
+
+    def __init__(self, similarity: float = 0.90):
+        self.similarity = similarity
+        self._seen: dict[str, list[tuple[str, str]]] = {}
+
+    def should_post(self, day: int, clock: str, obj: str, action: str = "destroyed") -> bool:
+        key = center_dedup.ts_key(day, clock)
+        obj = center_dedup.canon_object(obj)
+        seen = self._seen.setdefault(key, [])
+        for prev_obj, prev_act in seen:
+            if prev_act == action and difflib.SequenceMatcher(a=obj, b=prev_obj).ratio() >= self.similarity:
+                return False
+        seen.append((obj, action))
+        del seen[:-6]
+        return True
+
+    def __len__(self):
+        return len(self._seen)
+
+def _noisy(name: str, rng: random.Random, noise: float) -> str:
+    if rng.random() >= noise:
+        return name
+    a, b = rng.choice(OCR_CONFUSIONS)
+    idx = [i for i in range(len(name)) if name.startswith(a, i)]
+    if not idx:
+        return name
+    i = rng.choice(idx)
+    return name[:i] + b + name[i + len(a):]
+
+def raid_session(days: int, events_per_day: int, repeats: int, noise: float, seed: int, day_misreads: float = 0.0):
+    """Yields (observation, truth_id) in arrival order; truth_id is unique per real event."""
+    rng = random.Random(seed)
+    names = OBJECTS + EXTRA_OBJECTS
+    truth_id = 0
+    for day in range(1, days + 1):
+        second = 0
+        emitted = 0
+        while emitted < events_per_day:
+            second += rng.randint(1, 20)
+            clock = f"{second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+            burst = rng.sample(names, min(len(names), rng.choice((1, 1, 2, 3, 6, 12))))
+            window = []
+            for obj in burst:
+                window.extend(((day + (rng.randint(1, 5) if rng.random() < day_misreads else 0), clock,
+                                _noisy(obj, rng, noise)), truth_id) for _ in range(repeats))
+                truth_id += 1
+            emitted += len(burst)
+            rng.shuffle(window)  # several frames, several OCR passes, any order
+            yield from window
+
+def run(engine, session) -> dict:
+    stats = StageStats(type(engine).__name__)
+    posted: dict[int, int] = {}
+    truths = set()
+    max_keys = 0
+    for (day, clock, obj), tid in session:
+        truths.add(tid)
+        with stats.time():
+            ok = engine.should_post(day, clock, obj)
+        if ok:
+            posted[tid] = posted.get(tid, 0) + 1
+        max_keys = max(max_keys, len(engine))
+    r = stats.summary()
+    r["missed"] = len(truths) - len(posted)                      # real events merged away
+    r["extra"] = sum(n - 1 for n in posted.values())             # duplicates that got through
+    r["truth"] = len(truths)
+    r["keys_max"] = max_keys
+    r["keys_end"] = len(engine)
+    return r
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--events-per-day", type=int, default=2000)
+    ap.add_argument("--repeats", type=int, default=4, help="observations per real event")
+    ap.add_argument("--noise", type=float, default=0.3, help="chance an observation has one OCR confusion")
+    ap.add_argument("--day-misreads", type=float, default=0.002, help="chance an observation reads a later day")
+    ap.add_argument("--similarity", type=float, default=0.90)
+    ap.add_argument("--max-keys", type=int, default=2048)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    def session():
+        return raid_session(args.days, args.events_per_day, args.repeats, args.noise, args.seed, args.day_misreads)
+
+    engines = [LegacyDedup(args.similarity),
+               center_dedup.CenterDedup(similarity=args.similarity, max_keys=args.max_keys)]
+    for engine in engines:
+        r = run(engine, session())
+        print(f"[BENCH] {format_row(r)}")
+        print(f"[BENCH] {'':<20} events={r['truth']} missed={r['missed']} extra={r['extra']} "
+              f"keys max={r['keys_max']} end={r['keys_end']}"
+              + (f" rollovers={engine.rollovers}/{args.days - 1} last day={engine.current_day}/{args.days}"
+                 if hasattr(engine, "rollovers") else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Raid burst against a local fake Discord server: N destroyed lines arriving
+over a few seconds, sent the old way (one message per line plus one
+@everyone each, sequentially) and through send_queue.SendDispatcher.
+Reports HTTP calls, 429s, @everyone count and per-line delivery latency.
+
+    python -m bench.discord_send [--walls 40] [--spread 2.0] [--limit 5] [--per 1.0] [--errors 0]
+"""
+import argparse
+import asyncio
+import time
+
+import send_queue
+from bench.fake_discord import FakeDiscord
+from bench.stats import percentile
+
+CHANNEL = 1234
+
+def raid_lines(walls: int) -> list[str]:
+    return [f"Day 312, 14:05:{i % 60:02d}: Your 'Stone Wall' was destroyed!" for i in range(walls)]
+
+async def _arrivals(lines: list[str], spread: float):
+    step = spread / max(1, len(lines) - 1)
+    for i, line in enumerate(lines):
+        if i:
+            await asyncio.sleep(step)
+        yield line, time.monotonic()
+
+async def run_sequential(sender, lines, spread) -> dict[str, float]:
+    """Old handle_log_line: awaited send per line, then a separate @everyone."""
+    submitted = {}
+    pending: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        async for line, ts in _arrivals(lines, spread):
+            submitted[line] = ts
+            pending.put_nowait(line)
+        pending.put_nowait(None)
+
+    async def consume():
+        while (line := await pending.get()) is not None:
+            await sender.send(CHANNEL, line)
+            await sender.send(CHANNEL, send_queue.ALERT_TEXT)
+
+    await asyncio.gather(produce(), consume())
+    return submitted
+
+async def run_dispatcher(sender, lines, spread, coalesce_ms) -> tuple[dict[str, float], dict]:
+    dispatcher = send_queue.SendDispatcher(sender, coalesce_ms=coalesce_ms)
+    submitted = {}
+    async for line, ts in _arrivals(lines, spread):
+        submitted[line] = ts
+        dispatcher.submit(CHANNEL, line, alert=True)
+    await dispatcher.close()
+    return submitted, dispatcher.stats()
+
+def _latencies(fake: FakeDiscord, submitted: dict[str, float]) -> list[float]:
+    out = []
+    for line, ts in submitted.items():
+        hit = next((t for t, _, content in fake.messages if line in content.split("\n")), None)
+        if hit is not None:
+            out.append((hit - ts) * 1000.0)
+    return sorted(out)
+
+async def bench(mode: str, args) -> None:
+    fake = FakeDiscord(limit=args.limit, per=args.per, errors=args.errors)
+    base = await fake.start()
+    sender = send_queue.RestSender("fake-token", api_base=base)
+    lines = raid_lines(args.walls)
+    try:
+        if mode == "sequential":
+            submitted = await run_sequential(sender, lines, args.spread)
+        else:
+            submitted, _ = await run_dispatcher(sender, lines, args.spread, args.coalesce_ms)
+    finally:
+        await sender.close()
+        await fake.stop()
+    lat = _latencies(fake, submitted)
+    mentions = sum(content.count("@everyone") for _, _, content in fake.messages)
+    print(f"[BENCH] {mode:<11} http={sender.calls:<4} 429={sender.rate_limited:<3} messages={len(fake.messages):<4} "
+          f"@everyone={mentions:<3} delivered={len(lat)}/{len(lines)} "
+          f"latency p50={percentile(lat, 0.5):8.1f}ms p95={percentile(lat, 0.95):8.1f}ms "
+          f"last={lat[-1] if lat else 0.0:8.1f}ms")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--walls", type=int, default=40)
+    ap.add_argument("--spread", type=float, default=2.0, help="seconds over which the lines arrive")
+    ap.add_argument("--limit", type=int, default=5, help="fake server: messages per window per channel")
+    ap.add_argument("--per", type=float, default=1.0, help="fake server: window in seconds (Discord: 5)")
+    ap.add_argument("--errors", type=int, default=0, help="fake server: the first N requests get a 502")
+    ap.add_argument("--coalesce-ms", type=int, default=250)
+    ap.add_argument("--modes", nargs="+", default=["sequential", "dispatcher"])
+    args = ap.parse_args()
+    for mode in args.modes:
+        asyncio.run(bench(mode, args))
+
+if __name__ == "__main__":
+    main()
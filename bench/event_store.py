@@ -0,0 +1,92 @@
+"""
+Event store (event_store.py) over months of history.
+
+Fills a temporary database with --days of synthetic events (join / leave
+traffic from --players names, --raids raids a day of --raid-size
+destructions each) through EventStore, then times the bot's queries:
+!history on random players, !losses over the last night / week / month and
+!top-raid-times.
+
+    python -m bench.event_store [--days 180] [--raids 2] [--reps 200]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import event_store
+import events
+from bench.stats import StageStats, format_row
+
+OBJECTS = ("Stone Wall", "Metal Wall", "Metal Foundation", "Stone Foundation", "Metal Door", "Behemoth Gate",
+           "Auto Turret", "Heavy Auto Turret", "Tek Turret", "Large Wood Storage Box", "Vault", "Generator")
+
+def fill(store: event_store.EventStore, days: int, players: int, joins: int, raids: int, raid_size: int,
+         rng: random.Random, now: float) -> int:
+    names = [f"Survivor{i:04d}" for i in range(players)]
+    n = 0
+    t0 = now - days * 86400
+    for d in range(days):
+        day0 = t0 + d * 86400
+        evs = []
+        for _ in range(joins):
+            ts = day0 + rng.uniform(0, 86400)
+            evs.append(events.PlayerEvent(rng.choice(names), rng.choice(("joined", "left")),
+                                          rng.random() < 0.1, ts=ts, origin=None))
+        for _ in range(raids):
+            start = day0 + rng.uniform(0, 86400 - 3600)
+            for i in range(raid_size):
+                ts = start + i * rng.uniform(1, 20)
+                evs.append(events.DestroyedEvent(d + 1, time.strftime("%H:%M:%S", time.gmtime(ts)),
+                                                 rng.choice(OBJECTS), ts=ts, origin=None))
+        evs.sort(key=lambda e: e.ts)
+        with store._lock:   # bulk load: skip the live dedup
+            store._pending.extend(evs)
+        store.flush()
+        n += len(evs)
+    return n
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--days", type=int, default=180)
+    ap.add_argument("--players", type=int, default=400)
+    ap.add_argument("--joins", type=int, default=600, help="join / leave events per day")
+    ap.add_argument("--raids", type=int, default=2, help="raids per day")
+    ap.add_argument("--raid-size", type=int, default=80, help="destructions per raid")
+    ap.add_argument("--reps", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.db")
+        store = event_store.EventStore(path, flush_ms=60_000)
+        t0 = time.perf_counter()
+        n = fill(store, args.days, args.players, args.joins, args.raids, args.raid_size, rng, now)
+        dt = time.perf_counter() - t0
+        store.close()
+        size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        print(f"[BENCH] {n} events over {args.days} days written in {dt:.2f}s ({n / dt:,.0f}/s, "
+              f"one transaction per day), {size / 2**20:.1f} MiB")
+
+        reader = event_store.EventReader(path)
+        stages = {name: StageStats(name) for name in
+                  ("history", "history.prefix", "losses.12h", "losses.7d", "losses.30d", "top_raid_times")}
+        for _ in range(args.reps):
+            with stages["history"].time():
+                reader.history(f"Survivor{rng.randrange(args.players):04d}")
+            with stages["history.prefix"].time():
+                reader.history(f"survivor{rng.randrange(args.players // 10):03d}")
+            for span, key in ((12 * 3600, "losses.12h"), (7 * 86400, "losses.7d"), (30 * 86400, "losses.30d")):
+                with stages[key].time():
+                    reader.losses(now - span)
+            with stages["top_raid_times"].time():
+                reader.top_raid_times()
+        reader.close()
+    for s in stages.values():
+        print(f"[BENCH] {format_row(s.summary())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Minimal local stand-ins for Discord: the "create message" endpoint and the
+gateway side of voice.
+
+FakeDiscord: POST /channels/{id}/messages is accepted at `limit` requests per
+`per` seconds per channel (fixed window, like Discord's per-route buckets)
+with X-RateLimit-* headers; requests over the limit get a 429 with
+retry_after. With `global_limit`, more than that many requests in a second
+(any channel) get a global 429. The first `errors` requests get a 502, like
+a Discord / Cloudflare hiccup. Accepted messages are recorded with their
+arrival time.
+
+FakeClient: the part of discord.Client guild_voice.py uses (guilds,
+get_guild, voice channels, voice clients). Joining a voice channel takes
+`connect_ms`; plays are recorded with their start time.
+"""
+import asyncio
+import collections
+import time
+
+from aiohttp import web
+
+class FakeDiscord:
+    def __init__(self, limit: int = 5, per: float = 5.0, global_limit: int | None = None, errors: int = 0):
+        self.limit = limit
+        self.per = per
+        self.global_limit = global_limit
+        self.errors = errors
+        self._recent: collections.deque[float] = collections.deque()
+        self.messages: list[tuple[float, int, str]] = []  # (monotonic ts, channel, content)
+        self.requests = 0
+        self.rejected = 0
+        self._windows: dict[int, tuple[float, int]] = {}  # channel -> (window start, used)
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    async def _create_message(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.requests <= self.errors:
+            return web.Response(status=502, text="Bad Gateway")
+        channel = int(request.match_info["channel_id"])
+        now = time.monotonic()
+        if self.global_limit:
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.global_limit:
+                self.rejected += 1
+                retry_after = 1.0 - (now - self._recent[0])
+                return web.json_response({"message": "You are being rate limited.", "retry_after": retry_after,
+                                          "global": True}, status=429, headers={"X-RateLimit-Global": "true"})
+            self._recent.append(now)
+        start, used = self._windows.get(channel, (now, 0))
+        if now - start >= self.per:
+            start, used = now, 0
+        reset_after = max(0.0, self.per - (now - start))
+        if used >= self.limit:
+            self.rejected += 1
+            return web.json_response({"message": "You are being rate limited.", "retry_after": reset_after,
+                                      "global": False}, status=429,
+                                     headers={"X-RateLimit-Limit": str(self.limit), "X-RateLimit-Remaining": "0",
+                                              "X-RateLimit-Reset-After": f"{reset_after:.3f}"})
+        used += 1
+        self._windows[channel] = (start, used)
+        body = await request.json()
+        self.messages.append((now, channel, body.get("content", "")))
+        return web.json_response({"id": str(len(self.messages)), "channel_id": str(channel),
+                                  "content": body.get("content", "")},
+                                 headers={"X-RateLimit-Limit": str(self.limit),
+                                          "X-RateLimit-Remaining": str(self.limit - used),
+                                          "X-RateLimit-Reset-After": f"{reset_after:.3f}"})
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post("/channels/{channel_id}/messages", self._create_message)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+class FakeVoiceClient:
+    def __init__(self, channel: "FakeVoiceChannel"):
+        self.channel = channel
+        self.connected = True
+        self.plays: list[float] = []   # perf_counter at each play()
+        self._playing = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def stop(self):
+        self._playing = False
+
+    def play(self, source, after=None):
+        self.plays.append(time.perf_counter())
+        self._playing = True
+
+    async def move_to(self, channel: "FakeVoiceChannel"):
+        self.channel = channel
+
+    async def disconnect(self, force: bool = False):
+        self.connected = False
+        self.channel.guild.voice_client = None
+
+class FakeVoiceChannel:
+    def __init__(self, guild: "FakeGuild", channel_id: int, connect_ms: float):
+        self.guild = guild
+        self.id = channel_id
+        self.name = f"alerts-{channel_id}"
+        self.connect_ms = connect_ms
+
+    async def connect(self, timeout: float = 15.0, reconnect: bool = True) -> FakeVoiceClient:
+        await asyncio.sleep(self.connect_ms / 1000.0)
+        self.guild.voice_client = FakeVoiceClient(self)
+        return self.guild.voice_client
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.voice_client: FakeVoiceClient | None = None
+        self.channels: dict[int, FakeVoiceChannel] = {}
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+class FakeClient:
+    def __init__(self, connect_ms: float = 50.0):
+        self.connect_ms = connect_ms
+        self._guilds: dict[int, FakeGuild] = {}
+
+    def add_guild(self, guild_id: int, voice_channel_id: int) -> FakeGuild:
+        guild = self._guilds[guild_id] = FakeGuild(guild_id)
+        guild.channels[voice_channel_id] = FakeVoiceChannel(guild, voice_channel_id, self.connect_ms)
+        return guild
+
+    @property
+    def guilds(self) -> list[FakeGuild]:
+        return list(self._guilds.values())
+
+    def get_guild(self, guild_id: int) -> FakeGuild | None:
+        return self._guilds.get(guild_id)
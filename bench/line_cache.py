@@ -0,0 +1,104 @@
+"""
+Center line cache (line_cache.py): hit rate on a scrolling raid, and a
+regression check that destruction lines one timestamp digit apart never
+get each other's cached parse.
+
+A stack of --depth entries scrolls up by one entry per frame (--frames
+frames); every band is looked up as ascendedscout._ocr_center_incremental
+does, and counted as a trusted hit (no OCR), an untrusted hit (timestamp
+line re-read) or a miss (band OCR'd).
+
+The check renders "Day 312, 14:05:3N: Your 'Stone Wall' was destroyed!" for
+every N, (a) replacing the previous line in place and (b) appearing below
+it as it scrolls up. A new line must never be a trusted hit; the scrolled
+line must be. Exits non-zero if the check fails.
+
+    python -m bench.line_cache [--frames 200] [--depth 9] [--jitter 6]
+"""
+import argparse
+import sys
+
+import numpy as np
+
+import line_cache
+import preprocess
+from bench.stats import StageStats, format_row
+from bench.synthetic import CENTER_SIZE, background, render_center, _jitter
+
+BODY = "Your 'Stone Wall' was destroyed!"
+
+def bands(seg: preprocess.ColorSegmenter, frame: np.ndarray) -> list[tuple[np.ndarray, tuple[int, int]]]:
+    seg.run(frame)
+    ink = seg.ink_mask()
+    return [(line_cache.band_signature(ink[y0:y1, x0:x1]), (y0, y1))
+            for y0, y1, x0, x1 in line_cache.split_line_bands(ink)]
+
+def lookup(cache: line_cache.LineResultCache, sig, rows, truth: str) -> str | None:
+    """Like _ocr_center_incremental with a perfect OCR; returns the value a trusted hit handed out."""
+    hit = cache.get(sig, rows)
+    if hit is not None and hit[2]:
+        return hit[1][0]
+    if hit is not None and hit[1] == (truth,):   # verification re-read the same timestamp
+        cache.confirm(hit[0], rows)
+        return None
+    cache.put(sig, (truth,), rows)
+    return None
+
+def one_digit_check(seg, bg) -> list[str]:
+    failures = []
+    for mode in ("in place", "below"):
+        cache = line_cache.LineResultCache()
+        prev = None
+        for n in range(10):
+            prefix = f"Day 312, 14:05:3{n}:"
+            entries = [(prefix, BODY, "red")] if mode == "in place" or prev is None else \
+                [(prev, BODY, "red"), (prefix, BODY, "red")]
+            cache.new_frame()
+            for (sig, rows), (text, _, _) in zip(bands(seg, render_center(entries, bg)), entries):
+                got = lookup(cache, sig, rows, text)
+                if text == prefix and got is not None:
+                    failures.append(f"{mode}: new line {prefix} got the cached parse of {got}")
+                if text != prefix and got != text:
+                    failures.append(f"{mode}: scrolled line {text} was not a trusted hit ({got})")
+            prev = prefix
+    return failures
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--frames", type=int, default=200)
+    ap.add_argument("--depth", type=int, default=9, help="entries on screen")
+    ap.add_argument("--jitter", type=float, default=0.0, help="per-frame background noise (sigma)")
+    args = ap.parse_args()
+    rng = np.random.default_rng(1234)
+    bg = background(CENTER_SIZE, rng)
+    seg = preprocess.ColorSegmenter(scale=2)
+
+    failures = one_digit_check(seg, bg)
+    for f in failures:
+        print(f"[BENCH] FAIL {f}")
+    print(f"[BENCH] one-digit timestamps: {'FAIL' if failures else 'ok'} (10 lines, in place and below)")
+
+    cache = line_cache.LineResultCache()
+    stage = StageStats("band lookup")
+    entries = []
+    tints = ("red", "blue", "green")
+    for i in range(args.frames):
+        entries = (entries + [(f"Day 312, {14 + i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}:",
+                               f"Your 'Stone Wall {i % 7}' was destroyed!", tints[i % 3])])[-args.depth:]
+        cache.new_frame()
+        for (sig, rows), (text, _, _) in zip(bands(seg, render_center(entries, _jitter(bg, rng, args.jitter))),
+                                             entries):
+            with stage.time():
+                if lookup(cache, sig, rows, text) not in (None, text):
+                    failures.append(f"{text} got a wrong cached parse")
+    total = cache.hits + cache.unverified + cache.misses
+    print(f"[BENCH] {args.frames} frames, {total} bands: {cache.hits / max(1, total):.1%} trusted hits, "
+          f"{cache.unverified / max(1, total):.1%} timestamp re-reads, {cache.misses / max(1, total):.1%} OCR'd "
+          f"(ideal: {args.frames / max(1, total):.1%} OCR'd, one new line per frame)")
+    print(f"[BENCH] {format_row(stage.summary())}")
+    if failures:
+        print(f"[BENCH] FAIL {len(failures)} wrong cached parses, first: {failures[0]}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
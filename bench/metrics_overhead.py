@@ -0,0 +1,151 @@
+"""
+Cost of the metrics layer (metrics.py) on the scout pipeline.
+
+Synthetic frames are kept in memory and replayed on one thread through the
+instrumented hot path: grab and diff timers, change detection and
+ascendedscout.process_notification (prefilter, preprocessing, OCR, parsing,
+journal). There is no capture thread, no file IO and no pacing, and each run
+is timed in process CPU time, so the replay is CPU-bound and repeatable.
+
+Runs are short and interleaved off / on / on / off; each repetition gives the
+ratio of its two "on" runs to its two "off" runs, which cancels slow drift
+(CPU clock, noisy neighbours). The overhead is the median ratio with a 95%
+confidence interval, and the target is met when the whole interval is below
+it. OCR is a stand-in that burns --ocr-ms of CPU per call: 0 (default) leaves
+only the cheap stages, the worst case for relative overhead.
+
+    python -m bench.metrics_overhead [--duration 20] [--reps 60] [--ocr-ms 0]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import statistics
+import tempfile
+import time
+
+import ascendedscout as scout
+import capture_pipeline
+import change_detect
+import frame_source
+import metrics
+import ocr_backend
+import zones as zone_config
+from bench.pipeline import _redirect_logs
+from bench.synthetic import SyntheticStream
+
+TARGET = 0.01   # acceptable overhead (upper bound of the confidence interval)
+
+class BusyOcr:
+    name = "busy"
+
+    def __init__(self, ms: float):
+        self.sec = ms / 1000.0
+
+    def image_to_string(self, image, config: str = ""):
+        end = time.process_time() + self.sec
+        while time.process_time() < end:
+            pass
+        return ""
+
+    def close(self):
+        pass
+
+def load(stream: SyntheticStream) -> list[dict]:
+    return [{zone: frame_source._to_bgra(img) for zone, img in tick.frames.items()}
+            for tick in stream.ticks()]
+
+def replay(ticks: list[dict], enabled: bool, persistence: dict) -> float:
+    """One pass over the frames as the capture loop and the zone workers would run it; CPU seconds."""
+    metrics.set_enabled(enabled)
+    detectors = {z: change_detect.ChangeDetector() for z in ticks[0]}
+    for z, det in detectors.items():
+        det.persistence = max(1, persistence.get(z, 1))
+    gc.collect()
+    t0 = time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frames in ticks:
+            with capture_pipeline._H_GRAB.time():
+                pass
+            for zone, cur in frames.items():
+                t = time.perf_counter()
+                boxes = detectors[zone].update(cur)
+                capture_pipeline._H_DIFF.observe(time.perf_counter() - t)
+                if boxes:
+                    scout.process_notification(cur, zone, boxes)
+    return time.process_time() - t0
+
+def median_ci(values: list[float]) -> tuple[float, float]:
+    """Distribution-free 95% confidence interval of the median (order statistics)."""
+    s = sorted(values)
+    n = len(s)
+    h = int(1.96 * n ** 0.5 / 2)
+    return s[max(0, (n - 1) // 2 - h)], s[min(n - 1, n // 2 + h)]
+
+def observe_cost_ns(n: int = 200_000) -> tuple[float, float]:
+    h = metrics.REGISTRY.histogram("bench_seconds")
+    out = []
+    for enabled in (True, False):
+        metrics.set_enabled(enabled)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            with h.time():
+                pass
+        out.append((time.perf_counter() - t0) / n * 1e9)
+    metrics.set_enabled(True)
+    return out[0], out[1]
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rate", type=float, default=2.0, help="events per second")
+    ap.add_argument("--fps", type=float, default=2.0, help="frames per second per zone")
+    ap.add_argument("--duration", type=float, default=20.0, help="simulated seconds per run")
+    ap.add_argument("--reps", type=int, default=60, help="off/on/on/off repetitions")
+    ap.add_argument("--ocr-ms", type=float, default=0.0, help="simulated OCR call cost (CPU)")
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args()
+
+    on_ns, off_ns = observe_cost_ns()
+    print(f"[BENCH] timed block: {on_ns:.0f} ns enabled, {off_ns:.0f} ns disabled")
+
+    ocr_backend.set_backend(BusyOcr(args.ocr_ms))
+    specs = zone_config.load_zones(None)
+    scout.set_zones(specs)
+    persistence = {z.name: scout.ZONE_CHANGE_PERSISTENCE[z.parser] for z in specs}
+    ticks = load(SyntheticStream(rate=args.rate, fps=args.fps, duration=args.duration, seed=args.seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        _redirect_logs(tmp)
+        replay(ticks, True, persistence)  # warm-up: segmenter buffers, caches, thread pools
+        before = metrics.REGISTRY.snapshot()["histograms"]
+        replay(ticks, True, persistence)
+        after = metrics.REGISTRY.snapshot()["histograms"]
+        ratios, offs = [], []
+        gc.disable()
+        try:
+            for _ in range(args.reps):
+                off1 = replay(ticks, False, persistence)
+                on1 = replay(ticks, True, persistence)
+                on2 = replay(ticks, True, persistence)
+                off2 = replay(ticks, False, persistence)
+                ratios.append((on1 + on2) / (off1 + off2) - 1)
+                offs += [off1, off2]
+        finally:
+            gc.enable()
+            metrics.set_enabled(True)
+            scout.get_journal().flush()
+    observations = sum(h["count"] for h in after if h["name"] != "bench_seconds") \
+        - sum(h["count"] for h in before if h["name"] != "bench_seconds")
+    per_frame = observations / len(ticks)
+    overhead = statistics.median(ratios)
+    lo, hi = median_ci(ratios)
+    off = statistics.median(offs)
+    spread = (max(offs) - min(offs)) / off
+    est = per_frame * (on_ns - off_ns) * 1e-9 * len(ticks) / off
+    print(f"[BENCH] {len(ticks)} frames x {args.reps} reps, {per_frame:.1f} observations/frame, "
+          f"{off * 1000:.0f} ms CPU per run (run-to-run spread {spread:.0%})")
+    print(f"[BENCH] metrics on vs off: {overhead:+.2%} median (95% CI {lo:+.2%} .. {hi:+.2%}), "
+          f"estimated {est:.2%} (observations x cost per timed block)")
+    print(f"[BENCH] overhead target < {TARGET:.0%}: {'ok' if hi < TARGET else 'MISSED'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Fan-out of a raid to N guilds (routing.py, guild_voice.py) against the local
+fake Discord server and gateway (bench/fake_discord.py).
+
+Each guild has a center and a players channel and a voice channel. A burst of
+--walls destroyed lines and --players join lines arrives over --spread
+seconds and is delivered:
+
+- serial : one awaited send per line per guild (single-guild code looped over guilds)
+- routed : RoutingTable.fan_out onto send_queue.SendDispatcher (per-channel
+           queues, coalesced bursts) plus a VoiceFleet alert in every guild
+
+Reports per guild count: HTTP calls, 429s, per (guild, line) delivery latency
+and, for routed, voice join time and alert-to-play latency across guilds. The
+fake server enforces --limit/--per per channel and --global-limit per second
+like Discord.
+
+    python -m bench.multi_guild [--guilds 1 5 20 50] [--walls 20]
+"""
+import argparse
+import asyncio
+import time
+
+import guild_voice
+import routing
+import send_queue
+from bench.fake_discord import FakeClient, FakeDiscord
+from bench.stats import percentile
+
+def make_routes(n: int) -> list[routing.GuildRoute]:
+    routes = []
+    for i in range(n):
+        base = (i + 1) << 32
+        routes.append(routing.GuildRoute(f"guild{i}", (i + 1) << 22, voice_channel_id=base + 1,
+                                         channels={"center": base + 2, "player": base + 3}))
+    return routes
+
+def traffic(walls: int, players: int) -> list[tuple[str, str]]:
+    lines = [("center", f"Day 312, 14:05:{i % 60:02d}: Your 'Stone Wall {i}' was destroyed!") for i in range(walls)]
+    step = max(1, walls // max(1, players))
+    for j in range(players):
+        lines.insert(min(len(lines), j * (step + 1)), ("player", f"Survivor{j:03d} has joined this Ark."))
+    return lines
+
+async def _arrivals(lines, spread: float):
+    step = spread / max(1, len(lines) - 1)
+    for i, item in enumerate(lines):
+        if i:
+            await asyncio.sleep(step)
+        yield item, time.monotonic()
+
+async def run_serial(sender, table, lines, spread) -> dict[str, float]:
+    submitted = {}
+    pending: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        async for (kind, line), ts in _arrivals(lines, spread):
+            submitted[line] = ts
+            pending.put_nowait((kind, line))
+        pending.put_nowait(None)
+
+    async def consume():
+        while (item := await pending.get()) is not None:
+            kind, line = item
+            for channel_id in table.channels(kind):
+                await sender.send(channel_id, line)
+
+    await asyncio.gather(produce(), consume())
+    return submitted
+
+async def run_routed(sender, table, fleet, lines, spread, coalesce_ms) -> tuple[dict[str, float], float | None]:
+    dispatcher = send_queue.SendDispatcher(sender, coalesce_ms=coalesce_ms)
+    submitted, plays, alert_at = {}, [], None
+    async for (kind, line), ts in _arrivals(lines, spread):
+        submitted[line] = ts
+        alert = kind == "center"
+        table.fan_out(dispatcher, kind, line, alert=alert)
+        if alert:
+            alert_at = alert_at or time.perf_counter()
+            plays.append(asyncio.create_task(fleet.play(lambda: None, kind=kind)))
+    await dispatcher.close()
+    await asyncio.gather(*plays)
+    return submitted, alert_at
+
+def _latencies(fake: FakeDiscord, submitted: dict[str, float], table) -> tuple[list[float], int]:
+    first: dict[tuple[int, str], float] = {}
+    for t, channel, content in fake.messages:
+        for line in content.split("\n"):
+            first.setdefault((channel, line), t)
+    out, expected = [], 0
+    for line, ts in submitted.items():
+        kind = "center" if "destroyed" in line else "player"
+        for channel_id in table.channels(kind):
+            expected += 1
+            hit = first.get((channel_id, line))
+            if hit is not None:
+                out.append((hit - ts) * 1000.0)
+    return sorted(out), expected
+
+async def _connect_all(fleet: guild_voice.VoiceFleet, client: FakeClient, timeout: float = 60.0) -> float:
+    t0 = time.perf_counter()
+    fleet.start()
+    while sum(1 for g in client.guilds if g.voice_client) < len(fleet):
+        if time.perf_counter() - t0 > timeout:
+            break
+        await asyncio.sleep(0.005)
+    return (time.perf_counter() - t0) * 1000.0
+
+async def bench(mode: str, n: int, args) -> None:
+    fake = FakeDiscord(limit=args.limit, per=args.per, global_limit=args.global_limit)
+    base = await fake.start()
+    sender = send_queue.RestSender("fake-token", api_base=base)
+    routes = make_routes(n)
+    table = routing.RoutingTable(routes)
+    client = FakeClient(connect_ms=args.connect_ms)
+    for r in routes:
+        client.add_guild(r.guild_id, r.voice_channel_id)
+    fleet = guild_voice.VoiceFleet(client, routes, stagger_sec=0.0)
+    lines = traffic(args.walls, args.players)
+    audio = ""
+    t0 = time.perf_counter()
+    try:
+        if mode == "serial":
+            submitted = await run_serial(sender, table, lines, args.spread)
+        else:
+            join_ms = await _connect_all(fleet, client)
+            t0 = time.perf_counter()
+            submitted, alert_at = await run_routed(sender, table, fleet, lines, args.spread, args.coalesce_ms)
+            plays = sorted((g.voice_client.plays[0] - alert_at) * 1000.0 for g in client.guilds
+                           if g.voice_client and g.voice_client.plays)
+            audio = (f" voice join={join_ms:7.1f}ms alert played={len(plays)}/{n} "
+                     f"p50={percentile(plays, 0.5):6.2f}ms max={plays[-1] if plays else 0.0:6.2f}ms")
+    finally:
+        fleet.stop()
+        await sender.close()
+        await fake.stop()
+    total = time.perf_counter() - t0
+    lat, expected = _latencies(fake, submitted, table)
+    print(f"[BENCH] {mode:<6} guilds={n:<4} http={sender.calls:<5} 429={sender.rate_limited:<3} "
+          f"messages={len(fake.messages):<5} delivered={len(lat)}/{expected} "
+          f"latency p50={percentile(lat, 0.5):8.1f}ms p95={percentile(lat, 0.95):8.1f}ms "
+          f"last={lat[-1] if lat else 0.0:8.1f}ms total={total:6.2f}s{audio}")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--guilds", type=int, nargs="+", default=[1, 5, 20, 50])
+    ap.add_argument("--walls", type=int, default=20)
+    ap.add_argument("--players", type=int, default=4)
+    ap.add_argument("--spread", type=float, default=2.0, help="seconds over which the lines arrive")
+    ap.add_argument("--limit", type=int, default=5, help="fake server: messages per window per channel")
+    ap.add_argument("--per", type=float, default=5.0, help="fake server: window in seconds")
+    ap.add_argument("--global-limit", type=int, default=50, help="fake server: requests per second, all channels")
+    ap.add_argument("--connect-ms", type=float, default=50.0, help="fake gateway: time to join a voice channel")
+    ap.add_argument("--coalesce-ms", type=int, default=250)
+    ap.add_argument("--modes", nargs="+", default=["serial", "routed"])
+    args = ap.parse_args()
+    for n in args.guilds:
+        for mode in args.modes:
+            asyncio.run(bench(mode, n, args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare OCR backends on the same preprocessed frames.
+
+    python -m bench.ocr_backends [--iterations 50] [--backends tesserocr pytesseract]
+"""
+import argparse
+
+import cv2
+import numpy as np
+
+import ocr_backend
+from bench.stats import StageStats, format_row
+
+SAMPLES = [
+    ("--oem 3 --psm 7 -l eng", "Tribemember Rex has joined this Ark."),
+    ("--oem 3 --psm 6 -l eng", "Day 312, 14:05:22: Your 'Stone Wall' was destroyed!"),
+]
+
+def render_binary(text: str) -> np.ndarray:
+    img = np.zeros((60, 24 + 15 * len(text)), np.uint8)
+    cv2.putText(img, text, (12, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 255, 2, cv2.LINE_AA)
+    _, bw = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return cv2.resize(bw, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+
+def bench_backend(backend, iterations: int) -> dict:
+    frames = [(cfg, render_binary(txt)) for cfg, txt in SAMPLES]
+    backend.image_to_string(frames[0][1], config=frames[0][0])  # warm-up
+    stats = StageStats(backend.name)
+    for i in range(iterations):
+        cfg, img = frames[i % len(frames)]
+        with stats.time():
+            backend.image_to_string(img, config=cfg)
+    return stats.summary()
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--iterations", type=int, default=50)
+    ap.add_argument("--backends", nargs="+", default=list(ocr_backend.BACKENDS))
+    args = ap.parse_args()
+
+    for name in args.backends:
+        try:
+            backend = ocr_backend.BACKENDS[name]()
+        except Exception as e:
+            print(f"[BENCH] {name}: skipped ({e})")
+            continue
+        try:
+            r = bench_backend(backend, args.iterations)
+        except Exception as e:
+            print(f"[BENCH] {name}: failed ({type(e).__name__}: {e})")
+            continue
+        finally:
+            backend.close()
+        print(f"[BENCH] {format_row(r)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Drive synthetic ARK frames through the scout pipeline and report, per stage,
+p50/p95/p99 latency and calls/s, plus events/s, OCR recall against the
+generated ground truth and peak RSS.
+
+    python -m bench.pipeline [--rate 2] [--duration 60] [--fps 1] [--skip-ocr]
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import ascendedscout as scout
+import center_dedup
+import change_detect
+import preprocess
+from bench.stats import StageStats, format_row, peak_rss_mb
+from bench.synthetic import SyntheticStream
+
+def _redirect_logs(tmp_dir: str):
+    scout.base_log_path = tmp_dir
+    scout.tribemembers_log_path = os.path.join(tmp_dir, "tribemembers_log.txt")
+    scout.players_log_path      = os.path.join(tmp_dir, "players_log.txt")
+    scout.center_log_path       = os.path.join(tmp_dir, "center_log.txt")
+    scout.clear_log_files()
+    scout.CENTER_DEDUP = center_dedup.CenterDedup()
+    scout.STORE_ENABLED = False   # keep benchmark events out of the real history
+    scout.CHECKPOINT_ENABLED = False   # every run starts cold
+
+def _read_lines(path: str) -> set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {ln.strip() for ln in f if ln.strip()}
+
+def _recall(truth: set[str], found: set[str]) -> float | None:
+    return len(truth & found) / len(truth) if truth else None
+
+def _fmt_recall(r: float | None) -> str:
+    return "n/a" if r is None else f"{r:.1%}"
+
+def run(stream: SyntheticStream, skip_ocr: bool = False, quiet: bool = True) -> dict:
+    stages = {name: StageStats(name) for name in (
+        "diff.top", "diff.center", "detect.top", "detect.center",
+        "preprocess.top", "preprocess.red", "preprocess.blue", "preprocess.green", "preprocess.general",
+        "preprocess.fused", "top", "center",
+    )}
+    top_truth, center_truth = set(), set()
+    prev = {}
+    n_events = 0
+    busy_s = 0.0
+    segmenter = preprocess.ColorSegmenter()
+    detectors = {zone: change_detect.ChangeDetector(persistence=scout.ZONE_CHANGE_PERSISTENCE[parser])
+                 for zone, parser in (("top", "player"), ("center", "center"))}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _redirect_logs(tmp)
+        sink = io.StringIO() if quiet else None
+        for tick in stream.ticks():
+            top_truth.update(tick.top_truth)
+            center_truth.update(tick.center_truth)
+            n_events += len(tick.top_truth) + len(tick.center_truth)
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+                for zone in ("top", "center"):
+                    cur = tick.frames[zone]
+                    if zone in prev:
+                        with stages[f"diff.{zone}"].time():
+                            scout.has_new_notification(cur, prev[zone])
+                    prev[zone] = cur
+                    with stages[f"detect.{zone}"].time():
+                        boxes = detectors[zone].update(cur)
+                    if not boxes:
+                        continue
+                    if zone == "top":
+                        with stages["preprocess.top"].time():
+                            scout.preprocess_line_top(cur)
+                    else:
+                        for color in ("red", "blue", "green"):
+                            with stages[f"preprocess.{color}"].time():
+                                scout.preprocess_image_for_colored_text(cur, color=color)
+                        with stages["preprocess.general"].time():
+                            scout.preprocess_image_general(cur)
+                        with stages["preprocess.fused"].time():
+                            segmenter.run(cur)
+                    if skip_ocr:
+                        continue
+                    with stages[zone].time():
+                        scout.process_notification(cur, zone, boxes)
+            busy_s += time.perf_counter() - t0
+            if sink is not None:
+                sink.seek(0)
+                sink.truncate()
+
+        scout.get_journal().flush()
+        found_top = _read_lines(scout.tribemembers_log_path) | _read_lines(scout.players_log_path)
+        found_center = _read_lines(scout.center_log_path)
+
+    return {
+        "stages": [st.summary() for st in stages.values() if st.samples_ms],
+        "events": n_events,
+        "events_per_sec": n_events / busy_s if busy_s > 0 else 0.0,
+        "recall_top": None if skip_ocr else _recall(top_truth, found_top),
+        "recall_center": None if skip_ocr else _recall(center_truth, found_center),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rate", type=float, default=2.0, help="events per second")
+    ap.add_argument("--fps", type=float, default=1.0, help="frames per second per zone")
+    ap.add_argument("--duration", type=float, default=60.0, help="simulated seconds")
+    ap.add_argument("--center-share", type=float, default=0.7)
+    ap.add_argument("--jitter", type=float, default=0.0, help="per-frame background noise sigma")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--skip-ocr", action="store_true", help="only diff + preprocessing stages")
+    ap.add_argument("--verbose", action="store_true", help="keep the scout's console output")
+    args = ap.parse_args()
+
+    stream = SyntheticStream(rate=args.rate, fps=args.fps, duration=args.duration,
+                             center_share=args.center_share, jitter=args.jitter, seed=args.seed)
+    r = run(stream, skip_ocr=args.skip_ocr, quiet=not args.verbose)
+
+    for row in r["stages"]:
+        print(f"[BENCH] {format_row(row)}")
+    print(f"[BENCH] events={r['events']} events/s={r['events_per_sec']:.1f} peak_rss={r['peak_rss_mb']:.1f}MB")
+    if not args.skip_ocr:
+        print(f"[BENCH] recall top={_fmt_recall(r['recall_top'])} center={_fmt_recall(r['recall_center'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Glyph prefilter (glyph_prefilter.py) on the synthetic corpus.
+
+Every frame the change detector flags is classified by the prefilter
+("send to OCR" or not) and compared with the ground truth: a top frame is
+relevant when a join / leave line showed up since the change began (other
+game messages come at --distractors per second), a center frame when new
+destruction entries did. The change detector reports a change `persistence`
+frames after it appears (ascendedscout.ZONE_CHANGE_PERSISTENCE), so a line
+replaced within that time is missed. Reports precision / recall per zone, prefilter latency
+and the preprocessing time it saves on top frames.
+
+Templates are rendered with the corpus font (glyph_prefilter.render_templates).
+
+A multi-line check then draws two or three top lines at once (two joins, a
+join and a leave around a distractor, ...) and requires one span per
+join / leave line, each holding that line and no other. Exits non-zero if it
+fails.
+
+    python -m bench.prefilter [--duration 300] [--distractors 3] [--threshold 0.65]
+"""
+import argparse
+import sys
+from collections import deque
+
+import cv2
+
+import numpy as np
+
+import ascendedscout as scout
+import change_detect
+import glyph_prefilter
+import preprocess
+from bench.stats import StageStats, format_row
+from bench.synthetic import DISTRACTORS, FONT, TINTS, TOP_SIZE, SyntheticStream, background
+
+# corpus font scales: top lines are drawn at ~0.4..0.8 (thickness 2, long lines shrink), center
+# entries at 0.48 (thickness 1). The game uses one size per resolution: one template per phrase.
+RENDER = {"top": ("player", dict(scales=tuple(np.arange(0.4, 0.81, 0.05)), thickness=2)),
+          "center": ("center", dict(scales=(0.48,), thickness=1))}
+
+def run(stream: SyntheticStream, threshold: float, downscale: int) -> dict:
+    filters = {zone: glyph_prefilter.GlyphPrefilter(
+        glyph_prefilter.render_templates(glyph_prefilter.PHRASES[parser], **kw),
+        threshold=threshold, downscale=downscale) for zone, (parser, kw) in RENDER.items()}
+    detectors = {zone: change_detect.ChangeDetector(persistence=scout.ZONE_CHANGE_PERSISTENCE[parser])
+                 for zone, (parser, _) in RENDER.items()}
+    recent = {zone: deque(maxlen=detectors[zone].persistence) for zone in RENDER}
+    top_chain = preprocess.build_chain()
+    counts = {zone: {"tp": 0, "fp": 0, "fn": 0, "tn": 0} for zone in RENDER}
+    stages = {name: StageStats(name) for name in ("prefilter.top", "prefilter.center", "preprocess.top")}
+    for tick in stream.ticks():
+        recent["top"].append(tick.top_relevant)
+        recent["center"].append(bool(tick.center_truth))
+        for zone, frame in tick.frames.items():
+            boxes = detectors[zone].update(frame)
+            if not boxes:
+                continue
+            rows = change_detect.boxes_row_span(boxes, frame.shape[0], margin=6)
+            with stages[f"prefilter.{zone}"].time():
+                hit = bool(filters[zone].lines(frame, rows, max_lines=None if zone == "top" else 1))
+            if zone == "top":
+                with stages["preprocess.top"].time():
+                    top_chain(frame[rows[0]:rows[1]])
+            truth = any(recent[zone])
+            key = ("tp" if truth else "fp") if hit else ("fn" if truth else "tn")
+            counts[zone][key] += 1
+    return {"counts": counts, "stages": {k: v.summary() for k, v in stages.items()},
+            "templates": len(filters["top"].templates)}
+
+MULTI_LINE = [
+    ["Rex has joined this Ark.", "Mira has joined this Ark."],
+    ["Tribemember Koa has left this Ark.", DISTRACTORS[1], "Dodo42 has joined this Ark."],
+    [DISTRACTORS[0], "Sable-7 has left this Ark.", "Bob_the_Builder has joined this Ark."],
+    ["Rex has joined this Ark.", "Mira has joined this Ark.", "Koa has joined this Ark."],
+]
+
+def multi_line_check(threshold: float, downscale: int, seed: int) -> list[str]:
+    parser, kw = RENDER["top"]
+    pf = glyph_prefilter.GlyphPrefilter(glyph_prefilter.render_templates(glyph_prefilter.PHRASES[parser], **kw),
+                                        threshold=threshold, downscale=downscale)
+    bg = background(TOP_SIZE, np.random.default_rng(seed))
+    failures = []
+    for lines in MULTI_LINE:
+        frame, rows = bg.copy(), []
+        for i, line in enumerate(lines):
+            base = 30 + 28 * i
+            cv2.putText(frame, line, (12, base), FONT, 0.6, TINTS["white"], 2, cv2.LINE_AA)
+            if " this Ark" in line:
+                rows.append((base - 14, base + 2))   # cap height .. baseline at scale 0.6
+        spans = pf.lines(frame)
+        ok = len(spans) == len(rows) and all(
+            s0 <= r0 and r1 <= s1 and all(not (s0 < o1 and o0 < s1) for o0, o1 in rows if (o0, o1) != (r0, r1))
+            for (s0, s1), (r0, r1) in zip(spans, rows))
+        if not ok:
+            failures.append(f"{len(rows)} phrase lines at rows {rows}: spans {spans}")
+    return failures
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rate", type=float, default=1.0, help="notification events per second")
+    ap.add_argument("--distractors", type=float, default=3.0, help="other top-zone messages per second")
+    ap.add_argument("--fps", type=float, default=2.0)
+    ap.add_argument("--duration", type=float, default=300.0)
+    ap.add_argument("--jitter", type=float, default=4.0)
+    ap.add_argument("--threshold", type=float, default=0.65)
+    ap.add_argument("--downscale", type=int, default=2)
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args()
+
+    stream = SyntheticStream(rate=args.rate, fps=args.fps, duration=args.duration, jitter=args.jitter,
+                             seed=args.seed, distractor_rate=args.distractors)
+    r = run(stream, args.threshold, args.downscale)
+    for zone, c in r["counts"].items():
+        sent = c["tp"] + c["fp"]
+        relevant = c["tp"] + c["fn"]
+        precision = c["tp"] / sent if sent else float("nan")
+        recall = c["tp"] / relevant if relevant else float("nan")
+        total = sum(c.values())
+        print(f"[BENCH] {zone:<6} changed frames={total:<5} relevant={relevant:<5} sent to OCR={sent:<5} "
+              f"precision={precision:.1%} recall={recall:.1%} skipped={(total - sent) / max(1, total):.1%}")
+    for row in r["stages"].values():
+        print(f"[BENCH] {format_row(row)}")
+    c, st = r["counts"]["top"], r["stages"]
+    skipped = c["fn"] + c["tn"]
+    saved = skipped * st["preprocess.top"]["p50_ms"] - (sum(c.values()) * st["prefilter.top"]["p50_ms"])
+    print(f"[BENCH] top: {r['templates']} templates, {skipped} preprocess + OCR calls avoided, "
+          f"net preprocessing time saved {saved:.0f} ms (plus {skipped} Tesseract calls)")
+
+    failures = multi_line_check(args.threshold, args.downscale, args.seed)
+    for f in failures:
+        print(f"[BENCH] FAIL multi-line: {f}")
+    print(f"[BENCH] multi-line top frames: {'FAIL' if failures else 'ok'} ({len(MULTI_LINE)} frames)")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
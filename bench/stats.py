@@ -0,0 +1,48 @@
+"""Latency / memory helpers shared by the benchmarks."""
+import time
+from contextlib import contextmanager
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+class StageStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.samples_ms: list[float] = []
+
+    @contextmanager
+    def time(self):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples_ms.append((time.perf_counter() - t0) * 1000.0)
+
+    def summary(self) -> dict:
+        s = sorted(self.samples_ms)
+        total_s = sum(s) / 1000.0
+        return {
+            "stage": self.name,
+            "calls": len(s),
+            "p50_ms": percentile(s, 0.50),
+            "p95_ms": percentile(s, 0.95),
+            "p99_ms": percentile(s, 0.99),
+            "per_sec": len(s) / total_s if total_s > 0 else 0.0,
+        }
+
+def format_row(r: dict) -> str:
+    return (f"{r['stage']:<20} calls={r['calls']:<6} p50={r['p50_ms']:8.2f}ms "
+            f"p95={r['p95_ms']:8.2f}ms p99={r['p99_ms']:8.2f}ms  {r['per_sec']:9.1f}/s")
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+    except ImportError:
+        import psutil
+        mem = psutil.Process().memory_info()
+        return getattr(mem, "peak_wset", mem.rss) / (1024.0 * 1024.0)
@@ -0,0 +1,148 @@
+"""
+Synthetic ARK notification frames with ground truth.
+
+Top zone   : one "[Tribemember ]X has joined/left this Ark." line (latest event wins),
+             optionally replaced by other game messages (distractor_rate).
+Center zone: scrolling stack of "Day N, HH:MM:SS: Your 'OBJ' was destroyed!" entries.
+
+Text is drawn in the game's red / blue / green tints (plus white on the top
+zone) over a noisy dark background. Ground truth lines use exactly the format
+ascendedscout writes to its log files.
+"""
+import math
+import random
+from dataclasses import dataclass, field
+
+import cv2
+import numpy as np
+
+TOP_SIZE    = (100, 550)   # (height, width), matches top_zone
+CENTER_SIZE = (539, 374)   # matches center_zone
+
+# BGR(A) tints, hues inside the preprocess_image_for_colored_text masks
+TINTS = {
+    "red":   (40, 40, 225, 255),
+    "blue":  (235, 140, 40, 255),
+    "green": (60, 215, 60, 255),
+    "white": (235, 235, 235, 255),
+}
+
+PLAYERS = ["Rex", "Bob_the_Builder", "xXRaiderXx", "Mira", "Tek.Lord", "Dodo42", "Koa", "Sable-7"]
+OBJECTS = ["Stone Wall", "Stone Foundation", "Metal Wall", "Wooden Ceiling", "Metal Gate",
+           "Behemoth Gate", "Tek Generator", "Large Storage Box", "Stone Doorframe", "Heavy Turret"]
+
+# top-zone messages that are not join / leave lines
+DISTRACTORS = ["Server will restart in 10 minutes.", "You have been awarded 120 XP!", "Your Dodo is starving!",
+               "Tek Cave is now accessible.", "Taming complete: Argentavis", "Your tribe claimed a new Outpost.",
+               "Cryopod cooldown: 15s", "Egg laid by Parasaur (Lvl 140)"]
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+@dataclass
+class Tick:
+    ts: float
+    frames: dict[str, np.ndarray]
+    top_truth: list[str] = field(default_factory=list)      # lines visible for the first time
+    center_truth: list[str] = field(default_factory=list)
+    top_relevant: bool = False   # the visible top line is a join / leave line
+
+def background(size: tuple[int, int], rng: np.random.Generator, sigma: float = 6.0) -> np.ndarray:
+    h, w = size
+    grad = np.linspace(18, 48, w, dtype=np.float32)[None, :].repeat(h, axis=0)
+    noise = rng.normal(0.0, sigma, (h, w)).astype(np.float32)
+    g = np.clip(grad + noise, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(g, cv2.COLOR_GRAY2BGRA)
+
+def _jitter(bg: np.ndarray, rng: np.random.Generator, sigma: float) -> np.ndarray:
+    if sigma <= 0:
+        return bg.copy()
+    noise = rng.normal(0.0, sigma, bg.shape[:2]).astype(np.int16)[..., None]
+    out = np.clip(bg.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+    out[..., 3] = 255
+    return out
+
+def render_top(line: str | None, tint: str, bg: np.ndarray) -> np.ndarray:
+    img = bg.copy()
+    if line:
+        scale = min(0.8, 520.0 / (cv2.getTextSize(line, FONT, 1.0, 2)[0][0] or 1))
+        cv2.putText(img, line, (12, 58), FONT, scale, TINTS[tint], 2, cv2.LINE_AA)
+    return img
+
+def render_center(entries: list[tuple[str, str, str]], bg: np.ndarray) -> np.ndarray:
+    """entries: (timestamp prefix, body, tint), oldest first; the newest is drawn at the bottom."""
+    img = bg.copy()
+    y = CENTER_SIZE[0] - 14
+    for prefix, body, tint in reversed(entries):
+        if y < 40:
+            break
+        cv2.putText(img, body,   (8, y),      FONT, 0.48, TINTS[tint], 1, cv2.LINE_AA)
+        cv2.putText(img, prefix, (8, y - 20), FONT, 0.48, TINTS[tint], 1, cv2.LINE_AA)
+        y -= 50
+    return img
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    # Knuth; lam is small (events per frame)
+    limit, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+class SyntheticStream:
+    """
+    rate         : events per second (top + center)
+    fps          : frames per second per zone
+    center_share : fraction of events that are destroyed structures
+    jitter       : per-frame background noise (sigma); 0 = static background
+    distractor_rate : other top-zone messages per second
+    """
+
+    def __init__(self, rate: float = 2.0, fps: float = 1.0, duration: float = 60.0,
+                 center_share: float = 0.7, center_depth: int = 9, jitter: float = 0.0,
+                 seed: int = 1234, distractor_rate: float = 0.0):
+        self.rate, self.fps, self.duration = rate, fps, duration
+        self.distractor_rate = distractor_rate
+        self.center_share = center_share
+        self.center_depth = center_depth
+        self.jitter = jitter
+        self.seed = seed
+
+    def ticks(self):
+        rnd = random.Random(self.seed)
+        rng = np.random.default_rng(self.seed)
+        bg_top, bg_center = background(TOP_SIZE, rng), background(CENTER_SIZE, rng)
+        day, clock = rnd.randint(100, 900), rnd.randint(0, 86399)
+        top_line, top_tint, top_relevant = None, "white", False
+        center: list[tuple[str, str, str]] = []
+        n_frames = int(self.duration * self.fps)
+        for i in range(n_frames):
+            top_truth, new_center = [], []
+            for _ in range(_poisson(rnd, self.rate / self.fps)):
+                if rnd.random() < self.center_share:
+                    clock += rnd.randint(1, 20)
+                    if clock >= 86400:
+                        day, clock = day + 1, clock - 86400
+                    hh, mm, ss = clock // 3600, (clock // 60) % 60, clock % 60
+                    prefix = f"Day {day}, {hh:02d}:{mm:02d}:{ss:02d}:"
+                    obj = rnd.choice(OBJECTS)
+                    entry = (prefix, f"Your '{obj}' was destroyed!", rnd.choice(("red", "blue", "green")))
+                    center = (center + [entry])[-self.center_depth:]
+                    new_center.append(entry)
+                else:
+                    tribe = "Tribemember " if rnd.random() < 0.4 else ""
+                    action = rnd.choice(("joined", "left"))
+                    top_line = f"{tribe}{rnd.choice(PLAYERS)} has {action} this Ark."
+                    top_tint = rnd.choice(("white", "red", "blue", "green"))
+                    top_truth = [top_line]  # only the latest top line is ever visible
+                    top_relevant = True
+            if self.distractor_rate and _poisson(rnd, self.distractor_rate / self.fps):
+                top_line, top_tint, top_relevant = rnd.choice(DISTRACTORS), rnd.choice(("white", "green")), False
+                top_truth = []
+            frames = {
+                "top":    render_top(top_line, top_tint, _jitter(bg_top, rng, self.jitter)),
+                "center": render_center(center, _jitter(bg_center, rng, self.jitter)),
+            }
+            # entries pushed out of the stack within the same frame were never visible
+            center_truth = [f"{e[0]} {e[1]}" for e in new_center if any(e is c for c in center)]
+            yield Tick(i / self.fps, frames, top_truth, center_truth, top_relevant)
@@ -1,13 +1,21 @@
 import discord
 import asyncio
 import os
-import time
-import hashlib
 import re
-import unicodedata
-import difflib
 import shutil
-from collections import defaultdict
+import time
+
+import center_dedup
+import events
+import log_watch
+import metrics
+import send_queue
+import ttl_cache
+import alert_audio
+import checkpoint
+import event_store
+import guild_voice
+import routing
 
 # =========================
 # DISCORD CLIENT / INTENTS
@@ -16,7 +24,26 @@ intents = discord.Intents.default()
 intents.guilds = True
 intents.messages = True
 intents.message_content = True  # ⚠️ must also be enabled in Developer Portal
-client = discord.Client(intents=intents)
+
+# Sharding, for a bot in many guilds:
+#   ASCENDEDSCOUT_SHARDS     ""     one gateway connection (discord.Client)
+#                            "auto" AutoShardedClient, shard count recommended by Discord
+#                            "N"    AutoShardedClient with N shards
+#   ASCENDEDSCOUT_SHARD_IDS  "0,1"  run only these of the N shards (the others in other
+#                                   processes); only their guilds are delivered to here
+SHARDS    = os.getenv("ASCENDEDSCOUT_SHARDS", "").strip().lower()
+SHARD_IDS = [int(s) for s in os.getenv("ASCENDEDSCOUT_SHARD_IDS", "").split(",") if s.strip()] or None
+
+def _make_client() -> discord.Client:
+    if not SHARDS:
+        return discord.Client(intents=intents)
+    if SHARDS == "auto":
+        return discord.AutoShardedClient(intents=intents)
+    return discord.AutoShardedClient(intents=intents, shard_count=int(SHARDS), shard_ids=SHARD_IDS)
+
+if SHARD_IDS is not None and SHARDS in ("", "auto"):
+    raise SystemExit("[BOT] ASCENDEDSCOUT_SHARD_IDS needs ASCENDEDSCOUT_SHARDS=<shard count>")
+client = _make_client()
 
 # =========================
 # PATHS
@@ -28,7 +55,16 @@ tribemembers_log_path = os.path.join(base_log_path, "tribemembers_log.txt")
 players_log_path      = os.path.join(base_log_path, "players_log.txt")
 center_log_path       = os.path.join(base_log_path, "center_log.txt")
 
-audio_file_path = os.path.join(base_dir, "..", "assets", "ALERT NUKE.mp3")
+assets_dir = os.path.join(base_dir, "..", "assets")
+audio_file_path = os.path.join(assets_dir, "ALERT NUKE.mp3")
+
+# alert clip per event kind ("default" for the others, "beep" = !beep); encoded
+# once into AUDIO_CACHE_DIR and played from memory (alert_audio.py)
+ALERT_SOUNDS = {
+    "default": audio_file_path,
+    "center":  audio_file_path,
+}
+AUDIO_CACHE_DIR = os.path.join(assets_dir, ".opus_cache")
 
 FFMPEG_EXEC = os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg")
 print(f"[VOICE] ffmpeg = {FFMPEG_EXEC or 'NOT FOUND'}")
@@ -47,18 +83,39 @@ players_channel_id      = your_players_channel_id_here      # Replace with your
 center_channel_id       = your_center_channel_id_here       # Replace with your channel ID
 voice_channel_id        = your_voice_channel_id_here        # Replace with your voice channel ID
 
+# =========================
+# ROUTING
+# =========================
+# routes.json (see routing.py) delivers the feed to several guilds, each with
+# its own channels, voice channel and audio cooldown. Without it, the IDs above
+# are the only route, in the bot's first guild.
+AUDIO_COOLDOWN_SEC = 15
+ROUTES_PATH = routing.default_path()
+_default_routes = [routing.GuildRoute(
+    "default", None, voice_channel_id=voice_channel_id, audio_cooldown_sec=AUDIO_COOLDOWN_SEC,
+    channels={"tribemember": tribemembers_channel_id, "player": players_channel_id, "center": center_channel_id})]
+routes = routing.RoutingTable(routing.load_routes(ROUTES_PATH, default=_default_routes),
+                              shard_ids=SHARD_IDS, shard_count=int(SHARDS) if SHARD_IDS else 1)
+print(f"[BOT] Routing to {len(routes)} guild(s)")
+
+# =========================
+# EVENT SOURCE
+# =========================
+# "files": tail the scout's log files (scout and bot in separate processes)
+# "bus"  : in-process events.BUS (main.py runs both halves in one process)
+EVENT_SOURCE = os.getenv("ASCENDEDSCOUT_EVENT_SOURCE", "files")
+
 # =========================
 # FILE TAIL & DEDUPE
 # =========================
 SKIP_HISTORY_ON_START = True
-POLL_INTERVAL_SEC     = 0.5
+POLL_INTERVAL_SEC     = 0.5   # slowest rate of the polling fallback (inotify is used on Linux)
 
 file_positions: dict[str, int] = {}
+file_inodes: dict[str, int] = {}
 LINE_DEDUPE_TTL_SEC = 45
-_last_lines_cache: dict[str, float] = {}
-
-def _now() -> float: return time.time()
-def _hash(s: str) -> str: return hashlib.sha1(s.encode("utf-8")).hexdigest()
+LINE_DEDUPE_MAX     = 4096  # hard cap on remembered lines
+_last_lines_cache = ttl_cache.TTLCache(LINE_DEDUPE_TTL_SEC, LINE_DEDUPE_MAX, stable_keys=True)
 
 def _normalize_quotes_spaces(s: str) -> str:
     s = s.replace("‘", "'").replace("’", "'").replace("´", "'").replace("`", "'")
@@ -69,24 +126,23 @@ def _normalize_quotes_spaces(s: str) -> str:
     return s
 
 def should_emit_line(line: str) -> bool:
-    now = _now()
-    for k, ts in list(_last_lines_cache.items()):
-        if now - ts > LINE_DEDUPE_TTL_SEC:
-            _last_lines_cache.pop(k, None)
-    h = _hash(line)
-    if h in _last_lines_cache:
-        return False
-    _last_lines_cache[h] = now
-    return True
+    return _last_lines_cache.add(line)
 
 def prime_file_offsets(skip_history: bool):
-    for p in (tribemembers_log_path, players_log_path, center_log_path):
+    for p in map(os.path.abspath, (tribemembers_log_path, players_log_path, center_log_path)):
         try:
             os.makedirs(os.path.dirname(p), exist_ok=True)
             if not os.path.exists(p):
                 with open(p, 'w', encoding='utf-8'):
                     pass
-            file_positions[p] = os.path.getsize(p) if skip_history else 0
+            st = os.stat(p)
+            resume = _resume_offsets.pop(p, None)  # consumed: only the first prime resumes
+            if resume is not None:  # warm restart: tail_and_send follows a rotation / truncation since
+                file_positions[p], file_inodes[p] = resume
+                print(f"[BOT] Resume offset for {p} -> {file_positions[p]}")
+                continue
+            file_positions[p] = st.st_size if skip_history else 0
+            file_inodes[p] = st.st_ino
             print(f"[BOT] Init offset for {p} -> {file_positions[p]}")
         except Exception as e:
             print(f"[BOT] prime_file_offsets error for {p}: {e}")
@@ -98,8 +154,11 @@ def prime_file_offsets(skip_history: bool):
 RE_CENTER_TS = re.compile(r"Day\s+(\d+),\s+(\d{2})[.:](\d{2})[.:](\d{2})", re.IGNORECASE)
 RE_OBJ_ACT   = re.compile(r"Your\s+['\"]?(.+?)['\"]?\s+was\s+(destroyed|demolished|killed)\b", re.IGNORECASE)
 
-_seen_by_ts: dict[str, list[tuple[str, str]]] = defaultdict(list)
+CENTER_DEDUPE_TTL_SEC = 600   # a timestamp key is forgotten after 10 min
+CENTER_DEDUPE_MAX     = 2048
 SIM_OBJ = 0.90
+_center_dedup = center_dedup.CenterDedup(similarity=SIM_OBJ, ttl_sec=CENTER_DEDUPE_TTL_SEC,
+                                         max_keys=CENTER_DEDUPE_MAX)
 
 def _center_ts_key(line: str) -> str | None:
     m = RE_CENTER_TS.search(line)
@@ -108,12 +167,7 @@ def _center_ts_key(line: str) -> str | None:
     day, hh, mm, ss = m.groups()
     return f"{int(day)}-{hh}:{mm}:{ss}"
 
-def _canon_obj(s: str) -> str:
-    s = unicodedata.normalize("NFKC", s).lower()
-    s = s.replace("‘","'").replace("’","'").replace("`","'").replace("´","'")
-    s = s.replace("“",'"').replace("”",'"')
-    s = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in s)
-    return " ".join(s.split())
+_canon_obj = center_dedup.canon_object
 
 def _parse_obj_action(line: str) -> tuple[str | None, str | None]:
     m = RE_OBJ_ACT.search(line)
@@ -129,20 +183,57 @@ def should_post_center_line(line: str) -> bool:
     obj, act = _parse_obj_action(line)
     if obj is None or act is None:
         return True
-    for prev_obj, prev_act in _seen_by_ts.get(ts, []):
-        if prev_act == act and difflib.SequenceMatcher(a=obj, b=prev_obj).ratio() >= SIM_OBJ:
-            return False
-    _seen_by_ts[ts].append((obj, act))
-    if len(_seen_by_ts[ts]) > 6:
-        _seen_by_ts[ts] = _seen_by_ts[ts][-6:]
-    return True
+    return should_post_center_event(ts, obj, act)
+
+def should_post_center_event(ts: str, obj: str, act: str) -> bool:
+    """ts = 'Day-HH:MM:SS' key, obj = object name (canonicalized by the dedup engine)."""
+    day, clock = ts.split("-", 1)
+    return _center_dedup.should_post(int(day), clock, obj, act)
+
+# =========================
+# WARM RESTART
+# =========================
+# Tail offsets / inodes and both dedup windows are checkpointed every few seconds
+# (checkpoint.py). A recent checkpoint replaces SKIP_HISTORY_ON_START: the tail
+# resumes where it stopped and lines already posted are not posted again.
+CHECKPOINT_PATH         = os.path.join(base_log_path, "bot_checkpoint.json")
+CHECKPOINT_INTERVAL_SEC = 5
+CHECKPOINT_MAX_AGE_SEC  = 15 * 60
+CHECKPOINT_MAX_KEYS     = 512   # newest center timestamps kept
+_resume_offsets: dict[str, tuple[int, int | None]] = {}
+_checkpoint_task: asyncio.Task | None = None
+
+def checkpoint_state() -> dict:
+    return {"offsets": {p: [pos, file_inodes.get(p)] for p, pos in file_positions.items()},
+            "lines": _last_lines_cache.export(),
+            "center_dedup": _center_dedup.export(CHECKPOINT_MAX_KEYS)}
+
+def restore_checkpoint():
+    state = checkpoint.load(CHECKPOINT_PATH, CHECKPOINT_MAX_AGE_SEC)
+    if state is None:
+        return
+    _last_lines_cache.restore(state.get("lines", ()))
+    _center_dedup.restore(state.get("center_dedup", {}))
+    _resume_offsets.update({p: tuple(v) for p, v in state.get("offsets", {}).items()})
+    print(f"[CHECKPOINT] warm start: {len(_last_lines_cache)} lines, {len(_center_dedup)} center timestamps, "
+          f"{len(_resume_offsets)} tail offsets")
+
+async def _checkpoint_loop():
+    while True:
+        await asyncio.sleep(CHECKPOINT_INTERVAL_SEC)
+        state = checkpoint_state()  # collected on the loop, the only thread changing it
+        try:
+            await asyncio.to_thread(checkpoint.save, CHECKPOINT_PATH, state)
+        except OSError as e:
+            print(f"[CHECKPOINT] save failed: {type(e).__name__}: {e}")
 
 # =========================
 # VOICE MANAGER
 # =========================
-_voice_lock = asyncio.Lock()
-_voice_task: asyncio.Task | None = None
-_stop_voice_task = asyncio.Event()
+# One voice connection and audio cooldown per routed guild (guild_voice.py).
+# Keepers start staggered so many guilds do not join voice at the same instant.
+VOICE_CONNECT_STAGGER_SEC = 0.5
+voice = guild_voice.VoiceFleet(client, routes.voice_routes(), stagger_sec=VOICE_CONNECT_STAGGER_SEC)
 
 def _ffmpeg_src(path: str):
     if not FFMPEG_EXEC:
@@ -153,104 +244,105 @@ def _ffmpeg_src(path: str):
         print(f"[VOICE] FFmpegOpusAudio indisponible ({e}), fallback PCM…")
         return discord.FFmpegPCMAudio(path, executable=FFMPEG_EXEC)
 
-async def _connect_once() -> discord.VoiceClient | None:
-    """One-shot connect guarded by _voice_lock."""
-    async with _voice_lock:
-        if not client.guilds:
-            print("[VOICE] Pas de guilds.")
-            return None
-        guild = client.guilds[0]
-        target = guild.get_channel(voice_channel_id)
-        if not target:
-            print(f"[VOICE] Salon vocal introuvable: {voice_channel_id}")
-            return None
-        vc = guild.voice_client
-        if vc and vc.is_connected():
-            if vc.channel.id != voice_channel_id:
-                print(f"[VOICE] Déplacement vocal {vc.channel.name} -> {target.name}")
-                await vc.move_to(target)
-            return guild.voice_client
-        try:
-            print(f"[VOICE] Connexion au salon: {target.name}")
-            vc = await target.connect(timeout=15.0, reconnect=False)
-            print(f"[VOICE] Connecté à: {target.name}")
-            return vc
-        except discord.ClientException as e:
-            print(f"[VOICE] ClientException: {e}")
-            return guild.voice_client
-        except Exception as e:
-            print(f"[VOICE] Connexion échouée: {type(e).__name__}: {e}")
-            return None
-
-async def _voice_keeper():
-    """Keeps the voice connection alive, with backoff on failures."""
-    backoff = 1.0
-    while not _stop_voice_task.is_set():
-        vc = await _connect_once()
-        if vc and vc.is_connected():
-            backoff = 1.0
-            for _ in range(10):
-                if _stop_voice_task.is_set():
-                    break
-                await asyncio.sleep(1.5)
-        else:
-            print(f"[VOICE] Reconnexion dans {backoff:.1f}s…")
-            await asyncio.sleep(backoff)
-            backoff = min(backoff * 2.0, 15.0)
-
 def start_voice_keeper():
-    global _voice_task
-    if _voice_task is None or _voice_task.done():
-        _stop_voice_task.clear()
-        _voice_task = asyncio.create_task(_voice_keeper())
+    voice.start()
 
 def stop_voice_keeper():
-    _stop_voice_task.set()
-    if _voice_task:
-        _voice_task.cancel()
+    voice.stop()
 
-_audio_lock = asyncio.Lock()
-_last_audio = 0.0
-AUDIO_COOLDOWN_SEC = 15
+# clips that failed to load (ffmpeg missing, file not there yet) are retried on the next
+# alert that needs them, at most this often
+ALERT_PREPARE_RETRY_SEC = 60
 
-async def play_alert_audio():
-    """Plays alert without initiating a new connect storm."""
-    global _last_audio
-    async with _audio_lock:
-        now = asyncio.get_running_loop().time()
-        if now - _last_audio < AUDIO_COOLDOWN_SEC:
-            print("[VOICE] Cooldown audio -> skip")
-            return
-        _last_audio = now
+alert_sounds = alert_audio.AlertSounds(ALERT_SOUNDS, AUDIO_CACHE_DIR, ffmpeg=FFMPEG_EXEC,
+                                       retry_sec=ALERT_PREPARE_RETRY_SEC)
+_prepare_task: asyncio.Task | None = None
 
-        if not os.path.exists(audio_file_path):
-            print(f"[VOICE] Fichier audio introuvable: {audio_file_path}")
-            return
-
-        if not client.guilds:
-            print("[VOICE] Pas de guilds.")
-            return
-        guild = client.guilds[0]
-        vc = guild.voice_client
-        if not (vc and vc.is_connected()):
-            print("[VOICE] Pas de voice client (pas connecté).")
-            return
+async def prepare_alert_sounds():
+    if not alert_sounds.prepared:
+        await asyncio.to_thread(alert_sounds.prepare)
 
-        try:
-            if vc.is_playing():
-                vc.stop()
-            src = _ffmpeg_src(audio_file_path)
-            vc.play(src, after=lambda e: print("[VOICE] Lecture OK" if e is None else f"[VOICE] Erreur lecture: {e}"))
-            print("[VOICE] Lecture démarrée.")
-        except Exception as e:
-            print(f"[VOICE] Lecture échouée: {type(e).__name__}: {e}")
+def schedule_alert_prepare():
+    """Starts prepare_alert_sounds() unless it is running, done, or a failed attempt is too recent."""
+    global _prepare_task
+    if (_prepare_task and not _prepare_task.done()) or not alert_sounds.retry_due():
+        return
+    _prepare_task = asyncio.create_task(prepare_alert_sounds())
+
+def _alert_source(kind: str, requested_at: float | None):
+    src = alert_sounds.source(kind, requested_at)
+    if src is None:  # not prepared (no ffmpeg at startup, still preparing): decode now
+        schedule_alert_prepare()
+        src = _ffmpeg_src(alert_sounds.path_for(kind))
+    return src
+
+async def play_alert_audio(kind: str = "center", requested_at: float | None = None, guild_id: int | None = None):
+    """
+    Plays the alert in every guild routed for `kind` (or only `guild_id`), without initiating a new
+    connect storm. Clips that are not an event kind (!beep) play in every guild with a voice channel.
+    """
+    path = alert_sounds.path_for(kind)
+    if alert_sounds.source(kind) is None and not (path and os.path.exists(path)):
+        print(f"[VOICE] Fichier audio introuvable: {path}")
+        return
+    played = await voice.play(lambda: _alert_source(kind, requested_at), guild_id,
+                              kind=kind if kind in routing.KINDS else None)
+    if played:
+        print(f"[VOICE] Lecture démarrée ({played}/{len(voice)} guild(s)).")
 
-def schedule_audio():
+def schedule_audio(kind: str = "center", guild_id: int | None = None):
     try:
-        asyncio.get_running_loop().create_task(play_alert_audio())
+        asyncio.get_running_loop().create_task(play_alert_audio(kind, time.perf_counter(), guild_id))
     except RuntimeError:
         pass
 
+# =========================
+# HISTORY COMMANDS
+# =========================
+# Queries on the scout's event store (event_store.py), run on a worker thread.
+_history = event_store.EventReader()
+HISTORY_LIMIT = 10
+_WEEKDAYS = ("Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat")
+
+def _fmt_ts(ts: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(ts))
+
+def history_reply(player: str) -> str:
+    if not player:
+        return "Usage: `!history <player>`"
+    rows = _history.history(player, HISTORY_LIMIT)
+    if not rows:
+        return f"ℹ️ No join/leave recorded for **{player}**."
+    lines = [f"{_fmt_ts(ts)}  {'Tribemember ' if tm else ''}{name} {action}" for ts, name, action, tm in rows]
+    return f"🕘 Last {len(rows)} events for **{player}**:\n```\n" + "\n".join(lines) + "\n```"
+
+def losses_reply(since_text: str) -> str:
+    try:
+        since = event_store.parse_since(since_text or "24h")
+    except ValueError as e:
+        return f"Usage: `!losses <since>` ({e})"
+    r = _history.losses(since)
+    if not r["total"]:
+        return f"✅ Nothing destroyed since {_fmt_ts(since)}."
+    lines = [f"{n:>5}  {obj}" for obj, n in r["objects"]]
+    return (f"💥 {r['total']} destroyed in {r['raids']} raid(s) since {_fmt_ts(since)}:\n```\n"
+            + "\n".join(lines) + "\n```")
+
+def top_raid_times_reply() -> str:
+    rows = _history.top_raid_times()
+    if not rows:
+        return "ℹ️ No raid recorded yet."
+    lines = [f"{_WEEKDAYS[wd]} {hr:02d}:00-{(hr + 1) % 24:02d}:00  {n:>4} raid(s), {losses:>5} destroyed"
+             for wd, hr, n, losses in rows]
+    return "⏰ Raids most often start:\n```\n" + "\n".join(lines) + "\n```"
+
+async def reply_off_loop(msg: discord.Message, fn, *args):
+    try:
+        text = await asyncio.to_thread(fn, *args)
+    except Exception as e:
+        text = f"⚠️ History unavailable: {type(e).__name__}: {e}"
+    await msg.channel.send(text)
+
 # =========================
 # COMMANDS TEST
 # =========================
@@ -259,14 +351,26 @@ async def on_message(msg: discord.Message):
     if msg.author.bot:
         return
     cmd = msg.content.strip().lower()
-    if cmd == "!beep":
+    head, _, arg = msg.content.strip().partition(" ")
+    head, arg = head.lower(), arg.strip()
+    if head == "!history":
+        await reply_off_loop(msg, history_reply, arg)
+    elif head == "!losses":
+        await reply_off_loop(msg, losses_reply, arg)
+    elif cmd == "!top-raid-times":
+        await reply_off_loop(msg, top_raid_times_reply)
+    elif cmd == "!beep":
+        schedule_audio("beep", msg.guild.id if msg.guild else None)
         await msg.channel.send("🔊 Test audio…")
-        schedule_audio()
     elif cmd == "!join":
+        gv = voice.get(msg.guild.id) if msg.guild else None
+        if gv is None:
+            await msg.channel.send("ℹ️ No alert voice channel routed for this server.")
+            return
         await msg.channel.send("🔁 Forcing voice keeper reconnect…")
-        stop_voice_keeper()
+        gv.stop()
         await asyncio.sleep(0.1)
-        start_voice_keeper()
+        gv.start()
     elif cmd == "!leave":
         g = msg.guild
         if g and g.voice_client:
@@ -278,75 +382,160 @@ async def on_message(msg: discord.Message):
 # =========================
 # FILE MONITOR LOOP
 # =========================
+WATCH_SAFETY_SEC = 30  # full re-check even without notifications
+
+def _watched_logs() -> dict[str, str]:
+    """Log file -> event kind (routing.KINDS)."""
+    return {
+        os.path.abspath(tribemembers_log_path): "tribemember",
+        os.path.abspath(players_log_path):      "player",
+        os.path.abspath(center_log_path):       "center",
+    }
+
 async def monitor_logs():
-    print("[BOT] Watching:",
-          os.path.abspath(tribemembers_log_path),
-          os.path.abspath(players_log_path),
-          os.path.abspath(center_log_path))
+    logs = _watched_logs()
+    print("[BOT] Watching:", *logs)
+    watcher = log_watch.make_watcher(list(logs), max_interval=POLL_INTERVAL_SEC)
+    print(f"[BOT] Log watcher: {type(watcher).__name__}")
+    await check_for_new_log_entries()
     while True:
-        await check_for_new_log_entries()
-        await asyncio.sleep(POLL_INTERVAL_SEC)
+        changed = await watcher.wait(timeout=WATCH_SAFETY_SEC)
+        for path in (changed or logs):
+            await tail_and_send(path, logs[path])
 
 async def check_for_new_log_entries():
-    await tail_and_send(tribemembers_log_path, tribemembers_channel_id, is_center=False)
-    await tail_and_send(players_log_path,      players_channel_id,      is_center=False)
-    await tail_and_send(center_log_path,       center_channel_id,       is_center=True)
-
-async def tail_and_send(log_path: str, channel_id: int, is_center: bool):
+    for path, kind in _watched_logs().items():
+        await tail_and_send(path, kind)
+
+def _read_rotated_tail(log_path: str, inode: int, pos: int, max_gen: int = 10) -> str:
+    """
+    After a rotation, the lines we had not read yet are in the file that now owns
+    `inode` (x.txt.1, or older if it rotated several times) plus every newer generation.
+    """
+    chunks = []
+    for gen in range(1, max_gen + 1):
+        try:
+            with open(f"{log_path}.{gen}", 'r', encoding='utf-8', errors='ignore') as f:
+                if os.fstat(f.fileno()).st_ino == inode:
+                    f.seek(pos)
+                    chunks.append(f.read())
+                    return "".join(reversed(chunks))
+                chunks.append(f.read())
+        except OSError:
+            break
+    return ""
+
+async def tail_and_send(log_path: str, kind: str):
+    log_path = os.path.abspath(log_path)
     try:
         if not os.path.exists(log_path):
             return
-        current_size = os.path.getsize(log_path)
         last_pos = file_positions.get(log_path, 0)
-        if current_size < last_pos:
-            last_pos = 0
         with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+            st = os.fstat(f.fileno())
+            old_inode = file_inodes.get(log_path)
+            data = ""
+            if old_inode is not None and st.st_ino != old_inode:
+                data = _read_rotated_tail(log_path, old_inode, last_pos)
+                last_pos = 0
+            elif st.st_size < last_pos:
+                last_pos = 0  # truncated in place
             f.seek(last_pos)
-            data = f.read()
+            data += f.read()
             file_positions[log_path] = f.tell()
+            file_inodes[log_path] = st.st_ino
         if not data:
             return
         for raw in (ln for ln in data.splitlines() if ln.strip()):
             line = _normalize_quotes_spaces(raw)
-            if is_center:
+            if kind == "center":
                 if not should_post_center_line(line):
                     continue
-                await handle_log_line(line, channel_id, is_center=True)
-            else:
-                if not should_emit_line(line):
-                    continue
-                await handle_log_line(line, channel_id, is_center=False)
+            elif not should_emit_line(line):
+                continue
+            await handle_log_line(line, kind)
     except Exception as e:
         print(f"[BOT] ERROR reading {log_path}: {type(e).__name__}: {e}")
 
-async def handle_log_line(line: str, channel_id: int, is_center: bool):
-    channel = client.get_channel(channel_id)
-    if channel is None:
-        print(f"[BOT] Canal {channel_id} introuvable.")
-        return
-    try:
-        await channel.send(line)
-        print(f"[SEND] -> {channel_id} : {line}")
-        if is_center and "destroyed" in line.lower():
-            await channel.send("@everyone **We are under attack! DEFEND!**")
-            schedule_audio()
-    except Exception as e:
-        print(f"[BOT] Envoi échoué {channel_id}: {type(e).__name__}: {e}")
+# =========================
+# OUTBOUND MESSAGES
+# =========================
+# One queue per channel: lines of a burst are merged into one message with a
+# single @everyone; sends are paced from Discord's rate-limit headers. A line
+# is queued on every routed guild's channel, so guilds are sent concurrently.
+DISCORD_API_BASE = os.getenv("DISCORD_API_BASE", send_queue.DISCORD_API)
+SEND_COALESCE_MS = 250
+ALERT_MENTION_COOLDOWN_SEC = 15
+_dispatcher: send_queue.SendDispatcher | None = None
+
+def get_dispatcher() -> send_queue.SendDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        sender = send_queue.RestSender(client.http.token, api_base=DISCORD_API_BASE)
+        _dispatcher = send_queue.SendDispatcher(sender, coalesce_ms=SEND_COALESCE_MS,
+                                                alert_cooldown_sec=ALERT_MENTION_COOLDOWN_SEC)
+    return _dispatcher
+
+async def handle_log_line(line: str, kind: str, origin: float | None = None):
+    alert = kind == "center" and "destroyed" in line.lower()
+    routes.fan_out(get_dispatcher(), kind, line, alert=alert, origin=origin)
+    if alert:
+        schedule_audio("center")
+
+# =========================
+# IN-PROCESS EVENT LOOP
+# =========================
+_event_queue: asyncio.Queue | None = None
+_monitor_task: asyncio.Task | None = None
+_H_PICKUP = metrics.stage("bot_pickup")   # event emitted by the scout -> handled here
+
+async def consume_events(q: asyncio.Queue):
+    print("[BOT] Listening to in-process scout events")
+    while True:
+        ev = await q.get()
+        _H_PICKUP.observe(time.time() - ev.ts)
+        try:
+            line = ev.line()
+            if ev.kind == "center":
+                if not should_post_center_event(ev.ts_key, _canon_obj(ev.obj), ev.action):
+                    continue
+            elif not should_emit_line(line):
+                continue
+            await handle_log_line(line, ev.kind, origin=ev.origin)
+        except Exception as e:
+            print(f"[BOT] ERROR handling event {ev!r}: {type(e).__name__}: {e}")
 
 # =========================
 # EVENTS
 # =========================
 @client.event
 async def on_ready():
-    print(f"Connecté en tant que {client.user} (guilds={len(client.guilds)})")
-    prime_file_offsets(SKIP_HISTORY_ON_START)
+    global _event_queue, _checkpoint_task, _monitor_task
+    print(f"Connecté en tant que {client.user} (guilds={len(client.guilds)}, shards={client.shard_count or 1})")
     start_voice_keeper()
-    asyncio.create_task(monitor_logs())
+    schedule_alert_prepare()
+    if _checkpoint_task is None:
+        _checkpoint_task = asyncio.create_task(_checkpoint_loop())
+    if EVENT_SOURCE == "bus":
+        if _event_queue is None:  # on_ready fires again after reconnects
+            _event_queue = events.BUS.subscribe_async(asyncio.get_running_loop())
+            asyncio.create_task(consume_events(_event_queue))
+    elif _monitor_task is None:  # same: a reconnect must not rewind the tails
+        prime_file_offsets(SKIP_HISTORY_ON_START)
+        _monitor_task = asyncio.create_task(monitor_logs())
 
 # =========================
 # ENTRYPOINT
 # =========================
 def main():
     TOKEN = "YOUR_BOT_TOKEN_HERE"  # Replace with your bot token or use environment variable
+    restore_checkpoint()
     print("[BOT] Starting client.run()")
-    client.run(TOKEN)
+    try:
+        client.run(TOKEN)
+    finally:
+        checkpoint.save(CHECKPOINT_PATH, checkpoint_state())
+
+if __name__ == "__main__":
+    # standalone bot (scout running in another process): tail the log files
+    main()
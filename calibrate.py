@@ -0,0 +1,319 @@
+"""
+Zone calibration: find the notification areas on the screen and write the
+tightest zones to zones.json.
+
+A full-screen frame (live grab or screenshot) is searched for text lines in
+the areas where ARK draws join / leave messages (top) and destruction
+entries (center): bright pixels (max of B, G, R) are cut into lines by row
+projection, then into runs of glyphs. A line counts when it is verified as
+a notification: matched against the glyph templates (glyph_prefilter.py,
+rescaled to the line's height, so any HUD scale works) or, without
+templates, read by the OCR backend. From the verified lines of one or more
+frames:
+
+- rect  : the lines' extent, widened to the longest possible message and the
+          number of lines the zone shows, at the measured glyph height
+- scale : OCR upscale factor bringing that glyph height to TARGET_GLYPH_PX
+          (center zones: "scale"; player zones: the "upscale:N" step)
+
+Zones remember the screen size they were calibrated for ("calibrated_for");
+ensure_calibrated() recalibrates when the resolution differs, and falls back
+to scaling the rectangles proportionally while no notification is visible.
+
+    python calibrate.py                      # watch the screen until both zones are found
+    python calibrate.py --image shot.png     # from screenshots
+"""
+import argparse
+import os
+import re
+import time
+
+import cv2
+import numpy as np
+
+import glyph_prefilter
+import line_cache
+import preprocess
+import zones as zone_config
+
+# search areas per parser, (y0, y1, x0, x1) as fractions of the screen
+SEARCH_AREAS = {"player": (0.0, 0.25, 0.15, 0.85), "center": (0.08, 0.85, 0.2, 0.8)}
+TEXT_MIN = 150            # text_channel() level counted as ink
+GLYPH_PX = (7, 80)        # plausible glyph heights
+CHAR_ASPECT = 0.55        # average glyph advance / glyph height
+MAX_LINE_CHARS = {"player": 64, "center": 46}   # "Tribemember <name> has left this Ark.", "Your '<obj>' was destroyed!"
+MAX_LINES = {"player": 2, "center": 18}         # lines a zone shows at once
+LINE_PITCH = 1.8          # line spacing in glyph heights
+PAD = 0.6                 # margin around text in glyph heights
+TARGET_GLYPH_PX = 30      # glyph height Tesseract reads best, after upscaling
+MAX_UPSCALE = 4
+TEMPLATE_THRESHOLD = 0.6
+# a line's ink height differs from the template's with its content (descenders, quotes)
+TEMPLATE_FACTORS = tuple(np.arange(0.7, 1.31, 0.05))
+PHRASE_RE = {"player": re.compile(r"h[ae]s\s+(joined|left)\s+this", re.I),
+             "center": re.compile(r"was\s+destroyed|day\s*\d+", re.I)}
+DEFAULT_SCREEN = (1920, 1080)   # layout of zones without "calibrated_for"
+
+# --------------------------------------------------------------------
+# Detection
+# --------------------------------------------------------------------
+def text_lines(frame: np.ndarray, area: tuple) -> list[tuple[int, int, int, int]]:
+    """Candidate text lines (x, y, w, h) in screen pixels inside `area`."""
+    H, W = frame.shape[:2]
+    y0, y1, x0, x1 = int(area[0] * H), int(area[1] * H), int(area[2] * W), int(area[3] * W)
+    chan = glyph_prefilter.text_channel(frame[y0:y1, x0:x1])
+    _, ink = cv2.threshold(chan, TEXT_MIN - 1, 255, cv2.THRESH_BINARY)
+    out = []
+    for by0, by1, _, _ in line_cache.split_line_bands(ink, min_height=GLYPH_PX[0], merge_gap_ratio=0.0):
+        h = by1 - by0
+        if h > GLYPH_PX[1]:
+            continue
+        cols = np.flatnonzero(ink[by0:by1].any(axis=0))
+        # glyph runs: split where the gap is wider than a couple of glyph widths
+        splits = np.flatnonzero(np.diff(cols) > 1.5 * h) + 1
+        for run in np.split(cols, splits):
+            w = int(run[-1] - run[0] + 1)
+            if w >= 4 * h:   # a few words at least
+                out.append((x0 + int(run[0]), y0 + by0, w, h))
+    return out
+
+def _ink_height(tpl: np.ndarray) -> int:
+    rows = np.flatnonzero(tpl.max(axis=1) >= TEXT_MIN)
+    return int(rows[-1] - rows[0] + 1) if rows.size else tpl.shape[0]
+
+class Calibrator:
+    """
+    templates : {phrase: crops} (glyph_prefilter.load_templates()); None = verify with OCR
+    Feed frames with add(); result() gives {parser: (rect, glyph height)}.
+    """
+
+    def __init__(self, templates: dict | None = None, ocr=None):
+        self.templates = {}
+        for parser, phrases in glyph_prefilter.PHRASES.items():
+            tpls = [glyph_prefilter.text_channel(c) for p in phrases for c in (templates or {}).get(p, ())]
+            self.templates[parser] = [(t, _ink_height(t)) for t in tpls]
+        self.ocr = ocr
+        self.lines: dict[str, list[tuple]] = {p: [] for p in SEARCH_AREAS}
+        self.frames = 0
+
+    def _verify(self, frame: np.ndarray, box: tuple, parser: str) -> bool:
+        x, y, w, h = box
+        pad = max(2, h // 2)
+        crop = glyph_prefilter.text_channel(frame[max(0, y - pad):y + h + pad, max(0, x - pad):x + w + pad])
+        tpls = self.templates[parser]
+        if tpls:
+            for tpl, ink_h in tpls:
+                for f in TEMPLATE_FACTORS:
+                    k = f * ink_h / h
+                    img = cv2.resize(crop, None, fx=k, fy=k, interpolation=cv2.INTER_AREA if k < 1 else cv2.INTER_LINEAR)
+                    if img.shape[0] < tpl.shape[0] or img.shape[1] < tpl.shape[1]:
+                        continue
+                    if cv2.minMaxLoc(cv2.matchTemplate(img, tpl, cv2.TM_CCOEFF_NORMED))[1] >= TEMPLATE_THRESHOLD:
+                        return True
+            return False
+        if self.ocr is None:
+            return False
+        k = max(1.0, TARGET_GLYPH_PX / h)
+        big = cv2.resize(crop, None, fx=k, fy=k, interpolation=cv2.INTER_CUBIC)
+        _, big = cv2.threshold(big, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        try:
+            text = self.ocr.image_to_string(big, "--oem 3 --psm 7 -l eng")
+        except Exception as e:
+            print(f"[CALIBRATE] OCR failed: {type(e).__name__}: {e}")
+            return False
+        return bool(PHRASE_RE[parser].search(text))
+
+    def add(self, frame: np.ndarray) -> dict[str, int]:
+        """Verified notification lines found in this frame, per parser."""
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = frame[..., :3]
+        self.frames += 1
+        self.screen = (frame.shape[1], frame.shape[0])
+        found = {}
+        for parser, area in SEARCH_AREAS.items():
+            hits = [b for b in text_lines(frame, area) if self._verify(frame, b, parser)]
+            self.lines[parser].extend(hits)
+            found[parser] = len(hits)
+        return found
+
+    def result(self) -> dict[str, tuple[dict, int]]:
+        out = {}
+        for parser, boxes in self.lines.items():
+            if boxes:
+                out[parser] = zone_rect(parser, boxes, self.screen)
+        return out
+
+def zone_rect(parser: str, boxes: list[tuple], screen: tuple[int, int]) -> tuple[dict, int]:
+    """Tightest rectangle holding any message of this parser, from the lines seen; (rect, glyph height)."""
+    W, H = screen
+    gh = int(np.median([b[3] for b in boxes]))
+    pad = PAD * gh
+    left, right = min(b[0] for b in boxes) - pad, max(b[0] + b[2] for b in boxes) + pad
+    need = MAX_LINE_CHARS[parser] * CHAR_ASPECT * gh + 2 * pad
+    if right - left < need:   # lines are centered: grow both ways
+        mid = (left + right) / 2
+        left, right = mid - need / 2, mid + need / 2
+    top, bottom = min(b[1] for b in boxes) - pad, max(b[1] + b[3] for b in boxes) + pad
+    need = MAX_LINES[parser] * LINE_PITCH * gh
+    if bottom - top < need:
+        if parser == "player":   # messages start at the top line
+            bottom = top + need
+        else:
+            mid = (top + bottom) / 2
+            top, bottom = mid - need / 2, mid + need / 2
+    left, top = max(0, int(left)), max(0, int(top))
+    right, bottom = min(W, int(np.ceil(right))), min(H, int(np.ceil(bottom)))
+    return {"top": top, "left": left, "width": right - left, "height": bottom - top}, gh
+
+def upscale_for(glyph_px: float) -> int:
+    return int(np.clip(round(TARGET_GLYPH_PX / max(1.0, glyph_px)), 1, MAX_UPSCALE))
+
+# --------------------------------------------------------------------
+# Zone specs
+# --------------------------------------------------------------------
+def _set_upscale(spec: zone_config.ZoneSpec, factor: int):
+    if spec.parser == "center":
+        spec.scale = factor
+        return
+    steps = [s for s in (spec.preprocess or preprocess.TOP_LINE_CHAIN) if not s.startswith("upscale")]
+    steps.insert(1 if steps[:1] == ["gray"] else 0, f"upscale:{factor}")
+    spec.preprocess = steps
+
+def _calibratable(spec: zone_config.ZoneSpec) -> bool:
+    return not spec.relative and not spec.window
+
+def apply(specs: list[zone_config.ZoneSpec], result: dict, screen: tuple[int, int],
+          monitor: int | None = None) -> list[str]:
+    """Writes the calibration into the first calibratable zone of each parser; returns the zones changed."""
+    changed = []
+    for parser, (rect, gh) in result.items():
+        spec = next((z for z in specs if z.parser == parser and _calibratable(z)), None)
+        if spec is None:
+            continue
+        spec.rect, spec.monitor = rect, monitor
+        spec.calibrated_for = {"width": screen[0], "height": screen[1]}
+        _set_upscale(spec, upscale_for(gh))
+        changed.append(spec.name)
+    return changed
+
+def save(specs: list[zone_config.ZoneSpec], path: str | None = None):
+    """Saves `specs` over their namesakes in the config, keeping its other (e.g. disabled) zones."""
+    path = path or zone_config.default_path()
+    by_name = {z.name: z for z in specs}
+    full = zone_config.load_zones(path, enabled_only=False) if os.path.exists(path) else []
+    merged = [by_name.pop(z.name, z) for z in full] + list(by_name.values())
+    zone_config.save_zones(merged, path)
+
+def calibrated_screen(spec: zone_config.ZoneSpec) -> tuple[int, int]:
+    c = spec.calibrated_for
+    return (c["width"], c["height"]) if c else DEFAULT_SCREEN
+
+def rescale(specs: list[zone_config.ZoneSpec], screen: tuple[int, int]) -> list[str]:
+    """Scales zones calibrated for another screen size proportionally (the HUD scales with it)."""
+    changed = []
+    for spec in specs:
+        old = calibrated_screen(spec)
+        if not _calibratable(spec) or old == screen:
+            continue
+        fx, fy = screen[0] / old[0], screen[1] / old[1]
+        r = spec.rect
+        spec.rect = {"top": round(r["top"] * fy), "left": round(r["left"] * fx),
+                     "width": round(r["width"] * fx), "height": round(r["height"] * fy)}
+        factor = spec.scale if spec.parser == "center" else next(
+            (int(s.split(":")[1]) for s in spec.preprocess if s.startswith("upscale:")), 2)
+        _set_upscale(spec, int(np.clip(round(factor / fy), 1, MAX_UPSCALE)))
+        spec.calibrated_for = {"width": screen[0], "height": screen[1]}
+        changed.append(spec.name)
+    return changed
+
+# --------------------------------------------------------------------
+# Screen
+# --------------------------------------------------------------------
+CALIBRATE_MONITOR = 1   # mss index: 1 = primary monitor
+
+def screen_size(monitor: int = CALIBRATE_MONITOR) -> tuple[int, int]:
+    from mss import mss
+    with mss() as sct:
+        m = sct.monitors[monitor]
+        return m["width"], m["height"]
+
+def grab_screen(monitor: int = CALIBRATE_MONITOR) -> np.ndarray:
+    from mss import mss
+    with mss() as sct:
+        shot = sct.grab(sct.monitors[monitor])
+        return np.frombuffer(shot.raw, np.uint8).reshape(shot.height, shot.width, 4)[..., :3].copy()
+
+def _make_calibrator() -> Calibrator:
+    templates = glyph_prefilter.load_templates()
+    ocr = None
+    if not templates:
+        import ocr_backend
+        ocr = ocr_backend.get_backend()
+    return Calibrator(templates or None, ocr)
+
+def needs_calibration(specs: list[zone_config.ZoneSpec], screen: tuple[int, int]) -> bool:
+    return any(_calibratable(z) and calibrated_screen(z) != screen for z in specs)
+
+def ensure_calibrated(specs: list[zone_config.ZoneSpec], path: str | None = None,
+                      monitor: int = CALIBRATE_MONITOR) -> bool:
+    """
+    Recalibrates `specs` (in place) when the monitor size is not the one they were calibrated for:
+    from a screen grab (saved to the config), else proportional scaling (this session only).
+    Returns True if the zones changed.
+    """
+    screen = screen_size(monitor)
+    if not needs_calibration(specs, screen):
+        return False
+    cal = _make_calibrator()
+    cal.add(grab_screen(monitor))
+    changed = apply(specs, cal.result(), screen, monitor)
+    if changed:
+        save(specs, path)
+        print(f"[CALIBRATE] {screen[0]}x{screen[1]}: {', '.join(changed)} calibrated, saved to "
+              f"{path or zone_config.default_path()}")
+    scaled = rescale(specs, screen)
+    if scaled:
+        print(f"[CALIBRATE] {screen[0]}x{screen[1]}: no notification on screen for {', '.join(scaled)}, "
+              f"scaled proportionally (run `python calibrate.py` while one is visible)")
+    return bool(changed or scaled)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Find the notification zones and write them to the zone config")
+    ap.add_argument("--image", nargs="*", help="full-screen screenshots instead of the live screen")
+    ap.add_argument("--monitor", type=int, default=CALIBRATE_MONITOR, help="mss monitor index (live)")
+    ap.add_argument("--watch", type=float, default=120.0, help="seconds to watch the live screen")
+    ap.add_argument("--zones", metavar="PATH", help="zone config (default: zones.json next to this script)")
+    ap.add_argument("--dry-run", action="store_true", help="print the zones, do not save")
+    args = ap.parse_args()
+
+    cal = _make_calibrator()
+    if args.image:
+        for path in args.image:
+            img = cv2.imread(path, cv2.IMREAD_COLOR)
+            if img is None:
+                raise SystemExit(f"Cannot read {path}")
+            print(f"[CALIBRATE] {os.path.basename(path)}: {cal.add(img)}")
+        monitor = None
+    else:
+        monitor = args.monitor
+        print(f"[CALIBRATE] watching monitor {monitor} for {args.watch:.0f}s: make a join / leave and a "
+              f"destruction message appear")
+        deadline = time.monotonic() + args.watch
+        while time.monotonic() < deadline and not all(cal.lines.values()):
+            cal.add(grab_screen(monitor))
+            time.sleep(0.5)
+    result = cal.result()
+    specs = zone_config.load_zones(args.zones, enabled_only=False)
+    before = {z.name: z.rect["width"] * z.rect["height"] for z in specs}
+    changed = apply(specs, result, cal.screen, monitor)
+    for spec in specs:
+        if spec.name in changed:
+            gh = result[spec.parser][1]
+            print(f"[CALIBRATE] {spec.name}: {spec.rect} (glyphs {gh}px, upscale {upscale_for(gh)}), "
+                  f"{before[spec.name]} -> {spec.rect['width'] * spec.rect['height']} px")
+    missing = [p for p in SEARCH_AREAS if p not in result]
+    if missing:
+        print(f"[CALIBRATE] no {' / '.join(missing)} notification found: those zones are unchanged")
+    if changed and not args.dry_run:
+        save(specs, args.zones)
+        print(f"[CALIBRATE] saved {args.zones or zone_config.default_path()}")
@@ -0,0 +1,218 @@
+"""
+Threaded capture -> OCR pipeline.
+
+The capture thread grabs frames (paced by scheduler.AdaptiveScheduler on a
+live source), runs change detection and pushes changed frames into one
+bounded ZoneQueue per zone. One OCR worker per zone consumes its queue, so a
+slow center OCR never delays the next top-zone grab.
+
+Backpressure policies (per zone):
+- "drop-oldest": keep the newest `depth` items, drop the oldest on overflow
+- "latest-only": keep only the newest item
+- "coalesce"   : merge into the queued item: newest frame, union of dirty boxes
+- "block"      : the capture thread waits for room (replay / benchmarks)
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+import change_detect
+import events
+import metrics
+
+_H_GRAB = metrics.stage("grab")
+_H_DIFF = metrics.stage("diff")
+
+POLICIES = ("drop-oldest", "latest-only", "coalesce", "block")
+
+@dataclass
+class ZoneItem:
+    ts: float
+    frame: np.ndarray
+    boxes: list
+    captured: float = 0.0   # wall time of the grab (earliest one when coalesced)
+
+class ZoneQueue:
+    """on_drop(item) is called for items replaced or dropped without being processed."""
+
+    def __init__(self, policy: str = "drop-oldest", depth: int = 4, on_drop=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unsupported queue policy: {policy}")
+        self.policy = policy
+        self.depth = 1 if policy == "latest-only" else max(1, depth)
+        self.on_drop = on_drop
+        self._items: deque[ZoneItem] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.puts = 0
+        self.drops = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+    def put(self, item: ZoneItem):
+        with self._cond:
+            self.puts += 1
+            dropped = None
+            if self.policy == "coalesce" and self._items:
+                last = dropped = self._items[-1]
+                self._items[-1] = ZoneItem(item.ts, item.frame, last.boxes + item.boxes, last.captured)
+                self.coalesced += 1
+            elif self.policy == "block":
+                while len(self._items) >= self.depth and not self._closed:
+                    self._cond.wait()
+                self._items.append(item)
+            else:
+                if len(self._items) >= self.depth:
+                    dropped = self._items.popleft()
+                    self.drops += 1
+                self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+        if dropped is not None and self.on_drop:
+            self.on_drop(dropped)
+
+    def get(self) -> ZoneItem | None:
+        """Blocks for the next item; None once the queue is closed and drained."""
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"policy": self.policy, "depth": len(self._items), "max_depth": self.max_depth,
+                    "puts": self.puts, "drops": self.drops, "coalesced": self.coalesced}
+
+class CapturePipeline:
+    """
+    source   : frame_source.FrameSource
+    zones    : {name: mss rectangle}
+    handler  : handler(frame, zone, boxes), run on the zone's OCR worker
+    policies : {zone: policy} for live sources (default "drop-oldest"); replay always uses "block"
+    persistence : {zone: frames} a change must last before it is reported (change_detect default if absent)
+    report_ocr  : give the handler's run time to scheduler.report_busy(); off when the handler only
+                  hands the frame to another process, which then reports the OCR time itself
+    """
+
+    def __init__(self, source, zones: dict, handler, scheduler=None,
+                 policies: dict | None = None, depth: int = 4, persistence: dict | None = None,
+                 report_ocr: bool = True):
+        self.source = source
+        self.zones = zones
+        self.handler = handler
+        self.scheduler = scheduler
+        self.report_ocr = report_ocr
+        # replay never drops: the capture thread simply waits for the workers
+        policies = policies or {}
+        self.queues = {z: ZoneQueue(policies.get(z, "drop-oldest") if source.live else "block", depth,
+                                    on_drop=self._release)
+                       for z in zones}
+        self.detectors = {z: change_detect.ChangeDetector() for z in zones}
+        for z, frames in (persistence or {}).items():
+            self.detectors[z].persistence = max(1, frames)
+        self.frames_captured = 0
+        self.processed = {z: 0 for z in zones}
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def _release(self, item: ZoneItem):
+        self.source.release(item.frame)
+
+    # ---------------- capture ----------------
+    def _capture_loop(self):
+        try:
+            while not self._stop.is_set():
+                live = self.source.live and self.scheduler is not None
+                due = self.scheduler.due() if live else list(self.zones)
+                if not due:
+                    self._stop.wait(self.scheduler.sleep_time())
+                    continue
+                captured = time.time()
+                with _H_GRAB.time():
+                    grabbed = self.source.grab({z: self.zones[z] for z in due})
+                if grabbed is None:
+                    print("[SOURCE] End of frames.")
+                    break
+                ts, frames = grabbed
+                self.frames_captured += 1
+                for zone in due:
+                    cur = frames.get(zone)
+                    if cur is None:
+                        continue
+                    t0 = time.perf_counter()
+                    boxes = self.detectors[zone].update(cur)
+                    dt = time.perf_counter() - t0
+                    _H_DIFF.observe(dt)
+                    if boxes:
+                        self.queues[zone].put(ZoneItem(ts, cur, boxes, captured))
+                    else:
+                        self.source.release(cur)
+                    if live:
+                        self.scheduler.report(zone, bool(boxes), dt)
+        except Exception as e:
+            print(f"[CAPTURE] error: {type(e).__name__}: {e}")
+        finally:
+            for q in self.queues.values():
+                q.close()
+
+    # ---------------- OCR workers ----------------
+    def _worker_loop(self, zone: str):
+        q = self.queues[zone]
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            events.set_origin(item.captured)
+            t0 = time.perf_counter()
+            try:
+                self.handler(item.frame, zone, item.boxes)
+            except Exception as e:
+                print(f"[OCR {zone}] worker error: {type(e).__name__}: {e}")
+            if self.report_ocr and self.scheduler is not None and self.source.live:
+                self.scheduler.report_busy(zone, time.perf_counter() - t0)
+            self.source.release(item.frame)
+            self.processed[zone] += 1
+
+    def start(self):
+        for zone in self.zones:
+            t = threading.Thread(target=self._worker_loop, args=(zone,), name=f"OCR-{zone}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        cap = threading.Thread(target=self._capture_loop, name="CAPTURE", daemon=True)
+        cap.start()
+        self._threads.append(cap)
+
+    def stop(self):
+        self._stop.set()
+        for q in self.queues.values():
+            q.close()
+
+    def alive(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def join(self, timeout: float | None = None):
+        for t in self._threads:
+            t.join(timeout)
+
+    def stats(self) -> dict:
+        return {"frames_captured": self.frames_captured,
+                "processed": dict(self.processed),
+                "queues": {z: q.stats() for z, q in self.queues.items()}}
+
+    def summary(self) -> str:
+        parts = []
+        for z, q in self.stats()["queues"].items():
+            parts.append(f"{z} depth={q['depth']}/{q['max_depth']} drops={q['drops']} coalesced={q['coalesced']}")
+        return " | ".join(parts)
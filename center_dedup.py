@@ -0,0 +1,184 @@
+"""
+Fuzzy dedup of center "Day N, HH:MM:SS: Your 'OBJ' was destroyed!" events,
+shared by the scout and the bot.
+
+Events are indexed by their in-game timestamp; a new event is a duplicate if
+an earlier one with the same timestamp and action has an object name within
+a banded Levenshtein distance of (1 - similarity) * length. The band keeps a
+comparison at O(k * n) and stops as soon as the distance exceeds k.
+
+Memory is bounded three ways:
+- ttl_sec   : a timestamp is forgotten `ttl_sec` after it was first seen
+- keep_days : on game-day rollover, timestamps older than `keep_days` days go.
+              A rollover is only accepted once confirmed: `rollover_confirm`
+              distinct timestamps on the new day with no newer line of the
+              current day in between, or one just after 00:00 following one
+              just before midnight (the clock reset). A misread day number
+              neither evicts nor moves current_day.
+- max_keys  : hard cap on remembered timestamps (oldest first), per_key objects each
+
+export() / restore() carry the window and the current game day across a
+restart (see checkpoint.py).
+
+Accuracy: `similarity` sets the allowed edits relative to the name length,
+`min_edits` the floor for short names; `fold_confusions` compares OCR
+skeletons ("Metal Rarnp" == "Metal Ramp") instead of the raw names.
+"""
+import unicodedata
+
+import ttl_cache
+
+def canon_object(s: str) -> str:
+    """NFKC, lowercase, punctuation -> spaces, collapsed whitespace."""
+    s = unicodedata.normalize("NFKC", s).lower()
+    s = s.replace("‘", "'").replace("’", "'").replace("`", "'").replace("´", "'")
+    s = s.replace("“", '"').replace("”", '"')
+    s = "".join(ch if ch.isalnum() or ch.isspace() else " " for ch in s)
+    return " ".join(s.split())
+
+# glyphs tesseract confuses on the center font, folded before comparing
+_OCR_FOLD = str.maketrans({"0": "o", "1": "l", "i": "l", "5": "s"})
+
+def ocr_skeleton(canon: str) -> str:
+    """canon_object() output with common OCR confusions folded (rn -> m, 0 -> o, i/1 -> l, 5 -> s)."""
+    return canon.replace("rn", "m").translate(_OCR_FOLD)
+
+def within_distance(a: str, b: str, k: int) -> bool:
+    """Levenshtein(a, b) <= k, computed only inside the diagonal band of width k."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if k <= 0 or abs(la - lb) > k:
+        return False
+    big = k + 1
+    prev = [j if j <= k else big for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        lo, hi = max(1, i - k), min(lb, i + k)
+        cur = [big] * (lb + 1)
+        cur[0] = i if i <= k else big
+        best = cur[0]
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            v = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            cur[j] = v
+            if v < best:
+                best = v
+        if best > k:
+            return False
+        prev = cur
+    return prev[lb] <= k
+
+def ts_key(day: int, clock: str) -> str:
+    return f"{int(day)}-{clock}"
+
+def _seconds(clock: str) -> int:
+    h, m, s = (int(p) for p in clock.split(":"))
+    return h * 3600 + m * 60 + s
+
+class CenterDedup:
+    def __init__(self, similarity: float = 0.90, ttl_sec: float = 600.0, keep_days: int = 1,
+                 max_keys: int = 2048, per_key: int = 32, min_edits: int = 1, fold_confusions: bool = True,
+                 max_day_jump: int = 5, rollover_confirm: int = 2, rollover_window_min: int = 60):
+        self.similarity = similarity
+        # short names ("Vault") still tolerate one OCR slip
+        self.min_edits = min_edits
+        self.fold_confusions = fold_confusions
+        self.keep_days = keep_days
+        self.per_key = per_key
+        # a day number far ahead of the current one is an OCR misread, not a rollover
+        self.max_day_jump = max_day_jump
+        self.rollover_confirm = max(1, rollover_confirm)
+        self.rollover_window_sec = rollover_window_min * 60
+        self._last_clock: str | None = None          # latest clock seen on current_day
+        self._pending_day: int | None = None
+        self._pending_clocks: set[str] = set()
+        self._seen = ttl_cache.TTLCache(ttl_sec, max_keys, stable_keys=True)  # ts key -> ((obj, action), ...)
+        self._days: dict[int, list[str]] = {}
+        self.current_day: int | None = None
+        self.posted = 0
+        self.duplicates = 0
+        self.rollovers = 0
+
+    def _max_distance(self, a: str, b: str) -> int:
+        return max(self.min_edits, int((1.0 - self.similarity) * max(len(a), len(b)) + 1e-9))
+
+    def _similar(self, a: str, b: str) -> bool:
+        return within_distance(a, b, self._max_distance(a, b))
+
+    def _clock_reset(self, day: int, clock: str) -> bool:
+        """The next day's clock just after 00:00, right after the current day's last minutes."""
+        if day != self.current_day + 1 or self._last_clock is None:
+            return False
+        w = self.rollover_window_sec
+        return _seconds(clock) < w and _seconds(self._last_clock) >= 86400 - w
+
+    def _advance_day(self, day: int, clock: str):
+        if self.current_day is None:
+            self.current_day, self._last_clock = day, clock
+            return
+        if day == self.current_day:
+            if self._last_clock is None or clock > self._last_clock:
+                # a newer line of the current day: the pending day was a misread
+                self._last_clock = clock
+                self._pending_day, self._pending_clocks = None, set()
+            return
+        if day < self.current_day or day - self.current_day > self.max_day_jump:
+            return
+        if day != self._pending_day:
+            self._pending_day, self._pending_clocks = day, set()
+        self._pending_clocks.add(clock)
+        if len(self._pending_clocks) < self.rollover_confirm and not self._clock_reset(day, clock):
+            return
+        self.current_day, self._last_clock = day, max(self._pending_clocks)
+        self._pending_day, self._pending_clocks = None, set()
+        self.rollovers += 1
+        for old in [d for d in self._days if d < day - self.keep_days]:
+            for key in self._days.pop(old):
+                self._seen.pop(key)
+
+    def should_post(self, day: int, clock: str, obj: str, action: str = "destroyed") -> bool:
+        """True for a new event (now remembered), False for a duplicate."""
+        day = int(day)
+        obj = canon_object(obj)
+        if self.fold_confusions:
+            obj = ocr_skeleton(obj)
+        action = action.lower()
+        self._advance_day(day, clock)
+        key = ts_key(day, clock)
+        seen = self._seen.get(key)
+        if seen is None:
+            self._days.setdefault(day, []).append(key)
+            seen = ()
+        for prev_obj, prev_act in seen:
+            if prev_act == action and self._similar(obj, prev_obj):
+                self.duplicates += 1
+                return False
+        self._seen.set(key, (seen + ((obj, action),))[-self.per_key:])
+        self.posted += 1
+        return True
+
+    def export(self, limit: int | None = None) -> dict:
+        """JSON-able state: the newest `limit` timestamps, their day index and the current day."""
+        seen = self._seen.export(limit)
+        live = {key for key, _, _ in seen}
+        days = {str(d): [k for k in keys if self._seen._key(k) in live] for d, keys in self._days.items()}
+        return {"current_day": self.current_day, "seen": seen, "days": {d: k for d, k in days.items() if k}}
+
+    def restore(self, state: dict):
+        self._seen.restore(state.get("seen", ()), value=lambda v: tuple(tuple(p) for p in v))
+        for d, keys in state.get("days", {}).items():
+            self._days.setdefault(int(d), []).extend(k for k in keys if k in self._seen)
+        if self.current_day is None:
+            self.current_day = state.get("current_day")
+
+    def __len__(self):
+        return len(self._seen)
+
+    def stats(self) -> dict:
+        return {"keys": len(self._seen), "posted": self.posted, "duplicates": self.duplicates,
+                "rollovers": self.rollovers, "current_day": self.current_day,
+                "evictions": self._seen.evictions, "expirations": self._seen.expirations}
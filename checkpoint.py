@@ -0,0 +1,91 @@
+"""
+Warm-restart checkpoints.
+
+A checkpoint is one small JSON file, {"version", "saved_at", "state"}, written
+atomically (temporary file + os.replace) every few seconds and on shutdown.
+At startup load() returns the state if the file is recent enough
+(`max_age_sec`), so a crash or restart resumes with the dedup windows, the
+current game day and the log tail offsets it had, instead of starting empty.
+
+Sizes stay bounded because every component exports a capped window (see
+TTLCache.export / CenterDedup.export).
+"""
+import json
+import os
+import threading
+import time
+
+VERSION = 1
+
+def save(path: str, state: dict) -> int:
+    """Writes the checkpoint atomically; returns its size in bytes."""
+    data = json.dumps({"version": VERSION, "saved_at": time.time(), "state": state},
+                      separators=(",", ":")).encode()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(data)
+
+def load(path: str, max_age_sec: float) -> dict | None:
+    """The saved state, or None when missing, unreadable, from another version or older than max_age_sec."""
+    t0 = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            doc = json.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[CHECKPOINT] {path} unreadable ({type(e).__name__}: {e}), cold start")
+        return None
+    age = time.time() - doc.get("saved_at", 0)
+    if doc.get("version") != VERSION or not 0 <= age <= max_age_sec:
+        print(f"[CHECKPOINT] {os.path.basename(path)} ignored (age {age:.0f}s, version {doc.get('version')})")
+        return None
+    print(f"[CHECKPOINT] {os.path.basename(path)}: {age:.1f}s old, loaded in "
+          f"{(time.perf_counter() - t0) * 1000:.1f} ms")
+    return doc["state"]
+
+class Checkpointer:
+    """Calls collect() every `interval_sec` on a thread and saves the result; stop() saves once more."""
+
+    def __init__(self, path: str, collect, interval_sec: float = 5.0):
+        self.path = path
+        self.collect = collect
+        self.interval = interval_sec
+        self._stop = threading.Event()
+        self._thread = None
+        self.saves = 0
+        self.last_bytes = 0
+        self.last_ms = 0.0
+
+    def save_now(self):
+        t0 = time.perf_counter()
+        try:
+            self.last_bytes = save(self.path, self.collect())
+        except Exception as e:
+            print(f"[CHECKPOINT] save failed: {type(e).__name__}: {e}")
+            return
+        self.last_ms = (time.perf_counter() - t0) * 1000.0
+        self.saves += 1
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.save_now()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="CHECKPOINT", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self.save_now()
+
+    def stats(self) -> dict:
+        return {"saves": self.saves, "bytes": self.last_bytes, "save_ms": round(self.last_ms, 2)}
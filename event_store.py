@@ -0,0 +1,241 @@
+"""
+Indexed event history: SQLite in WAL mode.
+
+The scout appends every emitted event (EventStore.add, from emit_event); a
+background thread writes them in batches, one transaction per flush. The
+bot's history / stats commands query the same file through EventReader (WAL:
+readers never block the writer, and vice versa).
+
+Tables:
+- players   (ts, player, action, tribemember)  indexed on (player, ts) and ts
+- destroyed (ts, day, clock, obj, action, raid) indexed on ts and (obj, ts)
+- raids     (id, start, end, losses): destructions less than RAID_GAP_SEC
+  apart belong to the same raid; maintained at write time, so raid stats
+  never scan the destroyed table.
+
+`ts` is the wall time the event was emitted (the in-game day / clock of a
+destruction is kept as is).
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import metrics
+import ttl_cache
+
+RAID_GAP_SEC = 15 * 60
+PLAYER_DEDUP_SEC = 45   # a join / leave line stays on screen for several frames
+
+_H_FLUSH = metrics.stage("store_flush")
+_H_QUERY = metrics.stage("store_query")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    ts REAL NOT NULL, player TEXT NOT NULL COLLATE NOCASE, action TEXT NOT NULL, tribemember INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS players_player_ts ON players (player, ts);
+CREATE INDEX IF NOT EXISTS players_ts ON players (ts);
+CREATE TABLE IF NOT EXISTS destroyed (
+    ts REAL NOT NULL, day INTEGER, clock TEXT, obj TEXT NOT NULL COLLATE NOCASE, action TEXT NOT NULL,
+    raid INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS destroyed_ts ON destroyed (ts);
+CREATE INDEX IF NOT EXISTS destroyed_obj_ts ON destroyed (obj, ts);
+CREATE TABLE IF NOT EXISTS raids (
+    id INTEGER PRIMARY KEY, start REAL NOT NULL, end REAL NOT NULL, losses INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS raids_start ON raids (start);
+"""
+
+def default_path() -> str:
+    """ASCENDEDSCOUT_EVENTS_DB ("off" disables the store in the scout), else logs/events.db."""
+    env = os.getenv("ASCENDEDSCOUT_EVENTS_DB")
+    return env if env and env != "off" else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "logs", "events.db")
+
+def _connect(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# --------------------------------------------------------------------
+# Writer
+# --------------------------------------------------------------------
+class EventStore:
+    """
+    flush_ms    : pending events are written at least this often
+    batch_size  : ... or as soon as this many are pending
+    max_retries : a batch whose transaction failed is put back and retried on the next
+                  flushes; after this many failures in a row it is dropped
+    """
+
+    def __init__(self, path: str | None = None, flush_ms: int = 250, batch_size: int = 200,
+                 max_retries: int = 5):
+        self.path = path or default_path()
+        self.flush_interval = flush_ms / 1000.0
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self._conn = _connect(self.path)
+        self._raid = self._last_raid()
+        self._recent = ttl_cache.TTLCache(PLAYER_DEDUP_SEC)
+        self._pending: list = []
+        self._lock = threading.Lock()         # pending list
+        self._write_lock = threading.Lock()   # connection + raid state
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.written = 0
+        self.flushes = 0
+        self.failures = 0   # failed flushes in a row
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._flush_loop, name="EVENTSTORE", daemon=True)
+        self._thread.start()
+
+    def add(self, event):
+        if event.kind != "center" and not self._recent.add(event.line()):
+            return
+        with self._lock:
+            self._pending.append(event)
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"[STORE] write failed: {type(e).__name__}: {e}")
+
+    def flush(self):
+        with self._write_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        players, destroyed = [], []
+        try:
+            with _H_FLUSH.time(), self._conn:
+                for ev in batch:
+                    if ev.kind == "center":
+                        destroyed.append((ev.ts, ev.day, ev.clock, ev.obj, ev.action, self._raid_for(ev.ts)))
+                    else:
+                        players.append((ev.ts, ev.player, ev.action, int(ev.tribemember)))
+                self._conn.executemany("INSERT INTO players VALUES (?, ?, ?, ?)", players)
+                self._conn.executemany("INSERT INTO destroyed VALUES (?, ?, ?, ?, ?, ?)", destroyed)
+        except sqlite3.Error:
+            self._raid = self._last_raid()   # rolled back
+            self.failures += 1
+            if self.failures > self.max_retries:
+                self.dropped += len(batch)
+                self.failures = 0
+                print(f"[STORE] dropping {len(batch)} events after {self.max_retries + 1} failed writes")
+            else:
+                with self._lock:
+                    self._pending[:0] = batch   # oldest first, ahead of what arrived meanwhile
+            raise
+        self.failures = 0
+        self.written += len(batch)
+        self.flushes += 1
+
+    def _last_raid(self) -> list | None:
+        """[id, end] of the latest raid."""
+        row = self._conn.execute("SELECT id, end FROM raids ORDER BY id DESC LIMIT 1").fetchone()
+        return list(row) if row else None
+
+    def _raid_for(self, ts: float) -> int:
+        """Raid id of a destruction at `ts` (inside the flush transaction)."""
+        if self._raid is None or ts - self._raid[1] > RAID_GAP_SEC:
+            cur = self._conn.execute("INSERT INTO raids (start, end, losses) VALUES (?, ?, 1)", (ts, ts))
+            self._raid = [cur.lastrowid, ts]
+        else:
+            self._raid[1] = max(self._raid[1], ts)
+            self._conn.execute("UPDATE raids SET end = ?, losses = losses + 1 WHERE id = ?",
+                               (self._raid[1], self._raid[0]))
+        return self._raid[0]
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
+        self._conn.close()
+
+    def stats(self) -> dict:
+        return {"written": self.written, "flushes": self.flushes, "pending": len(self._pending),
+                "dropped": self.dropped}
+
+# --------------------------------------------------------------------
+# Queries
+# --------------------------------------------------------------------
+_SINCE = re.compile(r"^(\d+(?:\.\d+)?)\s*(m|min|h|d|w)$")
+_UNIT_SEC = {"m": 60, "min": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+def parse_since(text: str, now: float | None = None) -> float:
+    """'90m', '12h', '3d', '2w', 'today' or 'YYYY-MM-DD' (local time) -> epoch seconds."""
+    now = time.time() if now is None else now
+    text = text.strip().lower()
+    m = _SINCE.match(text)
+    if m:
+        return now - float(m.group(1)) * _UNIT_SEC[m.group(2)]
+    if text == "today":
+        lt = time.localtime(now)
+        return time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday, 0, 0, 0, 0, 0, -1))
+    try:
+        return time.mktime(time.strptime(text, "%Y-%m-%d"))
+    except ValueError:
+        raise ValueError(f"unrecognized time: {text!r} (e.g. 12h, 3d, today, 2026-01-31)") from None
+
+class EventReader:
+    """Read side for the bot; every call is a few indexed lookups (run it off the event loop)."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or default_path()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, args=()) -> list[tuple]:
+        with _H_QUERY.time(), self._lock:
+            if self._conn is None:
+                if not os.path.exists(self.path):
+                    return []   # nothing recorded yet
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            return self._conn.execute(sql, args).fetchall()
+
+    def history(self, player: str, limit: int = 10) -> list[tuple]:
+        """[(ts, player, action, tribemember)] newest first; exact name, else name prefix."""
+        rows = self._query("SELECT ts, player, action, tribemember FROM players WHERE player = ? "
+                           "ORDER BY ts DESC LIMIT ?", (player, limit))
+        if not rows:
+            prefix = re.sub(r"([\\%_])", r"\\\1", player) + "%"
+            rows = self._query("SELECT ts, player, action, tribemember FROM players WHERE player LIKE ? "
+                               "ESCAPE '\\' ORDER BY ts DESC LIMIT ?", (prefix, limit))
+        return rows
+
+    def losses(self, since: float, limit: int = 10) -> dict:
+        """Destructions since `since`: total, raids, [(object, count)] most lost first."""
+        # without INDEXED BY the planner walks all of (obj, ts) for the GROUP BY
+        by_obj = self._query("SELECT obj, COUNT(*) FROM destroyed INDEXED BY destroyed_ts WHERE ts >= ? "
+                             "GROUP BY obj ORDER BY COUNT(*) DESC", (since,))
+        raids = self._query("SELECT COUNT(*) FROM raids WHERE end >= ?", (since,))
+        return {"total": sum(n for _, n in by_obj), "raids": raids[0][0] if raids else 0,
+                "objects": by_obj[:limit]}
+
+    def top_raid_times(self, limit: int = 5) -> list[tuple]:
+        """[(weekday 0=Sunday, hour, raids, losses)] of raid starts (local time), busiest first."""
+        return self._query(
+            "SELECT CAST(strftime('%w', start, 'unixepoch', 'localtime') AS INTEGER) AS wd, "
+            "CAST(strftime('%H', start, 'unixepoch', 'localtime') AS INTEGER) AS hr, "
+            "COUNT(*), SUM(losses) FROM raids GROUP BY wd, hr ORDER BY COUNT(*) DESC, SUM(losses) DESC LIMIT ?",
+            (limit,))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
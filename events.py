@@ -0,0 +1,111 @@
+"""
+Typed in-process events between the scout (OCR threads) and the bot
+(discord.py event loop).
+
+The scout publishes PlayerEvent / DestroyedEvent on BUS; the bot subscribes
+with subscribe_async(loop), which hands every event to an asyncio.Queue
+through loop.call_soon_threadsafe. The log files stay as a journal (and as the
+transport when the two halves run in separate processes).
+
+Events created while a frame is processed carry `origin`, the wall time that
+frame was captured (set_origin() on the OCR thread), for end-to-end latency.
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+
+_origin = threading.local()
+
+def set_origin(ts: float | None):
+    """Capture time of the frame this thread is working on (None: not from a frame)."""
+    _origin.ts = ts
+
+def current_origin() -> float | None:
+    return getattr(_origin, "ts", None)
+
+@dataclass(frozen=True)
+class PlayerEvent:
+    player: str
+    action: str                  # "joined" | "left"
+    tribemember: bool = False
+    ts: float = field(default_factory=time.time, compare=False)
+    origin: float | None = field(default_factory=current_origin, compare=False)
+
+    @property
+    def kind(self) -> str:
+        return "tribemember" if self.tribemember else "player"
+
+    def line(self) -> str:
+        prefix = "Tribemember " if self.tribemember else ""
+        return f"{prefix}{self.player} has {self.action} this Ark."
+
+@dataclass(frozen=True)
+class DestroyedEvent:
+    day: int
+    clock: str                   # "HH:MM:SS"
+    obj: str
+    action: str = "destroyed"
+    ts: float = field(default_factory=time.time, compare=False)
+    origin: float | None = field(default_factory=current_origin, compare=False)
+
+    kind = "center"
+
+    @property
+    def ts_key(self) -> str:
+        return f"{self.day}-{self.clock}"
+
+    def line(self) -> str:
+        return f"Day {self.day}, {self.clock}: Your '{self.obj}' was {self.action}!"
+
+class EventBus:
+    def __init__(self):
+        self._subs = []
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, callback):
+        """callback(event) runs in the publisher's thread; keep it short."""
+        with self._lock:
+            self._subs.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subs:
+                self._subs.remove(callback)
+
+    def subscribe_async(self, loop: asyncio.AbstractEventLoop, maxsize: int = 0) -> asyncio.Queue:
+        """Returns a queue (bound to `loop`) receiving every published event."""
+        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+        def _put(ev):
+            try:
+                q.put_nowait(ev)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+        def _handoff(ev):
+            try:
+                loop.call_soon_threadsafe(_put, ev)
+            except RuntimeError:  # loop closed
+                self.dropped += 1
+
+        self.subscribe(_handoff)
+        return q
+
+    def publish(self, event):
+        with self._lock:
+            subs = list(self._subs)
+        self.published += 1
+        for cb in subs:
+            try:
+                cb(event)
+            except Exception as e:
+                print(f"[BUS] subscriber error: {type(e).__name__}: {e}")
+
+BUS = EventBus()
+
+def publish(event):
+    BUS.publish(event)
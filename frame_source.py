@@ -0,0 +1,365 @@
+"""
+Frame sources for AscendedScout.
+
+Every source answers `grab(zones)` with `(timestamp, {zone_name: BGRA ndarray})`,
+or None once a replay is exhausted. `zones` maps zone names to mss-style
+rectangles ({'top', 'left', 'width', 'height'}).
+
+- MssSource        : live screen capture (default); zero-copy views of the mss
+                     buffer, or copies into a FramePool of reusable buffers
+- PngDirSource     : directory of "<ts_ms>_<zone>.png" frames
+- VideoSource      : full-screen video file read with cv2.VideoCapture, zones cropped out
+- CaptureFileSource: compact capture file written by CaptureRecorder / --record
+
+Replay sources either follow the recorded timestamps (realtime=True) or run
+as fast as possible.
+"""
+import os
+import re
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+
+CAPTURE_MAGIC = b"ASCAP1\n"
+CAPTURE_EXT   = ".ascap"
+# record header: timestamp, zone name length, payload length
+# payload length 0 means "same frame as the previous record of this zone"
+_REC = struct.Struct("<dHI")
+
+class FrameSource:
+    live = False
+
+    def __init__(self, realtime: bool = True):
+        self.realtime = realtime
+        self._t0_wall = None
+        self._t0_rec = None
+
+    def grab(self, zones: dict) -> tuple[float, dict[str, np.ndarray]] | None:
+        raise NotImplementedError
+
+    def release(self, frame: np.ndarray):
+        """The consumer is done with a frame returned by grab() (lets pooled buffers be reused)."""
+
+    def close(self):
+        pass
+
+    def _pace(self, ts: float):
+        """Sleeps until the recorded timestamp is due (realtime replay only)."""
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._t0_wall is None:
+            self._t0_wall, self._t0_rec = now, ts
+            return
+        delay = (ts - self._t0_rec) - (now - self._t0_wall)
+        if delay > 0:
+            time.sleep(delay)
+
+# --------------------------------------------------------------------
+# 1) LIVE
+# --------------------------------------------------------------------
+class FramePool:
+    """
+    Reusable BGRA buffers keyed by shape. A buffer goes back to the pool once
+    every zone view sliced from it has been released, so a frame still queued
+    for OCR is never overwritten; the pool only allocates when all its buffers
+    are in use.
+    """
+
+    def __init__(self, max_free: int = 4):
+        self.max_free = max_free
+        self._free: dict[tuple, list[np.ndarray]] = {}
+        self._refs: dict[int, list] = {}  # id(buffer) -> [buffer, views not yet released]
+        self._lock = threading.Lock()
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, shape: tuple, views: int) -> np.ndarray:
+        with self._lock:
+            free = self._free.get(shape)
+            if free:
+                buf = free.pop()
+                self.reused += 1
+            else:
+                buf = np.empty(shape, np.uint8)
+                self.allocated += 1
+            self._refs[id(buf)] = [buf, views]
+            return buf
+
+    def release(self, frame: np.ndarray):
+        buf = frame if frame.base is None else frame.base
+        with self._lock:
+            entry = self._refs.get(id(buf))
+            if entry is None or entry[0] is not buf:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._refs[id(buf)]
+            free = self._free.setdefault(buf.shape, [])
+            if len(free) < self.max_free:
+                free.append(buf)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"allocated": self.allocated, "reused": self.reused, "in_use": len(self._refs),
+                    "free": sum(len(v) for v in self._free.values())}
+
+class MssSource(FrameSource):
+    """
+    Overlapping zones are grabbed once as their union rectangle and sliced.
+    Frames are numpy views of the buffer mss returns (no copy); with
+    pool_size > 0 they are copied into FramePool buffers instead, for
+    consumers that need memory they control.
+    """
+    live = True
+
+    def __init__(self, pool_size: int = 0):
+        super().__init__(realtime=True)
+        self._sct = None
+        self._plans: dict[tuple, list] = {}
+        self.pool = FramePool(pool_size) if pool_size else None
+
+    def _plan(self, zones) -> list:
+        key = tuple((name, tuple(z[k] for k in ("top", "left", "width", "height"))) for name, z in zones.items())
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = plan_grabs(zones)
+        return plan
+
+    def grab(self, zones):
+        if self._sct is None:
+            from mss import mss
+            self._sct = mss()
+        ts = time.time()
+        frames = {}
+        for union, members in self._plan(zones):
+            shot = self._sct.grab(union)
+            # mss returns a fresh bytearray per grab: safe to view without copying
+            raw = np.frombuffer(shot.raw, np.uint8).reshape(shot.height, shot.width, 4)
+            if self.pool is not None:
+                buf = self.pool.acquire(raw.shape, len(members))
+                np.copyto(buf, raw)
+                raw = buf
+            for name, (y, x, h, w) in members.items():
+                frames[name] = raw[y:y + h, x:x + w]
+        return ts, frames
+
+    def release(self, frame):
+        if self.pool is not None:
+            self.pool.release(frame)
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+# --------------------------------------------------------------------
+# 2) REPLAY: tick-based sources (one tick = all zones at one timestamp)
+# --------------------------------------------------------------------
+class _TickReplaySource(FrameSource):
+    """Replays an iterator of (ts, {zone: frame}) ticks."""
+
+    def __init__(self, realtime: bool = True):
+        super().__init__(realtime)
+        self._ticks = None
+        self._last: dict[str, np.ndarray] = {}
+
+    def _iter_ticks(self):
+        raise NotImplementedError
+
+    def grab(self, zones):
+        if self._ticks is None:
+            self._ticks = self._iter_ticks()
+        tick = next(self._ticks, None)
+        if tick is None:
+            return None
+        ts, frames = tick
+        self._last.update(frames)
+        self._pace(ts)
+        return ts, {name: self._last[name] for name in zones if name in self._last}
+
+class PngDirSource(_TickReplaySource):
+    RE_NAME = re.compile(r"^(\d+)_([A-Za-z0-9-]+)\.png$")
+
+    def __init__(self, path: str, realtime: bool = True):
+        super().__init__(realtime)
+        self.path = path
+
+    def _iter_ticks(self):
+        by_ts: dict[int, dict[str, str]] = {}
+        for fn in os.listdir(self.path):
+            m = self.RE_NAME.match(fn)
+            if m:
+                by_ts.setdefault(int(m.group(1)), {})[m.group(2)] = os.path.join(self.path, fn)
+        for ts_ms in sorted(by_ts):
+            frames = {}
+            for name, fp in by_ts[ts_ms].items():
+                img = cv2.imread(fp, cv2.IMREAD_UNCHANGED)
+                if img is None:
+                    print(f"[SOURCE] Unreadable frame: {fp}")
+                    continue
+                frames[name] = _to_bgra(img)
+            yield ts_ms / 1000.0, frames
+
+class CaptureFileSource(_TickReplaySource):
+    def __init__(self, path: str, realtime: bool = True):
+        super().__init__(realtime)
+        self.path = path
+        self._f = None
+
+    def _iter_ticks(self):
+        self._f = open(self.path, "rb")
+        if self._f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Not an AscendedScout capture file: {self.path}")
+        cur_ts, frames = None, {}
+        while True:
+            hdr = self._f.read(_REC.size)
+            if len(hdr) < _REC.size:
+                break
+            ts, name_len, size = _REC.unpack(hdr)
+            name = self._f.read(name_len).decode("utf-8")
+            payload = self._f.read(size)
+            if cur_ts is not None and ts != cur_ts:
+                yield cur_ts, frames
+                frames = {}
+            cur_ts = ts
+            if size:
+                frames[name] = cv2.imdecode(np.frombuffer(payload, np.uint8), cv2.IMREAD_UNCHANGED)
+        if cur_ts is not None:
+            yield cur_ts, frames
+
+    def close(self):
+        if self._f:
+            self._f.close()
+            self._f = None
+
+# --------------------------------------------------------------------
+# 3) REPLAY: full-screen video, zones cropped per frame
+# --------------------------------------------------------------------
+class VideoSource(FrameSource):
+    def __init__(self, path: str, realtime: bool = True):
+        super().__init__(realtime)
+        self.path = path
+        self._cap = cv2.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise ValueError(f"Unable to open video: {path}")
+
+    def grab(self, zones):
+        ok, frame = self._cap.read()
+        if not ok:
+            return None
+        ts = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        frame = _to_bgra(frame)
+        self._pace(ts)
+        return ts, {name: _crop(frame, z) for name, z in zones.items()}
+
+    def close(self):
+        self._cap.release()
+
+# --------------------------------------------------------------------
+# 4) RECORDING
+# --------------------------------------------------------------------
+class CaptureRecorder:
+    """Appends zone frames to a capture file (PNG payloads, unchanged frames stored as empty records)."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._f = open(path, "wb")
+        self._f.write(CAPTURE_MAGIC)
+        self._prev: dict[str, np.ndarray] = {}
+
+    def write(self, ts: float, frames: dict[str, np.ndarray]):
+        for name, frame in frames.items():
+            prev = self._prev.get(name)
+            if prev is not None and prev.shape == frame.shape and np.array_equal(prev, frame):
+                payload = b""
+            else:
+                ok, buf = cv2.imencode(".png", frame)
+                if not ok:
+                    continue
+                payload = buf.tobytes()
+                self._prev[name] = frame.copy()
+            raw_name = name.encode("utf-8")
+            self._f.write(_REC.pack(ts, len(raw_name), len(payload)))
+            self._f.write(raw_name)
+            self._f.write(payload)
+
+    def close(self):
+        self._f.close()
+
+class RecordingSource(FrameSource):
+    """Wraps another source and records every grabbed frame."""
+
+    def __init__(self, inner: FrameSource, path: str):
+        super().__init__(inner.realtime)
+        self.inner = inner
+        self.live = inner.live
+        self.recorder = CaptureRecorder(path)
+        print(f"[SOURCE] Recording to {path}")
+
+    def grab(self, zones):
+        grabbed = self.inner.grab(zones)
+        if grabbed is not None:
+            self.recorder.write(*grabbed)
+        return grabbed
+
+    def release(self, frame):
+        self.inner.release(frame)
+
+    def close(self):
+        self.inner.close()
+        self.recorder.close()
+
+# --------------------------------------------------------------------
+# 5) HELPERS
+# --------------------------------------------------------------------
+def _to_bgra(img: np.ndarray) -> np.ndarray:
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+    if img.shape[2] == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+    return img
+
+def plan_grabs(zones: dict) -> list[tuple[dict, dict]]:
+    """
+    Groups overlapping zone rectangles: [(union rect, {name: (y, x, h, w) inside the union})].
+    Zones that overlap nothing are grabbed on their own.
+    """
+    groups: list[list[str]] = []
+    for name, z in zones.items():
+        hits = [g for g in groups if any(_overlap(z, zones[o]) for o in g)]
+        merged = [name] + [n for g in hits for n in g]
+        groups = [g for g in groups if g not in hits] + [merged]
+    plan = []
+    for names in groups:
+        top = min(zones[n]["top"] for n in names)
+        left = min(zones[n]["left"] for n in names)
+        bottom = max(zones[n]["top"] + zones[n]["height"] for n in names)
+        right = max(zones[n]["left"] + zones[n]["width"] for n in names)
+        union = {"top": top, "left": left, "width": right - left, "height": bottom - top}
+        plan.append((union, {n: (zones[n]["top"] - top, zones[n]["left"] - left,
+                                 zones[n]["height"], zones[n]["width"]) for n in names}))
+    return plan
+
+def _overlap(a: dict, b: dict) -> bool:
+    return (a["left"] < b["left"] + b["width"] and b["left"] < a["left"] + a["width"]
+            and a["top"] < b["top"] + b["height"] and b["top"] < a["top"] + a["height"])
+
+def _crop(frame: np.ndarray, zone: dict) -> np.ndarray:
+    t, l = zone["top"], zone["left"]
+    return frame[t:t + zone["height"], l:l + zone["width"]]
+
+def open_source(spec: str | None, realtime: bool = True) -> FrameSource:
+    """'live' / None -> mss, directory -> PNG frames, *.ascap -> capture file, anything else -> video."""
+    if not spec or spec == "live":
+        return MssSource()
+    if os.path.isdir(spec):
+        return PngDirSource(spec, realtime=realtime)
+    if spec.lower().endswith(CAPTURE_EXT):
+        return CaptureFileSource(spec, realtime=realtime)
+    return VideoSource(spec, realtime=realtime)
@@ -0,0 +1,250 @@
+"""
+Glyph-template prefilter: skip OCR on frames without a notification phrase.
+
+Every relevant message contains a fixed phrase ("has joined this", "has left
+this", "was destroyed", the "Day N," prefix). The changed rows of a zone are
+reduced to one channel (max of B, G, R, so red / blue / green / white text
+all stand out), downscaled and searched for the phrase templates with
+normalized cross-correlation (cv2.matchTemplate), coarse to fine: a pass at
+half the resolution finds candidates (threshold - coarse_slack), every peak
+of it (non-maximum suppression over a template-sized neighbourhood, so two
+lines holding the same phrase are two candidates) is confirmed in a small
+window at full matching resolution. A frame with no match above `threshold`
+never reaches preprocessing / Tesseract; the matches tell the caller which
+lines to OCR.
+
+Templates are PNG crops of the phrase as the game draws it, one or more per
+phrase, in a directory (default assets/glyphs, ASCENDEDSCOUT_GLYPHS):
+
+    python glyph_prefilter.py add "has joined this" frame.png X Y W H
+
+render_templates() draws them with an OpenCV font instead (the synthetic
+benchmark corpus uses that font; game text needs real crops).
+"""
+import argparse
+import os
+import re
+
+import cv2
+import numpy as np
+
+PHRASES = {
+    "player": ("has joined this", "has left this"),
+    "center": ("was destroyed", "Day"),
+}
+
+def default_dir() -> str:
+    return os.getenv("ASCENDEDSCOUT_GLYPHS") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "assets", "glyphs")
+
+def text_channel(image: np.ndarray) -> np.ndarray:
+    """BGR(A) -> uint8 max(B, G, R): colored and white text are both bright."""
+    if image.ndim == 2:
+        return image
+    return cv2.max(cv2.max(image[..., 0], image[..., 1]), image[..., 2])
+
+class GlyphPrefilter:
+    """
+    templates : {phrase: [full-resolution crops (BGR(A) or text_channel())]}
+    threshold : minimum normalized correlation for a match
+    downscale : frame and templates are shrunk by this factor before matching
+    coarse_slack : how much lower the coarse (2x smaller again) pass may score
+    max_matches  : candidates confirmed per template and frame (bounds the cost on noisy frames)
+    line_slack   : how much lower than a phrase's best match its other matches may score: more
+                   lines of the same phrase render alike, text that merely resembles it does not
+    """
+
+    def __init__(self, templates: dict[str, list[np.ndarray]], threshold: float = 0.65, downscale: int = 2,
+                 coarse_slack: float = 0.2, max_matches: int = 16, line_slack: float = 0.2):
+        self.threshold = threshold
+        self.coarse_threshold = threshold - coarse_slack
+        self.downscale = max(1, downscale)
+        self.max_matches = max(1, max_matches)
+        self.line_slack = line_slack
+        # (phrase, template, coarse template, full-resolution height)
+        self.templates: list[tuple[str, np.ndarray, np.ndarray, int]] = []
+        for phrase, crops in templates.items():
+            for crop in crops:
+                small = _shrink(text_channel(crop), self.downscale)
+                coarse = _shrink(small, 2)
+                if min(coarse.shape) >= 3 and coarse.std() > 0:
+                    self.templates.append((phrase, small, coarse, crop.shape[0]))
+        self.checked = 0
+        self.passed = 0
+
+    def find(self, image: np.ndarray, rows: tuple[int, int] | None = None,
+             max_lines: int | None = None) -> list[tuple[str, float, tuple]]:
+        """[(phrase, score, (x, y, w, h) in image pixels)], every match above threshold (at least
+        `max_lines` of them if given and present, more lines of a phrase are not searched for)."""
+        y_off = 0
+        if rows is not None:
+            y_off, y1 = rows
+            image = image[y_off:y1]
+        small = text_channel(_shrink(image, self.downscale))
+        coarse = _shrink(small, 2)
+        # phrase -> [(confirmed match at the best coarse peak, coarse response, template)], one per size
+        sizes: dict[str, list] = {}
+        for entry in self.templates:
+            phrase, tpl, ctpl, _ = entry
+            if tpl.shape[0] > small.shape[0] or tpl.shape[1] > small.shape[1] \
+                    or ctpl.shape[0] > coarse.shape[0] or ctpl.shape[1] > coarse.shape[1]:
+                continue
+            res = cv2.matchTemplate(coarse, ctpl, cv2.TM_CCOEFF_NORMED)
+            _, score, _, peak = cv2.minMaxLoc(res)
+            m = self._confirm(small, entry, peak, y_off) if score >= self.coarse_threshold else None
+            if m is not None:
+                sizes.setdefault(phrase, []).append((m, res, entry))
+        # the game draws a phrase at one size: take the size whose best line matched best
+        # (another size can pass the threshold on a different line of text), then its other lines
+        found = []
+        for candidates in sizes.values():
+            first, res, entry = max(candidates, key=lambda c: c[0][1])
+            floor = first[1] - self.line_slack
+            found.append(first)
+            if max_lines is not None and len(found) >= max_lines:
+                continue
+            for peak in _peaks(res, self.coarse_threshold, entry[2].shape, self.max_matches, self.line_slack)[1:]:
+                m = self._confirm(small, entry, peak, y_off)
+                if m is not None and m[1] >= floor:
+                    found.append(m)
+        return found
+
+    def _confirm(self, small: np.ndarray, entry, peak: tuple[int, int], y_off: int):
+        """Full matching resolution around a coarse hit (+-2 coarse pixels): the match, or None."""
+        phrase, tpl, _, full_h = entry
+        th, tw = tpl.shape
+        cx, cy = peak
+        x0, y0 = max(0, 2 * cx - 4), max(0, 2 * cy - 4)
+        roi = small[y0:min(small.shape[0], 2 * cy + th + 4), x0:min(small.shape[1], 2 * cx + tw + 4)]
+        if roi.shape[0] < th or roi.shape[1] < tw:
+            return None
+        _, score, _, (x, y) = cv2.minMaxLoc(cv2.matchTemplate(roi, tpl, cv2.TM_CCOEFF_NORMED))
+        if score < self.threshold:
+            return None
+        d = self.downscale
+        return phrase, float(score), ((x0 + x) * d, y_off + (y0 + y) * d, tw * d, full_h)
+
+    def lines(self, image: np.ndarray, rows: tuple[int, int] | None = None,
+              margin: float = 0.6, max_lines: int | None = None) -> list[tuple[int, int]]:
+        """
+        Row spans (y0, y1) of the lines holding a phrase, one per text line, top to bottom; [] = skip OCR.
+        Each is widened by margin x line height, but never past the middle of the gap to the next line.
+        """
+        self.checked += 1
+        text_lines = []   # phrases on the same line (overlapping rows) make one line
+        for y0, y1 in sorted((y, y + h) for _, _, (_, y, _, h) in self.find(image, rows, max_lines)):
+            if text_lines and y0 < text_lines[-1][1]:
+                text_lines[-1] = (text_lines[-1][0], max(text_lines[-1][1], y1))
+            else:
+                text_lines.append((y0, y1))
+        if text_lines:
+            self.passed += 1
+        spans = []
+        for i, (y0, y1) in enumerate(text_lines):
+            pad = int((y1 - y0) * margin) + 1
+            lo, hi = max(0, y0 - pad), min(image.shape[0], y1 + pad)
+            if i > 0:
+                lo = max(lo, (text_lines[i - 1][1] + y0) // 2)
+            if i + 1 < len(text_lines):
+                hi = min(hi, (y1 + text_lines[i + 1][0] + 1) // 2)
+            spans.append((lo, hi))
+        return spans
+
+    def stats(self) -> dict:
+        return {"templates": len(self.templates), "checked": self.checked, "passed": self.passed,
+                "skipped": self.checked - self.passed}
+
+def _peaks(res: np.ndarray, threshold: float, shape: tuple[int, int], limit: int,
+           slack: float = 1.0) -> list[tuple[int, int]]:
+    """(x, y) of the peaks of a matchTemplate response above threshold, best first (non-maximum
+    suppression: each peak masks the template-sized neighbourhood around it). Peaks more than
+    `slack` below the best one are dropped."""
+    th, tw = shape
+    res = res.copy()
+    peaks = []
+    while len(peaks) < limit:
+        _, score, _, (x, y) = cv2.minMaxLoc(res)
+        if not peaks:
+            threshold = max(threshold, score - slack)
+        if score < threshold:
+            break
+        peaks.append((x, y))
+        res[max(0, y - th + 1):y + th, max(0, x - tw + 1):x + tw] = -1.0
+    return peaks
+
+def _shrink(img: np.ndarray, factor: int) -> np.ndarray:
+    if factor == 1:
+        return img
+    h, w = img.shape[:2]
+    return cv2.resize(img, (max(1, w // factor), max(1, h // factor)), interpolation=cv2.INTER_AREA)
+
+# --------------------------------------------------------------------
+# Templates
+# --------------------------------------------------------------------
+def _slug(phrase: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", phrase).strip("_")
+
+def load_templates(path: str | None = None, phrases=None) -> dict[str, list[np.ndarray]]:
+    """<dir>/<phrase slug>__<n>.png, restricted to `phrases` if given."""
+    path = path or default_dir()
+    wanted = {_slug(p): p for p in phrases} if phrases else None
+    out: dict[str, list[np.ndarray]] = {}
+    if not os.path.isdir(path):
+        return out
+    for name in sorted(os.listdir(path)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() != ".png" or "__" not in stem:
+            continue
+        slug = stem.rsplit("__", 1)[0]
+        if wanted is not None and slug not in wanted:
+            continue
+        img = cv2.imread(os.path.join(path, name), cv2.IMREAD_UNCHANGED)
+        if img is not None:
+            out.setdefault(wanted[slug] if wanted else slug.replace("_", " "), []).append(img)
+    return out
+
+def save_template(phrase: str, crop: np.ndarray, path: str | None = None) -> str:
+    path = path or default_dir()
+    os.makedirs(path, exist_ok=True)
+    slug = _slug(phrase)
+    n = sum(1 for f in os.listdir(path) if f.startswith(slug + "__"))
+    out = os.path.join(path, f"{slug}__{n}.png")
+    cv2.imwrite(out, text_channel(crop))
+    return out
+
+def render_templates(phrases, scales=(0.5, 0.65, 0.8), thickness: int = 2,
+                     font: int = cv2.FONT_HERSHEY_SIMPLEX) -> dict[str, list[np.ndarray]]:
+    """White-on-black renderings of each phrase at each font scale."""
+    out: dict[str, list[np.ndarray]] = {}
+    for phrase in phrases:
+        for scale in scales:
+            (w, h), base = cv2.getTextSize(phrase, font, scale, thickness)
+            img = np.zeros((h + base + 2 * thickness, w + 2 * thickness), np.uint8)
+            cv2.putText(img, phrase, (thickness, h + thickness), font, scale, 255, thickness, cv2.LINE_AA)
+            out.setdefault(phrase, []).append(img)
+    return out
+
+def for_parser(parser: str, path: str | None = None, **kwargs) -> GlyphPrefilter | None:
+    """Prefilter from the template directory; None when no template exists for this parser."""
+    templates = load_templates(path, PHRASES[parser])
+    return GlyphPrefilter(templates, **kwargs) if templates else None
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Manage glyph templates for the OCR prefilter")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("add", help="crop a phrase from a screenshot of the zone")
+    add.add_argument("phrase")
+    add.add_argument("image")
+    add.add_argument("box", nargs=4, type=int, metavar=("X", "Y", "W", "H"))
+    add.add_argument("--dir", default=None)
+    sub.add_parser("list").add_argument("--dir", default=None)
+    args = ap.parse_args()
+    if args.cmd == "add":
+        img = cv2.imread(args.image, cv2.IMREAD_UNCHANGED)
+        if img is None:
+            raise SystemExit(f"Cannot read {args.image}")
+        x, y, w, h = args.box
+        print(f"[GLYPHS] saved {save_template(args.phrase, img[y:y + h, x:x + w], args.dir)}")
+    else:
+        for phrase, crops in load_templates(args.dir).items():
+            print(f"[GLYPHS] {phrase}: {len(crops)} template(s) " + ", ".join(f"{c.shape[1]}x{c.shape[0]}" for c in crops))
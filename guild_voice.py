@@ -0,0 +1,179 @@
+"""
+Voice alerts, one connection per guild.
+
+GuildVoice keeps the bot in one guild's alert voice channel, reconnecting
+with backoff, and plays alert clips there with its own cooldown. VoiceFleet
+holds one per routed guild (routing.py) and plays an alert concurrently in
+all of them that receive its event kind.
+
+Only client.get_guild() / client.guilds are used, so the client can be a
+discord.Client, an AutoShardedClient or a stand-in (bench/fake_discord.py).
+"""
+import asyncio
+
+import discord
+
+def _played(name: str, source, error):
+    """after= callback of a play (player thread, once the clip is over)."""
+    if error is not None:
+        print(f"[VOICE] {name}: erreur lecture: {error}")
+        return
+    first_ms = getattr(source, "first_packet_ms", None)
+    print(f"[VOICE] {name}: lecture OK" + (f" (premier paquet {first_ms:.1f} ms après la demande)"
+                                          if first_ms is not None else ""))
+
+class GuildVoice:
+    """guild_id None: the client's first guild (single-server setup)."""
+
+    def __init__(self, client, guild_id: int | None, channel_id: int, cooldown_sec: float = 15.0,
+                 name: str = "", start_delay: float = 0.0):
+        self.client = client
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.cooldown_sec = cooldown_sec
+        self.name = name or str(guild_id)
+        self.start_delay = start_delay
+        self._lock = asyncio.Lock()
+        self._audio_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self._last_audio = float("-inf")
+        self.played = 0
+
+    def guild(self):
+        if self.guild_id is None:
+            return self.client.guilds[0] if self.client.guilds else None
+        return self.client.get_guild(self.guild_id)
+
+    def voice_client(self):
+        guild = self.guild()
+        vc = guild.voice_client if guild else None
+        return vc if vc and vc.is_connected() else None
+
+    async def connect_once(self):
+        """One-shot connect guarded by the guild's lock."""
+        async with self._lock:
+            guild = self.guild()
+            if guild is None:
+                print(f"[VOICE] {self.name}: guild introuvable.")
+                return None
+            target = guild.get_channel(self.channel_id)
+            if not target:
+                print(f"[VOICE] {self.name}: salon vocal introuvable: {self.channel_id}")
+                return None
+            vc = guild.voice_client
+            if vc and vc.is_connected():
+                if vc.channel.id != self.channel_id:
+                    print(f"[VOICE] {self.name}: déplacement vocal {vc.channel.name} -> {target.name}")
+                    await vc.move_to(target)
+                return guild.voice_client
+            try:
+                print(f"[VOICE] {self.name}: connexion au salon: {target.name}")
+                vc = await target.connect(timeout=15.0, reconnect=False)
+                print(f"[VOICE] {self.name}: connecté à: {target.name}")
+                return vc
+            except discord.ClientException as e:
+                print(f"[VOICE] {self.name}: ClientException: {e}")
+                return guild.voice_client
+            except Exception as e:
+                print(f"[VOICE] {self.name}: connexion échouée: {type(e).__name__}: {e}")
+                return None
+
+    async def _keeper(self):
+        """Keeps the voice connection alive, with backoff on failures."""
+        if self.start_delay and await self._wait_stop(self.start_delay):
+            return
+        backoff = 1.0
+        while not self._stop.is_set():
+            vc = await self.connect_once()
+            if vc and vc.is_connected():
+                backoff = 1.0
+                if await self._wait_stop(15.0):
+                    break
+            else:
+                print(f"[VOICE] {self.name}: reconnexion dans {backoff:.1f}s…")
+                if await self._wait_stop(backoff):
+                    break
+                backoff = min(backoff * 2.0, 15.0)
+
+    async def _wait_stop(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self._keeper())
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def play(self, make_source) -> bool:
+        """Plays make_source() unless within the cooldown or not connected; no connect from here."""
+        async with self._audio_lock:
+            now = asyncio.get_running_loop().time()
+            if now - self._last_audio < self.cooldown_sec:
+                print(f"[VOICE] {self.name}: cooldown audio -> skip")
+                return False
+            self._last_audio = now
+            vc = self.voice_client()
+            if vc is None:
+                print(f"[VOICE] {self.name}: pas de voice client (pas connecté).")
+                return False
+            try:
+                if vc.is_playing():
+                    vc.stop()
+                name, source = self.name, make_source()
+                vc.play(source, after=lambda e: _played(name, source, e))
+                self.played += 1
+                return True
+            except Exception as e:
+                print(f"[VOICE] {self.name}: lecture échouée: {type(e).__name__}: {e}")
+                return False
+
+class VoiceFleet:
+    """
+    routes      : routing.GuildRoute list (those with a voice channel get a GuildVoice)
+    stagger_sec : delay between keeper starts, so N guilds do not all send their
+                  voice-state update on the same gateway at once
+    """
+
+    def __init__(self, client, routes, stagger_sec: float = 0.5):
+        self.guilds: dict[int | None, GuildVoice] = {}
+        self.kinds: dict[int | None, frozenset] = {}   # event kinds routed to each guild
+        for i, r in enumerate(r for r in routes if r.voice_channel_id is not None):
+            self.guilds[r.guild_id] = GuildVoice(client, r.guild_id, r.voice_channel_id, r.audio_cooldown_sec,
+                                                 name=r.name, start_delay=i * stagger_sec)
+            self.kinds[r.guild_id] = frozenset(r.channels)
+
+    def get(self, guild_id: int | None) -> GuildVoice | None:
+        return self.guilds.get(guild_id) or (self.guilds.get(None) if len(self.guilds) == 1 else None)
+
+    def start(self):
+        for gv in self.guilds.values():
+            gv.start()
+
+    def stop(self):
+        for gv in self.guilds.values():
+            gv.stop()
+
+    async def play(self, make_source, guild_id: int | None = None, kind: str | None = None) -> int:
+        """Alert in one guild, or concurrently in every guild routed for `kind` (all of them if
+        None); returns how many started playing.
+
+        make_source() is called once per guild: a source can only be played once.
+        """
+        if guild_id is not None:
+            targets = [self.get(guild_id)]
+        else:
+            targets = [gv for g, gv in self.guilds.items() if kind is None or kind in self.kinds[g]]
+        results = await asyncio.gather(*(gv.play(make_source) for gv in targets if gv is not None))
+        return sum(results)
+
+    def __len__(self) -> int:
+        return len(self.guilds)
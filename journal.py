@@ -0,0 +1,156 @@
+"""
+Buffered append-only event journal.
+
+JournalWriter keeps one open handle per log file and batches appended lines.
+Flush policies:
+- "event"   : flush after every line
+- "interval": flush every `flush_interval_ms` (background thread)
+- "count"   : flush every `flush_every` lines (and on close)
+`fsync=True` also forces the data to disk on every flush.
+
+Files rotate when they exceed `rotate_bytes` or are older than
+`rotate_interval_sec`: "x.txt" -> "x.txt.1" -> ... -> "x.txt.<keep>". The live
+file is only ever appended to or replaced by a new empty file; the bot's tail
+reader notices the new inode, drains the rotated generations, then restarts at 0.
+"""
+import os
+import threading
+import time
+
+import metrics
+
+_H_WRITE = metrics.stage("journal_write")
+_H_FLUSH = metrics.stage("journal_flush")
+
+class _OpenLog:
+    __slots__ = ("path", "fh", "size", "opened_at", "pending")
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.fh = open(path, "a", encoding="utf-8")
+        self.size = self.fh.tell()
+        self.opened_at = time.time()
+        self.pending: list[str] = []
+
+class JournalWriter:
+    def __init__(self, flush_policy: str = "interval", flush_interval_ms: int = 100,
+                 flush_every: int = 20, fsync: bool = False,
+                 rotate_bytes: int | None = 5 * 1024 * 1024, rotate_interval_sec: float | None = None,
+                 keep: int = 5):
+        if flush_policy not in ("event", "interval", "count"):
+            raise ValueError(f"Unsupported flush policy: {flush_policy}")
+        self.flush_policy = flush_policy
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.flush_every = max(1, flush_every)
+        self.fsync = fsync
+        self.rotate_bytes = rotate_bytes
+        self.rotate_interval_sec = rotate_interval_sec
+        self.keep = keep
+        self._logs: dict[str, _OpenLog] = {}
+        self._lock = threading.Lock()
+        self._pending_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.lines = 0
+        self.flushes = 0
+        self.rotations = 0
+        self._flush_ms: list[float] = []
+        if flush_policy == "interval":
+            self._thread = threading.Thread(target=self._flush_loop, name="JOURNAL", daemon=True)
+            self._thread.start()
+
+    # ---------------- writing ----------------
+    def write(self, path: str, line: str):
+        with _H_WRITE.time(), self._lock:
+            log = self._logs.get(path)
+            if log is None:
+                log = self._logs[path] = _OpenLog(path)
+            log.pending.append(line + "\n")
+            self._pending_count += 1
+            self.lines += 1
+            if self.flush_policy == "event" or (
+                    self.flush_policy == "count" and self._pending_count >= self.flush_every):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending_count:
+            return
+        t0 = time.perf_counter()
+        for log in self._logs.values():
+            if not log.pending:
+                continue
+            data = "".join(log.pending)
+            log.pending.clear()
+            log.fh.write(data)
+            log.fh.flush()
+            if self.fsync:
+                os.fsync(log.fh.fileno())
+            log.size += len(data.encode("utf-8"))
+            if self._should_rotate(log):
+                self._rotate_locked(log)
+        self._pending_count = 0
+        self.flushes += 1
+        dt = time.perf_counter() - t0
+        _H_FLUSH.observe(dt)
+        self._flush_ms.append(dt * 1000.0)
+        if len(self._flush_ms) > 1024:
+            del self._flush_ms[:512]
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[JOURNAL] flush error: {type(e).__name__}: {e}")
+
+    # ---------------- rotation ----------------
+    def _should_rotate(self, log: _OpenLog) -> bool:
+        if self.rotate_bytes and log.size >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_interval_sec) and time.time() - log.opened_at >= self.rotate_interval_sec
+
+    def _rotate_locked(self, log: _OpenLog):
+        log.fh.close()
+        rotate_file(log.path, self.keep)
+        fresh = _OpenLog(log.path)
+        log.fh, log.size, log.opened_at = fresh.fh, fresh.size, fresh.opened_at
+        self.rotations += 1
+
+    # ---------------- lifecycle / stats ----------------
+    def close(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        with self._lock:
+            self._flush_locked()
+            for log in self._logs.values():
+                log.fh.close()
+            self._logs.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = sorted(self._flush_ms)
+        pct = lambda q: s[min(len(s) - 1, int(q * len(s)))] if s else 0.0
+        return {"lines": self.lines, "flushes": self.flushes, "rotations": self.rotations,
+                "flush_p50_ms": pct(0.50), "flush_p95_ms": pct(0.95), "flush_max_ms": s[-1] if s else 0.0}
+
+def rotate_file(path: str, keep: int):
+    """x -> x.1 -> x.2 ... (oldest beyond `keep` is deleted). No-op for a missing/empty file."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    if keep <= 0:
+        os.remove(path)
+        return
+    oldest = f"{path}.{keep}"
+    if os.path.exists(oldest):
+        os.remove(oldest)
+    for i in range(keep - 1, 0, -1):
+        src = f"{path}.{i}"
+        if os.path.exists(src):
+            os.replace(src, f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
@@ -0,0 +1,166 @@
+"""
+Incremental center OCR helpers.
+
+- split_line_bands(): cut an ink mask into notification bands by row projection
+- band_signature()  : shift-tolerant perceptual hash of a band
+- LineResultCache   : LRU of band signature -> parsed results, evicted by size and age
+"""
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+def _runs(flags: np.ndarray) -> list[tuple[int, int]]:
+    """[start, end) runs of True in a 1-D bool array."""
+    padded = np.concatenate(([False], flags, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+def split_line_bands(ink: np.ndarray, min_row_pixels: int = 2, min_height: int = 4,
+                     merge_gap_ratio: float = 0.5) -> list[tuple[int, int, int, int]]:
+    """
+    ink: uint8 mask (text = 255). Returns (y0, y1, x0, x1) bands, top to bottom.
+    Text lines closer than merge_gap_ratio * median line height are merged, so
+    a wrapped "Day N, HH:MM:SS: / Your 'OBJ' was destroyed!" stays in one band.
+    """
+    rows = cv2.reduce(ink, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel() // 255
+    lines = [(a, b) for a, b in _runs(rows >= min_row_pixels) if b - a >= min_height]
+    if not lines:
+        return []
+    max_gap = merge_gap_ratio * float(np.median([b - a for a, b in lines]))
+    merged = [list(lines[0])]
+    for a, b in lines[1:]:
+        if a - merged[-1][1] <= max_gap:
+            merged[-1][1] = b
+        else:
+            merged.append([a, b])
+    bands = []
+    for y0, y1 in merged:
+        cols = np.flatnonzero(ink[y0:y1].any(axis=0))
+        if cols.size:
+            bands.append((y0, y1, int(cols[0]), int(cols[-1]) + 1))
+    return bands
+
+SIG_CELL = 3        # px per signature cell
+SIG_TOLERANCE = 90  # max per-cell ink difference (0..255) for two bands to match
+
+def band_signature(ink_band: np.ndarray) -> np.ndarray | None:
+    """
+    Perceptual signature of a band: its ink cropped to the bounding box (so the
+    same line scrolled up gives the same signature), averaged over
+    SIG_CELL x SIG_CELL cells. Anti-aliasing noise on glyph edges stays below
+    SIG_TOLERANCE; so may a changed digit (see LineResultCache).
+    """
+    ys, xs = np.nonzero(ink_band)
+    if ys.size == 0:
+        return None
+    crop = ink_band[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    h, w = crop.shape
+    size = (max(1, w // SIG_CELL), max(1, h // SIG_CELL))
+    return cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+
+class LineResultCache:
+    """
+    LRU band cache: signature -> parsed results, bounded by entry count and age.
+    Entries are bucketed by signature shape; a lookup only compares against
+    the few bands of the same size.
+
+    A signature match alone does not identify the line: timestamps one digit
+    apart ("14:05:36" / "14:05:38") differ by a few pixels, inside the noise
+    the tolerance has to absorb. The cache also tracks where each entry's line
+    was on the previous frame. Notifications only move up and a new line only
+    appears below the ones shown, so a band matching a line that was *below*
+    it on the previous frame is that line, scrolled: a trusted hit. Any other
+    match (a faded line replaced in place by a look-alike, a line seen
+    minutes ago) is returned untrusted for the caller to verify.
+    """
+
+    def __init__(self, max_entries: int = 256, max_age_sec: float = 600.0,
+                 tolerance: int = SIG_TOLERANCE):
+        self.max_entries = max_entries
+        self.max_age_sec = max_age_sec
+        self.tolerance = tolerance
+        self._data: OrderedDict[int, tuple[float, np.ndarray, tuple]] = OrderedDict()
+        self._buckets: dict[tuple[int, int], set[int]] = {}
+        self._shown: dict[int, tuple[int, int]] = {}   # previous frame: entry -> band rows
+        self._now: dict[int, tuple[int, int]] = {}     # this frame (matched entries are not matched again)
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.unverified = 0
+
+    def _drop(self, entry_id: int):
+        _, sig, _ = self._data.pop(entry_id)
+        self._shown.pop(entry_id, None)
+        self._now.pop(entry_id, None)
+        bucket = self._buckets[sig.shape]
+        bucket.discard(entry_id)
+        if not bucket:
+            del self._buckets[sig.shape]
+
+    def new_frame(self, changed_rows: list[tuple[int, int]] | None = None):
+        """
+        Starts a frame. changed_rows: (y0, y1) spans that changed (None: all);
+        lines outside them are still shown where they were.
+        """
+        self._shown, self._now = self._now, {}
+        if changed_rows is not None:
+            self._now = {e: (y0, y1) for e, (y0, y1) in self._shown.items()
+                         if not any(y0 < b1 and a0 < y1 for a0, b1 in changed_rows)}
+
+    def get(self, sig: np.ndarray, rows: tuple[int, int] | None = None) -> tuple[int, tuple, bool] | None:
+        """
+        Best match for a band at rows (y0, y1): (entry id, value, trusted), or
+        None. A trusted hit is recorded as shown here; confirm() an untrusted
+        one once verified, or put() a fresh result.
+        """
+        now = time.monotonic()
+        best = None
+        for entry_id in list(self._buckets.get(sig.shape, ())):
+            created, other, value = self._data[entry_id]
+            if now - created > self.max_age_sec:
+                self._drop(entry_id)
+                continue
+            if entry_id in self._now or int(cv2.absdiff(sig, other).max()) > self.tolerance:
+                continue
+            prev = self._shown.get(entry_id)
+            trusted = rows is not None and prev is not None and prev[0] > rows[0]
+            rank = (0, prev[0]) if trusted else (1, 0)   # the nearest line below: scrolled the least
+            if best is None or rank < best[0]:
+                best = (rank, entry_id, value, trusted)
+        if best is None:
+            self.misses += 1
+            return None
+        _, entry_id, value, trusted = best
+        if trusted:
+            self.confirm(entry_id, rows)
+            self.hits += 1
+        else:
+            self.unverified += 1
+        return entry_id, value, trusted
+
+    def confirm(self, entry_id: int, rows: tuple[int, int] | None):
+        """The band at rows is this entry's line."""
+        if rows is not None:
+            self._now[entry_id] = rows
+        self._data.move_to_end(entry_id)
+
+    def put(self, sig: np.ndarray, value: tuple, rows: tuple[int, int] | None = None):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._data[entry_id] = (time.monotonic(), sig, value)
+        self._buckets.setdefault(sig.shape, set()).add(entry_id)
+        if rows is not None:
+            self._now[entry_id] = rows
+        while len(self._data) > self.max_entries:
+            self._drop(next(iter(self._data)))
+
+    def clear(self):
+        self._data.clear()
+        self._buckets.clear()
+        self._shown.clear()
+        self._now.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,142 @@
+"""
+Log file change notification for the bot's tail reader.
+
+- InotifyWatcher: Linux inotify (via ctypes, no extra dependency) on the log
+  directories, woken by the asyncio loop only when a watched file is
+  modified, created, moved (rotation) or deleted.
+- PollingWatcher: fallback elsewhere; stats the files with an adaptive
+  interval (fast right after a change, slowing down while idle).
+
+Both expose `await wait(timeout) -> set[str]` of paths that may have changed
+(empty set on timeout).
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+
+IN_MODIFY      = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_Q_OVERFLOW  = 0x00004000
+IN_NONBLOCK    = 0o4000
+IN_CLOEXEC     = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+class InotifyWatcher:
+    def __init__(self, paths):
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._paths = [os.path.abspath(p) for p in paths]
+        self._by_wd: dict[int, dict[str, str]] = {}
+        for d in {os.path.dirname(p) for p in self._paths}:
+            wd = self._libc.inotify_add_watch(fd, d.encode(), WATCH_MASK)
+            if wd < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {d}")
+            self._by_wd[wd] = {os.path.basename(p): p for p in self._paths if os.path.dirname(p) == d}
+        self._changed: set[str] = set()
+        self._event = asyncio.Event()
+        asyncio.get_running_loop().add_reader(fd, self._on_readable)
+
+    def _on_readable(self):
+        while True:
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            off = 0
+            while off + _EVENT.size <= len(buf):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buf, off)
+                name = buf[off + _EVENT.size: off + _EVENT.size + length].rstrip(b"\0").decode(errors="ignore")
+                off += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    self._changed.update(self._paths)
+                    continue
+                names = self._by_wd.get(wd, {})
+                # "x.txt.1" appearing means "x.txt" was rotated
+                base = name if name in names else name.rsplit(".", 1)[0]
+                if base in names:
+                    self._changed.add(names[base])
+        if self._changed:
+            self._event.set()
+
+    async def wait(self, timeout: float | None = None) -> set[str]:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def close(self):
+        try:
+            asyncio.get_running_loop().remove_reader(self._fd)
+        except RuntimeError:
+            pass
+        os.close(self._fd)
+
+class PollingWatcher:
+    def __init__(self, paths, min_interval: float = 0.05, max_interval: float = 1.0, backoff: float = 1.5):
+        self._paths = [os.path.abspath(p) for p in paths]
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._sig = {p: self._stat(p) for p in self._paths}
+
+    @staticmethod
+    def _stat(p: str):
+        try:
+            st = os.stat(p)
+            return (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    async def wait(self, timeout: float | None = None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for p in self._paths:
+                sig = self._stat(p)
+                if sig != self._sig[p]:
+                    self._sig[p] = sig
+                    changed.add(p)
+            if changed:
+                self.interval = self.min_interval
+                return changed
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+            if deadline is not None and time.monotonic() + self.interval > deadline:
+                await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+                return set()
+            await asyncio.sleep(self.interval)
+
+    def close(self):
+        pass
+
+def make_watcher(paths, **poll_kwargs):
+    """
+    inotify on Linux, adaptive polling elsewhere (or if inotify is unavailable).
+    Call inside the event loop; poll_kwargs go to PollingWatcher.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except Exception as e:
+            print(f"[WATCH] inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(paths, **poll_kwargs)
@@ -1,12 +1,16 @@
+import argparse
+import os
 import threading
 import time
 from resource_monitor import ResourceMonitor
-import AscendedScout
+import ascendedscout
 import bot
+import frame_source
 
-def run_ocr():
+def run_ocr(args):
     try:
-        AscendedScout.main()
+        ascendedscout.main(frame_source.open_source(args.source, realtime=not args.fast),
+                           zones_path=args.zones)
     except Exception as e:
         print(f"[MAIN] OCR thread error: {e}")
 
@@ -17,11 +21,37 @@ def run_discord_bot():
         print(f"[MAIN] BOT thread error: {e}")
 
 if __name__ == "__main__":
-    monitor = ResourceMonitor(log_path="../logs/usage.log", interval=10)
+    ap = argparse.ArgumentParser(description="AscendedScout OCR monitor + Discord bot")
+    ap.add_argument("--workers", type=int, default=int(os.getenv("ASCENDEDSCOUT_OCR_WORKERS", "0")),
+                    help="OCR processes (capture runs in one more); 0 = OCR on a thread of this process")
+    ap.add_argument("--source", default="live", help="frame source, see ascendedscout.py --help")
+    ap.add_argument("--fast", action="store_true", help="replay as fast as possible instead of real time")
+    ap.add_argument("--zones", metavar="PATH", help="zone config (default: zones.json next to this script)")
+    ap.add_argument("--metrics-port", type=int, default=int(os.getenv("ASCENDEDSCOUT_METRICS_PORT", "9464")),
+                    help="Prometheus endpoint on 127.0.0.1 (0 = off); JSON snapshots go next to usage.log")
+    args = ap.parse_args()
+
+    # the bot receives the scout's events directly (log files stay as a journal);
+    # with --workers the supervisor publishes the worker processes' events here
+    bot.EVENT_SOURCE = "bus"
+
+    monitor = ResourceMonitor(log_path="../logs/usage.log", interval=10, http_port=args.metrics_port or None)
     monitor.start()
 
-    ocr_thread = threading.Thread(target=run_ocr, name="OCR", daemon=True)
-    ocr_thread.start()
+    sup = ckpt = None
+    if args.workers > 0:
+        import supervisor
+        import zones
+        ckpt = ascendedscout.start_session()
+        if args.source == "live" and ascendedscout.CALIBRATE_AUTO:
+            # the worker processes read the zone config: only a saved calibration reaches them
+            ascendedscout._calibrate(zones.load_zones(args.zones), args.zones)
+        sup = supervisor.OcrSupervisor(workers=args.workers, source_spec=args.source,
+                                       realtime=not args.fast, zones_path=args.zones)
+        sup.start()
+    else:
+        ocr_thread = threading.Thread(target=run_ocr, args=(args,), name="OCR", daemon=True)
+        ocr_thread.start()
 
     bot_thread = threading.Thread(target=run_discord_bot, name="DISCORD")
     bot_thread.start()
@@ -32,5 +62,10 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\n[MAIN] Stop.")
     finally:
+        if sup is not None:
+            sup.stop()
+            print(f"[SUPERVISOR] {sup.stats()}")
+        if ckpt is not None:
+            ckpt.stop()
         monitor.stop()
         print("[MAIN] Bye.")
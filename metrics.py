@@ -0,0 +1,199 @@
+"""
+In-process latency histograms and gauges, exported as Prometheus text.
+
+Stages (histogram ascendedscout_stage_seconds, label "stage"):
+grab, diff, preprocess (+ "variant"), ocr (+ "variant"), parse,
+journal_write, journal_flush, bot_pickup, discord_send.
+ascendedscout_e2e_seconds is screen change (frame capture) -> Discord
+delivery. Gauges (CPU, RSS, threads) are set by resource_monitor.py.
+
+Histograms are pre-bound at import time by the instrumented modules
+(`_H_GRAB = metrics.stage("grab")`) so the hot path is one perf_counter pair
+and a bisect. ASCENDEDSCOUT_METRICS=0 (or set_enabled(False)) turns every
+observation into a no-op.
+
+    serve(9464)  ->  http://127.0.0.1:9464/metrics (text), /metrics.json (snapshot())
+
+Processes started by supervisor.py send their snapshot() to the parent,
+which exports them with a "process" label (merge()).
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "ascendedscout_"
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+ENABLED = os.getenv("ASCENDEDSCOUT_METRICS", "1").lower() not in ("0", "false", "off", "no")
+
+def set_enabled(flag: bool):
+    global ENABLED
+    ENABLED = bool(flag)
+
+class _Timer:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0)
+        return False
+
+class Histogram:
+    __slots__ = ("name", "labels", "counts", "sum", "count", "_lock")
+
+    def __init__(self, name: str, labels: tuple = ()):
+        self.name = name
+        self.labels = labels
+        self.counts = [0] * (len(BUCKETS) + 1)   # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        if not ENABLED:
+            return
+        i = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+class Registry:
+    def __init__(self):
+        self._hists: dict[tuple, Histogram] = {}
+        self._gauges: dict[tuple, float] = {}
+        self._remote: dict[str, dict] = {}   # process name -> snapshot()
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        h = self._hists.get(key)
+        if h is None:
+            with self._lock:
+                h = self._hists.setdefault(key, Histogram(name, key[1]))
+        return h
+
+    def set_gauge(self, name: str, value: float, **labels):
+        self._gauges[(name, tuple(sorted(labels.items())))] = float(value)
+
+    def merge(self, process: str, snapshot: dict):
+        """Latest snapshot() of another process, exported with process=<name>."""
+        with self._lock:
+            self._remote[process] = snapshot
+
+    # ---------------- export ----------------
+    def snapshot(self, remote: bool = False) -> dict:
+        with self._lock:
+            hists = list(self._hists.values())
+            processes = dict(self._remote) if remote else None
+        snap = {
+            "ts": time.time(),
+            "buckets": list(BUCKETS),
+            "histograms": [{"name": h.name, "labels": dict(h.labels), **h.snapshot()} for h in hists if h.count],
+            "gauges": [{"name": n, "labels": dict(lb), "value": v} for (n, lb), v in list(self._gauges.items())],
+        }
+        if processes:
+            snap["processes"] = processes
+        return snap
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        snaps = [("", self.snapshot())]
+        with self._lock:
+            snaps += sorted(self._remote.items())
+        hist_lines: dict[str, list[str]] = {}
+        gauge_lines: dict[str, list[str]] = {}
+        for process, snap in snaps:
+            extra = {"process": process} if process else {}
+            for h in snap["histograms"]:
+                out = hist_lines.setdefault(h["name"], [])
+                labels = {**h["labels"], **extra}
+                cum = 0
+                for bound, n in zip(list(snap["buckets"]) + ["+Inf"], h["counts"]):
+                    cum += n
+                    le = bound if bound == "+Inf" else repr(float(bound))
+                    out.append(f"{PREFIX}{h['name']}_bucket{_fmt_labels({**labels, 'le': le})} {cum}")
+                out.append(f"{PREFIX}{h['name']}_sum{_fmt_labels(labels)} {h['sum']:.6f}")
+                out.append(f"{PREFIX}{h['name']}_count{_fmt_labels(labels)} {h['count']}")
+            for g in snap["gauges"]:
+                gauge_lines.setdefault(g["name"], []).append(
+                    f"{PREFIX}{g['name']}{_fmt_labels({**g['labels'], **extra})} {g['value']!r}")
+        lines = []
+        for name, body in sorted(hist_lines.items()):
+            lines.append(f"# TYPE {PREFIX}{name} histogram")
+            lines.extend(body)
+        for name, body in sorted(gauge_lines.items()):
+            lines.append(f"# TYPE {PREFIX}{name} gauge")
+            lines.extend(body)
+        return "\n".join(lines) + "\n"
+
+def _fmt_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    esc = (lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels.items()) + "}"
+
+REGISTRY = Registry()
+
+_STAGES: dict[tuple, Histogram] = {}   # (stage, variant) -> histogram, skips the label sort
+
+def stage(name: str, variant: str | None = None) -> Histogram:
+    """Histogram of one pipeline stage (bind it once, observe on the hot path; repeat lookups are cached)."""
+    h = _STAGES.get((name, variant))
+    if h is None:
+        if variant is None:
+            h = REGISTRY.histogram("stage_seconds", stage=name)
+        else:
+            h = REGISTRY.histogram("stage_seconds", stage=name, variant=variant)
+        _STAGES[(name, variant)] = h
+    return h
+
+E2E = REGISTRY.histogram("e2e_seconds")
+
+# --------------------------------------------------------------------
+# HTTP endpoint (localhost only by default)
+# --------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body, ctype = self.registry.render().encode(), "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body, ctype = json.dumps(self.registry.snapshot(remote=True)).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Starts the endpoint on a daemon thread; server.shutdown() stops it."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="METRICS", daemon=True).start()
+    print(f"[METRICS] http://{host}:{server.server_address[1]}/metrics")
+    return server
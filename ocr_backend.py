@@ -0,0 +1,223 @@
+"""
+OCR backends used by AscendedScout.
+
+- "tesserocr"   : pool of warm in-process Tesseract engines (libtesseract via
+                  tesserocr). Engines keep the traineddata loaded for the life
+                  of the process and read numpy buffers directly (no temp files).
+- "pytesseract" : legacy path, one tesseract subprocess + temp files per call.
+
+Select with the ASCENDEDSCOUT_OCR_BACKEND env var ("auto", "tesserocr",
+"pytesseract"). "auto" uses tesserocr when it is installed.
+"""
+import os
+import queue
+import re
+import threading
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+import pytesseract
+
+try:
+    import tesserocr
+except Exception as e:
+    tesserocr = None
+    _TESSEROCR_IMPORT_ERROR = e
+else:
+    _TESSEROCR_IMPORT_ERROR = None
+
+DEFAULT_CONFIG = "--oem 3 --psm 6 -l eng"
+
+_RE_PSM  = re.compile(r"--psm\s+(\d+)")
+_RE_OEM  = re.compile(r"--oem\s+(\d+)")
+_RE_LANG = re.compile(r"-l\s+(\S+)")
+
+def parse_config(config: str) -> tuple[int, int, str]:
+    """'--oem 3 --psm 6 -l eng' -> (psm, oem, lang)"""
+    psm  = _RE_PSM.search(config)
+    oem  = _RE_OEM.search(config)
+    lang = _RE_LANG.search(config)
+    return (int(psm.group(1)) if psm else 3,
+            int(oem.group(1)) if oem else 3,
+            lang.group(1) if lang else "eng")
+
+# --------------------------------------------------------------------
+# 1) LEGACY BACKEND (subprocess per call)
+# --------------------------------------------------------------------
+class PytesseractBackend:
+    name = "pytesseract"
+
+    def image_to_string(self, image, config: str = DEFAULT_CONFIG) -> str:
+        return pytesseract.image_to_string(image, config=config)
+
+    def warm_up(self, config: str = DEFAULT_CONFIG):
+        pass
+
+    def close(self):
+        pass
+
+# --------------------------------------------------------------------
+# 2) IN-PROCESS ENGINE POOL
+# --------------------------------------------------------------------
+def _tessdata_path() -> str | None:
+    env = os.getenv("TESSDATA_PREFIX")
+    if env:
+        return env
+    cmd = pytesseract.pytesseract.tesseract_cmd
+    if cmd and os.path.isabs(cmd):
+        guess = os.path.join(os.path.dirname(cmd), "tessdata")
+        if os.path.isdir(guess):
+            return guess
+    return None
+
+def _as_tess_bytes(image: np.ndarray) -> tuple[bytes, int, int, int, int]:
+    if image.ndim == 3 and image.shape[2] == 4:
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
+    elif image.ndim == 3 and image.shape[2] == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    h, w = image.shape[:2]
+    bpp = 1 if image.ndim == 2 else image.shape[2]
+    return image.tobytes(), w, h, bpp, image.strides[0]
+
+_RETRY = object()   # put in a pool when an engine fails to start: wakes one waiter to retry
+
+class TesserocrBackend:
+    """
+    Fixed-size pool of PyTessBaseAPI engines, one pool per (lang, oem).
+    Engines are created lazily up to `size` (default: core count) and are
+    borrowed for the duration of a single recognition.
+    """
+    name = "tesserocr"
+
+    def __init__(self, size: int | None = None, tessdata: str | None = None):
+        if tesserocr is None:
+            raise RuntimeError(f"tesserocr unavailable: {_TESSEROCR_IMPORT_ERROR}")
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.tessdata = tessdata or _tessdata_path()
+        self._pools: dict[tuple[str, int], queue.LifoQueue] = {}
+        self._created: dict[tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self._closed = False   # engines still borrowed at close() are ended when returned
+
+    def _new_engine(self, lang: str, oem: int):
+        kwargs = {"lang": lang, "oem": tesserocr.OEM(oem)}
+        if self.tessdata:
+            kwargs["path"] = self.tessdata
+        return tesserocr.PyTessBaseAPI(**kwargs)
+
+    @contextmanager
+    def _engine(self, lang: str, oem: int):
+        key = (lang, oem)
+        while True:
+            with self._lock:
+                pool = self._pools.setdefault(key, queue.LifoQueue())
+                grow = pool.empty() and self._created.get(key, 0) < self.size
+                if grow:
+                    self._created[key] = self._created.get(key, 0) + 1
+            api = self._create(key) if grow else pool.get()
+            if api is not _RETRY:
+                break
+        try:
+            yield api
+        finally:
+            api.Clear()
+            with self._lock:
+                closed = self._closed
+            if closed:
+                api.End()
+            else:
+                pool.put(api)
+
+    def _create(self, key: tuple[str, int]):
+        """
+        New engine for a slot already counted in _created. If creation fails the
+        slot is given back and a thread blocked on the pool is woken to retry it.
+        """
+        try:
+            return self._new_engine(*key)
+        except Exception:
+            with self._lock:
+                self._created[key] -= 1
+                pool = self._pools.get(key)
+            if pool is not None:
+                pool.put(_RETRY)
+            raise
+
+    def warm_up(self, config: str = DEFAULT_CONFIG):
+        """Load every engine of the pool now instead of on first use."""
+        _, oem, lang = parse_config(config)
+        key = (lang, oem)
+        while True:
+            with self._lock:
+                pool = self._pools.setdefault(key, queue.LifoQueue())
+                if self._created.get(key, 0) >= self.size:
+                    return
+                self._created[key] = self._created.get(key, 0) + 1
+            pool.put(self._create(key))
+
+    def image_to_string(self, image, config: str = DEFAULT_CONFIG) -> str:
+        psm, oem, lang = parse_config(config)
+        data, w, h, bpp, bpl = _as_tess_bytes(np.asarray(image))
+        with self._engine(lang, oem) as api:
+            api.SetPageSegMode(tesserocr.PSM(psm))
+            api.SetImageBytes(data, w, h, bpp, bpl)
+            return api.GetUTF8Text()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for pool in self._pools.values():
+                while not pool.empty():
+                    api = pool.get_nowait()
+                    if api is not _RETRY:
+                        api.End()
+            self._pools.clear()
+            self._created.clear()
+
+# --------------------------------------------------------------------
+# 3) BACKEND SELECTION
+# --------------------------------------------------------------------
+BACKENDS = {
+    "pytesseract": PytesseractBackend,
+    "tesserocr":   TesserocrBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def make_backend(name: str = "auto"):
+    """Build and warm up the backend; engine failures (e.g. missing traineddata) fall back to pytesseract."""
+    name = (name or "auto").lower()
+    if name == "auto":
+        name = "tesserocr" if tesserocr is not None else "pytesseract"
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported OCR backend: {name}")
+    backend = None
+    try:
+        backend = BACKENDS[name]()
+        backend.warm_up()
+        return backend
+    except Exception as e:
+        if backend is not None:
+            backend.close()
+        print(f"[OCR] backend '{name}' unavailable ({e}), fallback pytesseract")
+        return PytesseractBackend()
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = make_backend(os.getenv("ASCENDEDSCOUT_OCR_BACKEND", "auto"))
+                print(f"[OCR] backend = {_backend.name}")
+    return _backend
+
+def set_backend(backend):
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+def image_to_string(image, config: str = DEFAULT_CONFIG) -> str:
+    return get_backend().image_to_string(image, config=config)
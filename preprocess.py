@@ -0,0 +1,165 @@
+"""
+Preprocessing for the capture zones.
+
+Player (top) zones run a configurable chain of steps (build_chain); the
+default chain matches preprocess_line_top() from ascendedscout.py.
+
+Center zones: fused preprocessing.
+
+One ColorSegmenter per zone converts the frame to HSV and gray once, classifies
+every pixel as red / blue / green / none with a single hue lookup table, and
+writes the binarized 2x variants into buffers that are reused frame after
+frame. The output matches preprocess_image_for_colored_text() and
+preprocess_image_general() from ascendedscout.py.
+
+Returned arrays are views into the segmenter's buffers: they stay valid until
+the next run() on the same zone.
+"""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import metrics
+
+COLOR_CLASSES = {"red": 1, "blue": 2, "green": 3}
+MIN_SAT_VAL = 50   # lower bound on both S and V, as in the inRange() masks
+INK_GRAY = 200     # white text counts as ink for line banding
+
+_H_SEGMENT = metrics.stage("preprocess", "segment")   # shared HSV / gray / classification
+_H_VARIANT = {name: metrics.stage("preprocess", name) for name in (*COLOR_CLASSES, "general")}
+
+def _build_hue_lut() -> np.ndarray:
+    # OpenCV 8-bit hue is 0..179; same inclusive ranges as preprocess_image_for_colored_text
+    lut = np.zeros(256, np.uint8)
+    lut[0:11]    = COLOR_CLASSES["red"]
+    lut[170:181] = COLOR_CLASSES["red"]
+    lut[100:141] = COLOR_CLASSES["blue"]
+    lut[40:81]   = COLOR_CLASSES["green"]
+    return lut
+
+HUE_LUT = _build_hue_lut()
+
+class ColorSegmenter:
+    def __init__(self, scale: int = 2):
+        self.scale = scale
+        self._shape = None
+
+    def _alloc(self, h: int, w: int):
+        self._shape = (h, w)
+        self.hsv   = np.empty((h, w, 3), np.uint8)
+        self.gray  = np.empty((h, w), np.uint8)
+        self.chan  = np.empty((h, w), np.uint8)
+        self.sv    = np.empty((h, w), np.uint8)
+        self.cls   = np.empty((h, w), np.uint8)
+        self.mask  = np.empty((h, w), np.uint8)
+        self.work  = np.empty((h, w), np.uint8)
+        self.ink   = np.empty((h, w), np.uint8)
+        big = (h * self.scale, w * self.scale)
+        self.big_gray = np.empty(big, np.uint8)
+        self.out = {name: np.empty(big, np.uint8) for name in (*COLOR_CLASSES, "general")}
+
+    def run(self, image) -> dict[str, np.ndarray]:
+        """BGR(A) frame -> {'red', 'blue', 'green', 'general'} binarized, upscaled images."""
+        h, w = image.shape[:2]
+        if self._shape != (h, w):
+            self._alloc(h, w)
+        size = (w * self.scale, h * self.scale)
+
+        t0 = time.perf_counter()
+        gray_code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=self.hsv)
+        cv2.cvtColor(image, gray_code, dst=self.gray)
+
+        # one classification pass: hue class, zeroed where S or V is below threshold
+        cv2.extractChannel(self.hsv, 0, dst=self.chan)
+        cv2.LUT(self.chan, HUE_LUT, dst=self.cls)
+        cv2.extractChannel(self.hsv, 1, dst=self.sv)
+        cv2.extractChannel(self.hsv, 2, dst=self.chan)
+        cv2.min(self.sv, self.chan, dst=self.sv)
+        cv2.threshold(self.sv, MIN_SAT_VAL - 1, 255, cv2.THRESH_BINARY, dst=self.sv)
+        cv2.bitwise_and(self.cls, self.sv, dst=self.cls)
+        t1 = time.perf_counter()
+        _H_SEGMENT.observe(t1 - t0)
+
+        for name, code in COLOR_CLASSES.items():
+            cv2.compare(self.cls, code, cv2.CMP_EQ, dst=self.mask)
+            cv2.min(self.gray, self.mask, dst=self.work)
+            cv2.threshold(self.work, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=self.work)
+            cv2.resize(self.work, size, dst=self.out[name], interpolation=cv2.INTER_CUBIC)
+            t0, t1 = t1, time.perf_counter()
+            _H_VARIANT[name].observe(t1 - t0)
+
+        general = self.out["general"]
+        cv2.resize(self.gray, size, dst=self.big_gray, interpolation=cv2.INTER_CUBIC)
+        cv2.GaussianBlur(self.big_gray, (5, 5), 0, dst=general)
+        cv2.threshold(general, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=general)
+        _H_VARIANT["general"].observe(time.perf_counter() - t1)
+        return self.out
+
+    def ink_mask(self) -> np.ndarray:
+        """Text pixels of the last run(): any color class, or bright (white) text."""
+        cv2.threshold(self.gray, INK_GRAY - 1, 255, cv2.THRESH_BINARY, dst=self.ink)
+        cv2.compare(self.cls, 0, cv2.CMP_GT, dst=self.mask)
+        cv2.bitwise_or(self.ink, self.mask, dst=self.ink)
+        return self.ink
+
+_segmenters: dict[str, ColorSegmenter] = {}
+_segmenters_lock = threading.Lock()
+
+def get_segmenter(zone: str, scale: int = 2) -> ColorSegmenter:
+    with _segmenters_lock:
+        seg = _segmenters.get(zone)
+        if seg is None or seg.scale != scale:
+            seg = _segmenters[zone] = ColorSegmenter(scale)
+        return seg
+
+# --------------------------------------------------------------------
+# Step chains ("name:arg:arg")
+# --------------------------------------------------------------------
+def _gray(img):
+    if img.ndim == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if img.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+
+def _upscale(img, factor="2"):
+    f = float(factor)
+    return cv2.resize(img, None, fx=f, fy=f, interpolation=cv2.INTER_CUBIC)
+
+def _blur(img, k="5"):
+    k = int(k)
+    return cv2.GaussianBlur(img, (k, k), 0)
+
+def _bilateral(img, d="7", sigma_color="55", sigma_space="55"):
+    return cv2.bilateralFilter(img, int(d), float(sigma_color), float(sigma_space))
+
+def _otsu(img):
+    return cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+
+def _invert(img):
+    return cv2.bitwise_not(img)
+
+def _dilate(img, k="2"):
+    k = int(k)
+    return cv2.dilate(img, np.ones((k, k), np.uint8), iterations=1)
+
+STEPS = {"gray": _gray, "upscale": _upscale, "blur": _blur, "bilateral": _bilateral,
+         "otsu": _otsu, "invert": _invert, "dilate": _dilate}
+
+TOP_LINE_CHAIN = ["gray", "upscale:2", "bilateral:7:55:55", "otsu", "dilate:2"]
+
+def build_chain(steps: list[str] | None = None):
+    """["gray", "upscale:2", ...] -> fn(BGR(A) image) -> binarized image."""
+    parsed = []
+    for step in steps or TOP_LINE_CHAIN:
+        name, *args = step.split(":")
+        if name not in STEPS:
+            raise ValueError(f"Unknown preprocess step: {name}")
+        parsed.append((STEPS[name], args))
+
+    def run(img):
+        for fn, args in parsed:
+            img = fn(img, *args)
+        return img
+    return run
@@ -0,0 +1,118 @@
+"""
+Process resource sampling + periodic metrics snapshot.
+
+Every `interval` seconds: CPU %, RSS and thread count of this process (and,
+summed, of its children, e.g. the supervisor.py workers) are set as
+metrics gauges and appended as one line to `log_path`; the full metrics
+snapshot (histograms included) is written to `snapshot_path` as JSON
+(atomically replaced). With `http_port` the Prometheus endpoint
+(metrics.serve) is started too.
+"""
+import json
+import os
+import threading
+import time
+
+import metrics
+
+try:
+    import psutil
+except ImportError:  # sampling disabled, snapshots still written
+    psutil = None
+
+class ResourceMonitor:
+    def __init__(self, log_path: str = "logs/usage.log", interval: float = 10.0,
+                 snapshot_path: str | None = None, http_port: int | None = None):
+        self.log_path = log_path
+        self.interval = interval
+        self.snapshot_path = snapshot_path or os.path.join(os.path.dirname(log_path) or ".", "metrics.json")
+        self.http_port = http_port
+        self._proc = psutil.Process() if psutil is not None else None
+        self._children: dict[int, object] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    # ---------------- sampling ----------------
+    def _child_procs(self) -> list:
+        """Children keep their psutil.Process so cpu_percent() has a previous sample to diff against."""
+        alive = {}
+        for c in self._proc.children(recursive=True):
+            alive[c.pid] = self._children.get(c.pid, c)
+        self._children = alive
+        return list(alive.values())
+
+    def sample(self) -> dict:
+        if self._proc is None:
+            return {}
+        out = {}
+        with self._proc.oneshot():
+            out["self"] = {"cpu_percent": self._proc.cpu_percent(None),
+                           "rss_bytes": self._proc.memory_info().rss,
+                           "threads": self._proc.num_threads()}
+        kids = {"cpu_percent": 0.0, "rss_bytes": 0, "threads": 0, "processes": 0}
+        for c in self._child_procs():
+            try:
+                with c.oneshot():
+                    kids["cpu_percent"] += c.cpu_percent(None)
+                    kids["rss_bytes"] += c.memory_info().rss
+                    kids["threads"] += c.num_threads()
+                    kids["processes"] += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        out["children"] = kids
+        for scope, values in out.items():
+            for name, value in values.items():
+                metrics.REGISTRY.set_gauge(f"process_{name}", value, scope=scope)
+        return out
+
+    def _write_usage(self, usage: dict):
+        parts = [time.strftime("%Y-%m-%d %H:%M:%S")]
+        for scope, v in usage.items():
+            parts.append(f"{scope}: cpu={v['cpu_percent']:.1f}% rss={v['rss_bytes'] / 1048576:.1f}MB "
+                         f"threads={v['threads']}")
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(" | ".join(parts) + "\n")
+
+    def write_snapshot(self):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(metrics.REGISTRY.snapshot(remote=True), f)
+        os.replace(tmp, self.snapshot_path)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                usage = self.sample()
+                if usage:
+                    self._write_usage(usage)
+                self.write_snapshot()
+            except Exception as e:
+                print(f"[MONITOR] {type(e).__name__}: {e}")
+
+    # ---------------- lifecycle ----------------
+    def start(self):
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        if self._proc is None:
+            print("[MONITOR] psutil not installed: no CPU/RSS sampling")
+        else:
+            self.sample()  # primes cpu_percent()
+        if self.http_port is not None:
+            try:
+                self._server = metrics.serve(self.http_port)
+            except OSError as e:
+                print(f"[METRICS] cannot listen on port {self.http_port}: {e}")
+        self._thread = threading.Thread(target=self._loop, name="MONITOR", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        if self._server is not None:
+            self._server.shutdown()
+        try:
+            self.write_snapshot()
+        except OSError as e:
+            print(f"[MONITOR] final snapshot: {e}")
@@ -0,0 +1,99 @@
+"""
+Event routing: which guilds and channels receive each event kind.
+
+routes.json (path overridable with ASCENDEDSCOUT_ROUTES) lists the Discord
+servers the scout feed is delivered to. Each guild has its own text channel
+per event kind, its own voice channel and its own audio cooldown:
+
+    {"guilds": [
+      {"name": "main", "guild_id": 111, "voice_channel_id": 222,
+       "channels": {"tribemember": 333, "player": 444, "center": 555}},
+      {"name": "ally", "guild_id": 666, "channels": {"center": 777},
+       "audio_cooldown_sec": 30}
+    ]}
+
+A kind missing from "channels" is not sent to that guild, and its voice
+alerts (a destroyed structure for "center") do not play there either; no
+voice_channel_id means no voice alerts there. Without the file the bot's
+single-server constants are the only route (bot.py).
+
+When the bot's shards are split over several processes, each process only
+delivers to the guilds on its own shards (shard_for), so a line is posted
+once per guild.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+
+KINDS = ("tribemember", "player", "center")
+
+@dataclass
+class GuildRoute:
+    name: str
+    guild_id: int | None                   # None: the bot's only guild (single-server setup)
+    channels: dict = field(default_factory=dict)   # event kind -> text channel id
+    voice_channel_id: int | None = None
+    audio_cooldown_sec: float = 15.0
+    enabled: bool = True
+
+    def __post_init__(self):
+        unknown = set(self.channels) - set(KINDS)
+        if unknown:
+            raise ValueError(f"Route {self.name}: unknown event kinds {sorted(unknown)}")
+        self.channels = {k: int(v) for k, v in self.channels.items()}
+        if self.guild_id is not None:
+            self.guild_id = int(self.guild_id)
+        if self.voice_channel_id is not None:
+            self.voice_channel_id = int(self.voice_channel_id)
+
+def default_path() -> str:
+    return os.getenv("ASCENDEDSCOUT_ROUTES") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "routes.json")
+
+def load_routes(path: str | None = None, default: list[GuildRoute] | None = None) -> list[GuildRoute]:
+    """Enabled routes from the config file; `default` if there is none."""
+    path = path or default_path()
+    if not os.path.exists(path):
+        return list(default or [])
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    routes = [GuildRoute(**g) for g in data.get("guilds", [])]
+    ids = [r.guild_id for r in routes if r.guild_id is not None]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"{path}: duplicate guild ids")
+    return [r for r in routes if r.enabled]
+
+def shard_for(guild_id: int, shard_count: int) -> int:
+    """Shard whose gateway connection carries this guild (Discord's formula)."""
+    return (guild_id >> 22) % shard_count
+
+class RoutingTable:
+    """
+    routes    : GuildRoute list
+    shard_ids : shards run by this process (None: all of them); guilds on other
+                shards are left to the process running those
+    """
+
+    def __init__(self, routes: list[GuildRoute], shard_ids: list[int] | None = None, shard_count: int = 1):
+        if shard_ids is not None:
+            routes = [r for r in routes if r.guild_id is None or shard_for(r.guild_id, shard_count) in shard_ids]
+        self.routes = routes
+        self._channels = {k: [r.channels[k] for r in routes if k in r.channels] for k in KINDS}
+
+    def channels(self, kind: str) -> list[int]:
+        return self._channels.get(kind, [])
+
+    def voice_routes(self) -> list[GuildRoute]:
+        return [r for r in self.routes if r.voice_channel_id is not None]
+
+    def fan_out(self, dispatcher, kind: str, line: str, alert: bool = False, origin: float | None = None) -> int:
+        """Queues the line on every channel routed for `kind`; returns their count.
+
+        dispatcher: send_queue.SendDispatcher, whose per-channel sender tasks deliver the guilds concurrently.
+        """
+        channels = self.channels(kind)
+        for channel_id in channels:
+            dispatcher.submit(channel_id, line, alert=alert, origin=origin)
+        return len(channels)
+
+    def __len__(self) -> int:
+        return len(self.routes)
@@ -0,0 +1,109 @@
+"""
+Adaptive per-zone capture scheduler.
+
+Each zone is polled at its own interval:
+- a detected change drops the zone to `active_interval` (sub-100 ms by default),
+- after `cooldown` seconds without change the interval grows by `backoff`
+  per grab until it is back at `idle_interval`.
+
+Budgets:
+- latency_budget: worst-case detection delay; the interval is capped at the
+                  budget minus the zone's measured OCR time
+- cpu_budget    : fraction of one core the scout may spend; a zone's interval
+                  never drops below its measured processing time per grab
+                  (change detection + OCR time weighted by the fraction of
+                  grabs that trigger OCR) divided by its share of the budget.
+                  The latency ceiling wins when the two conflict.
+
+report() gives the capture-side cost of a grab; the OCR workers run
+elsewhere and give theirs with report_busy().
+
+stats() exposes the current rate and the dropped-frame count per zone (grab
+slots missed because the loop was busy).
+"""
+import time
+
+class _ZoneState:
+    __slots__ = ("interval", "next_due", "last_change", "busy_ewma", "ocr_ewma", "ocr_share",
+                 "ocr_runs", "grabs", "dropped")
+
+    def __init__(self, interval: float, now: float):
+        self.interval = interval
+        self.next_due = now
+        self.last_change = float("-inf")
+        self.busy_ewma = 0.0
+        self.ocr_ewma = 0.0
+        self.ocr_share = 0.0
+        self.ocr_runs = 0
+        self.grabs = 0
+        self.dropped = 0
+
+class AdaptiveScheduler:
+    def __init__(self, zones, idle_interval: float = 1.0, active_interval: float = 0.08,
+                 cooldown: float = 5.0, backoff: float = 1.5,
+                 cpu_budget: float | None = 0.5, latency_budget: float | None = None):
+        self.idle_interval = min(idle_interval, latency_budget) if latency_budget else idle_interval
+        self.active_interval = min(active_interval, self.idle_interval)
+        self.cooldown = cooldown
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.latency_budget = latency_budget
+        now = time.monotonic()
+        self._zones = {z: _ZoneState(self.idle_interval, now) for z in zones}
+
+    def _floor(self, st: _ZoneState) -> float:
+        if not self.cpu_budget:
+            return self.active_interval
+        share = self.cpu_budget / len(self._zones)
+        return max(self.active_interval, (st.busy_ewma + st.ocr_ewma * st.ocr_share) / share)
+
+    def _ceiling(self, st: _ZoneState) -> float:
+        if not self.latency_budget:
+            return self.idle_interval
+        return max(self.active_interval, min(self.idle_interval, self.latency_budget - st.ocr_ewma))
+
+    def due(self, now: float | None = None) -> list[str]:
+        now = time.monotonic() if now is None else now
+        return [z for z, st in self._zones.items() if now >= st.next_due]
+
+    def sleep_time(self, now: float | None = None) -> float:
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(st.next_due for st in self._zones.values()) - now)
+
+    def report(self, zone: str, changed: bool, busy_sec: float, now: float | None = None):
+        """Called after a zone was grabbed and processed."""
+        now = time.monotonic() if now is None else now
+        st = self._zones[zone]
+        st.grabs += 1
+        st.busy_ewma = busy_sec if st.grabs == 1 else 0.8 * st.busy_ewma + 0.2 * busy_sec
+        # slow average: a lone change among idle grabs must not charge its OCR to every grab
+        st.ocr_share = 0.95 * st.ocr_share + 0.05 * bool(changed)
+        late = now - busy_sec - st.next_due
+        if late > st.interval:
+            st.dropped += int(late // st.interval)
+
+        if changed:
+            st.last_change = now
+            st.interval = self.active_interval
+        elif now - st.last_change > self.cooldown:
+            st.interval = min(self.idle_interval, st.interval * self.backoff)
+        st.interval = min(max(st.interval, self._floor(st)), self._ceiling(st))
+        st.next_due = now + st.interval
+
+    def report_busy(self, zone: str, busy_sec: float):
+        """Called by the zone's OCR worker after processing a changed frame (any thread)."""
+        st = self._zones[zone]
+        st.ocr_runs += 1
+        st.ocr_ewma = busy_sec if st.ocr_runs == 1 else 0.8 * st.ocr_ewma + 0.2 * busy_sec
+
+    def stats(self) -> dict[str, dict]:
+        return {z: {"interval_sec": st.interval,
+                    "rate_hz": 1.0 / st.interval if st.interval > 0 else 0.0,
+                    "grabs": st.grabs,
+                    "dropped": st.dropped,
+                    "busy_ms": st.busy_ewma * 1000.0,
+                    "ocr_ms": st.ocr_ewma * 1000.0}
+                for z, st in self._zones.items()}
+
+    def summary(self) -> str:
+        return " | ".join(f"{z} {s['rate_hz']:.1f}Hz dropped={s['dropped']}" for z, s in self.stats().items())
@@ -0,0 +1,251 @@
+"""
+Outbound Discord messages: one queue and one sender task per channel.
+
+- Lines arriving within `coalesce_ms` of each other (or while the previous
+  message was still being sent) are merged into one message, split only at
+  Discord's 2000-character limit. An alert on a channel idle for longer than
+  the window does not wait for it: it goes out with whatever is already
+  queued, so a lone raid alert is not delayed by `coalesce_ms`; the rest of
+  the burst is coalesced as usual.
+- A burst containing destroyed lines gets a single @everyone, and at most one
+  per `alert_cooldown_sec` per channel.
+- RestSender posts to the REST API directly and paces itself from the
+  X-RateLimit-* headers (per channel bucket + global limit), retrying 429s
+  after `retry_after` and 5xx / connection errors with exponential backoff.
+  `api_base` can point at a local fake server.
+  Requests are also kept under Discord's global limit (`global_per_sec`)
+  up front: fanning a raid out to many guilds would otherwise run into it
+  and collect 429s, which count toward Discord's invalid-request ban.
+"""
+import asyncio
+import collections
+import contextlib
+import json
+import time
+from dataclasses import dataclass
+
+import aiohttp
+
+import metrics
+
+_H_SEND = metrics.stage("discord_send")   # one message, pacing and retries included
+
+DISCORD_API = "https://discord.com/api/v10"
+GLOBAL_PER_SEC = 45     # Discord allows 50 requests/s per bot; headroom for requests still in flight
+MAX_MESSAGE_LEN = 2000
+ALERT_TEXT = "@everyone **We are under attack! DEFEND!**"
+
+class RestSender:
+    def __init__(self, token: str, api_base: str = DISCORD_API, max_retries: int = 3,
+                 global_per_sec: int | None = GLOBAL_PER_SEC):
+        self.token = token
+        self.api_base = api_base.rstrip("/")
+        self.max_retries = max_retries
+        self.global_per_sec = global_per_sec
+        # Requests count toward the global window from the time they are sent until a
+        # second after their response: Discord counts them when they arrive, which
+        # may be well after they were sent (connection setup, a busy loop).
+        self._recent: collections.deque[float] = collections.deque()  # responses in the last second
+        self._in_flight = 0
+        self._session: aiohttp.ClientSession | None = None
+        self._blocked_until: dict[str, float] = {}  # bucket -> monotonic time
+        self._global_until = 0.0
+        self.calls = 0
+        self.rate_limited = 0
+        self.waited_sec = 0.0
+
+    async def _pace(self, bucket: str):
+        until = max(self._global_until, self._blocked_until.get(bucket, 0.0))
+        delay = until - time.monotonic()
+        if delay > 0:
+            self.waited_sec += delay
+            await asyncio.sleep(delay)
+        if not self.global_per_sec:
+            return
+        while True:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) + self._in_flight < self.global_per_sec:
+                break
+            delay = 1.0 - (now - self._recent[0]) if self._recent else 0.01
+            self.waited_sec += delay
+            await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, bucket: str):
+        await self._pace(bucket)
+        self.calls += 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self.global_per_sec:
+                self._recent.append(time.monotonic())
+
+    def _update(self, bucket: str, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None and int(remaining) <= 0:
+            self._blocked_until[bucket] = time.monotonic() + float(reset_after)
+
+    async def send(self, channel_id: int, content: str) -> bool:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(headers={"Authorization": f"Bot {self.token}"})
+        bucket = f"messages:{channel_id}"
+        url = f"{self.api_base}/channels/{channel_id}/messages"
+        for attempt in range(self.max_retries + 1):
+            backoff = min(8.0, 0.5 * 2 ** attempt)
+            try:
+                async with self._slot(bucket), self._session.post(url, json={"content": content}) as resp:
+                    self._update(bucket, resp.headers)
+                    if resp.status == 429:
+                        self.rate_limited += 1
+                        try:
+                            body = await resp.json(content_type=None)
+                        except (aiohttp.ContentTypeError, json.JSONDecodeError):
+                            body = {}
+                        retry_after = float(body.get("retry_after") or resp.headers.get("Retry-After") or 1.0)
+                        until = time.monotonic() + retry_after
+                        if body.get("global") or resp.headers.get("X-RateLimit-Global"):
+                            self._global_until = until
+                        else:
+                            self._blocked_until[bucket] = until
+                        continue
+                    if resp.status >= 500:   # Discord / Cloudflare hiccup (502, 503): worth another try
+                        print(f"[SEND] {channel_id}: HTTP {resp.status}, retrying in {backoff:.1f}s")
+                    elif resp.status >= 400:
+                        print(f"[SEND] {channel_id}: HTTP {resp.status} {(await resp.text())[:200]}")
+                        return False
+                    else:
+                        return True
+            except aiohttp.ClientError as e:
+                print(f"[SEND] {channel_id}: {type(e).__name__}: {e}")
+            await asyncio.sleep(backoff)
+        print(f"[SEND] {channel_id}: giving up after {self.max_retries + 1} attempts")
+        return False
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+@dataclass
+class _Line:
+    text: str
+    alert: bool
+    origin: float | None = None   # capture time of the frame the line was read from
+
+class SendDispatcher:
+    """sender: any object with `async send(channel_id, content) -> bool` (RestSender)."""
+
+    def __init__(self, sender, coalesce_ms: int = 250, max_len: int = MAX_MESSAGE_LEN,
+                 alert_cooldown_sec: float = 15.0):
+        self.sender = sender
+        self.coalesce_sec = coalesce_ms / 1000.0
+        self.max_len = max_len
+        self.alert_cooldown_sec = alert_cooldown_sec
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._last_alert: dict[int, float] = {}
+        self._last_sent: dict[int, float] = {}   # channel -> monotonic time the last burst went out
+        self.lines = 0
+        self.messages = 0
+        self.mentions = 0
+        self.failed = 0
+
+    def submit(self, channel_id: int, line: str, alert: bool = False, origin: float | None = None):
+        """Queue a line; must be called from the event loop. origin: see events.set_origin()."""
+        q = self._queues.get(channel_id)
+        if q is None:
+            q = self._queues[channel_id] = asyncio.Queue()
+            self._tasks[channel_id] = asyncio.create_task(self._worker(channel_id, q))
+        self.lines += 1
+        q.put_nowait(_Line(line, alert, origin))
+
+    async def _collect(self, channel_id: int, q: asyncio.Queue) -> tuple[list[_Line], bool]:
+        """
+        Next burst: first line, everything within the coalesce window, anything
+        already queued. An alert on an idle channel only takes the queued lines.
+        """
+        first = await q.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        now = time.monotonic()
+        urgent = first.alert and now - self._last_sent.get(channel_id, float("-inf")) >= self.coalesce_sec
+        deadline = now + self.coalesce_sec
+        while True:
+            try:
+                item = q.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - time.monotonic()
+                if urgent or timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(q.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _render(self, channel_id: int, batch: list[_Line]) -> list[str]:
+        lines = [ln.text[:self.max_len] for ln in batch]
+        if any(ln.alert for ln in batch):
+            now = time.monotonic()
+            if now - self._last_alert.get(channel_id, float("-inf")) >= self.alert_cooldown_sec:
+                self._last_alert[channel_id] = now
+                self.mentions += 1
+                lines.insert(0, ALERT_TEXT)
+        chunks, cur = [], ""
+        for ln in lines:
+            if cur and len(cur) + 1 + len(ln) > self.max_len:
+                chunks.append(cur)
+                cur = ln
+            else:
+                cur = f"{cur}\n{ln}" if cur else ln
+        if cur:
+            chunks.append(cur)
+        return chunks
+
+    async def _worker(self, channel_id: int, q: asyncio.Queue):
+        while True:
+            batch, closing = await self._collect(channel_id, q)
+            self._last_sent[channel_id] = time.monotonic()
+            delivered = True
+            for content in self._render(channel_id, batch):
+                t0 = time.perf_counter()
+                try:
+                    ok = await self.sender.send(channel_id, content)
+                except Exception as e:
+                    print(f"[SEND] {channel_id}: {type(e).__name__}: {e}")
+                    ok = False
+                _H_SEND.observe(time.perf_counter() - t0)
+                if ok:
+                    self.messages += 1
+                    print(f"[SEND] -> {channel_id} : {content}")
+                else:
+                    self.failed += 1
+                    delivered = False
+            if delivered:
+                now = time.time()
+                for ln in batch:
+                    if ln.origin is not None:
+                        metrics.E2E.observe(now - ln.origin)
+            if closing:
+                return
+
+    async def close(self):
+        """Flush every queue, then stop the workers."""
+        for q in self._queues.values():
+            q.put_nowait(None)
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._queues.clear()
+        self._tasks.clear()
+
+    def stats(self) -> dict:
+        return {"lines": self.lines, "messages": self.messages, "mentions": self.mentions,
+                "failed": self.failed, "queued": sum(q.qsize() for q in self._queues.values())}
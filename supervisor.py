@@ -0,0 +1,305 @@
+"""
+Multi-process capture / OCR, supervised from the bot's process.
+
+- capture process : frame source + scheduler + change detection (a
+  CapturePipeline whose per-zone handler copies the changed frame into a
+  shared-memory slot and hands the slot to the zone's OCR process)
+- OCR processes   : `workers` of them, zones assigned round-robin; each runs
+  ascendedscout.process_notification on the shared frame, returns the slot
+  (with the OCR time, for the capture scheduler's budgets) and sends the
+  resulting events back over a queue
+- supervisor      : owns the shared memory, writes the journal and publishes
+  the events on events.BUS (the bot listens there), restarts crashed
+  processes and exports the children's metrics (metrics.merge)
+
+Every zone owns `slots_per_zone` slots of the ring, so at most that many of
+its frames are in flight; beyond that the zone's queue policy (drop-oldest,
+coalesce, ...) applies in the capture process as usual. Each process records
+the slot it holds in shared memory; when the watchdog restarts a dead process
+it re-issues that slot under a new generation, so a copy the dead process
+still handed on is recognised as stale and dropped.
+"""
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import events
+import metrics
+
+RESTART_MIN_INTERVAL_SEC = 2.0
+METRICS_PUSH_SEC = 5.0
+
+def _slot_view(shm, layout: dict, zone: str, slot: int) -> np.ndarray:
+    offset, slot_bytes, shape = layout[zone][:3]
+    return np.ndarray(shape, np.uint8, buffer=shm.buf, offset=offset + slot * slot_bytes)
+
+# --------------------------------------------------------------------
+# Child processes
+# --------------------------------------------------------------------
+def _push_metrics(event_q, name: str):
+    event_q.put(("metrics", name, metrics.REGISTRY.snapshot()))
+
+def _capture_main(source_spec, realtime, zones, policies, persistence, layout, shm_name, free_qs, task_qs,
+                  gens, event_q, stop_evt, held, initializer):
+    if initializer is not None:
+        initializer()
+    import capture_pipeline
+    import frame_source
+    import scheduler
+    import ascendedscout as scout
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    source = frame_source.open_source(source_spec, realtime=realtime)
+    sched = scheduler.AdaptiveScheduler(
+        zones, idle_interval=scout.SCHED_IDLE_INTERVAL, active_interval=scout.SCHED_ACTIVE_INTERVAL,
+        cpu_budget=scout.SCHED_CPU_BUDGET, latency_budget=scout.SCHED_LATENCY_BUDGET)
+
+    def handoff(frame, zone, boxes):
+        while True:
+            try:
+                slot, gen, ocr_sec = free_qs[zone].get(timeout=0.5)
+            except queue.Empty:
+                if stop_evt.is_set():
+                    return
+                continue
+            if gen == gens[zone][slot]:
+                break   # otherwise stale: the slot was re-issued after a crash
+        held[0], held[1] = layout[zone][5], slot
+        if ocr_sec is not None:
+            sched.report_busy(zone, ocr_sec)
+        h, w = frame.shape[:2]
+        np.copyto(_slot_view(shm, layout, zone, slot)[:h, :w], frame)
+        task_qs[layout[zone][4]].put((zone, slot, gen, (h, w), boxes, events.current_origin()))
+        held[0] = -1
+
+    pipe = capture_pipeline.CapturePipeline(source, zones, handoff, scheduler=sched, policies=policies,
+                                            persistence=persistence, report_ocr=False)
+    try:
+        pipe.start()
+        while pipe.alive() and not stop_evt.is_set():
+            pipe.join(timeout=METRICS_PUSH_SEC)
+            _push_metrics(event_q, "capture")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pipe.stop()
+        pipe.join(timeout=5.0)
+        source.close()
+        if not source.live:  # end of the replay: let the OCR processes drain and exit
+            for q in task_qs:
+                q.put(None)
+        _push_metrics(event_q, "capture")
+        shm.close()
+
+def _ocr_main(name, zones_path, layout, shm_name, task_q, free_qs, gens, event_q, held, initializer):
+    if initializer is not None:
+        initializer()
+    import ascendedscout as scout
+    import zones as zone_config
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    scout.set_zones(zone_config.load_zones(zones_path))
+    scout.emit_event = event_q.put   # journal, bus and console output happen in the supervisor
+    next_push = time.monotonic() + METRICS_PUSH_SEC
+    try:
+        while True:
+            try:
+                task = task_q.get(timeout=METRICS_PUSH_SEC)
+            except queue.Empty:
+                task = ()
+            if time.monotonic() >= next_push:
+                _push_metrics(event_q, name)
+                next_push = time.monotonic() + METRICS_PUSH_SEC
+            if task is None:
+                break
+            if not task:
+                continue
+            zone, slot, gen, (h, w), boxes, origin = task
+            if gen != gens[zone][slot]:
+                continue  # handed on by a capture process that died; the slot was re-issued
+            held[0], held[1] = layout[zone][5], slot
+            events.set_origin(origin)
+            t0 = time.perf_counter()
+            try:
+                scout.process_notification(_slot_view(shm, layout, zone, slot)[:h, :w], zone, boxes)
+            finally:
+                free_qs[zone].put((slot, gen, time.perf_counter() - t0))
+                held[0] = -1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _push_metrics(event_q, name)
+        shm.close()
+
+# --------------------------------------------------------------------
+# Supervisor
+# --------------------------------------------------------------------
+class OcrSupervisor:
+    def __init__(self, workers: int = 1, source_spec: str = "live", realtime: bool = True,
+                 zones_path: str | None = None, slots_per_zone: int = 2, on_event=None,
+                 initializer=None):
+        """
+        workers     : OCR processes; zones are spread over them round-robin
+        source_spec : frame_source.open_source() spec, opened in the capture process
+        on_event    : called (on the supervisor's event thread) for every event, default
+                      ascendedscout.emit_event (journal + events.BUS)
+        initializer : picklable callable run first in every child process
+        """
+        import ascendedscout as scout
+        import zones as zone_config
+
+        self.workers = max(1, workers)
+        self.source_spec = source_spec
+        self.realtime = realtime
+        self.zones_path = zones_path
+        self.initializer = initializer
+        self.on_event = on_event or scout.emit_event
+        specs = zone_config.load_zones(zones_path)
+        self.zones = zone_config.resolve(specs)
+        self.policies = {z.name: z.queue or scout.ZONE_QUEUE_POLICIES[z.parser] for z in specs}
+        self.persistence = {z.name: scout.ZONE_CHANGE_PERSISTENCE[z.parser] for z in specs}
+        self._dedup = scout.CENTER_DEDUP   # center events of different OCR processes meet here
+        self._dedup_lock = scout._center_dedup_lock   # shared with the checkpoint thread
+
+        # layout: zone -> (offset, slot bytes, shape, slots, worker, zone index)
+        self.layout, offset = {}, 0
+        for i, (name, r) in enumerate(self.zones.items()):
+            shape = (r["height"], r["width"], 4)
+            slot_bytes = int(np.prod(shape))
+            self.layout[name] = (offset, slot_bytes, shape, slots_per_zone, i % self.workers, i)
+            offset += slot_bytes * slots_per_zone
+
+        self._ctx = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+        self._free_qs = {z: self._ctx.Queue() for z in self.zones}
+        self._gens = {z: self._ctx.Array("i", lay[3]) for z, lay in self.layout.items()}  # per slot
+        for z, lay in self.layout.items():
+            for s in range(lay[3]):
+                self._free_qs[z].put((s, 0, None))
+        self._task_qs = [self._ctx.Queue() for _ in range(self.workers)]
+        self._event_q = self._ctx.Queue()
+        self._stop_evt = self._ctx.Event()
+        # process name -> (zone index, slot) it holds, -1 when none
+        self._held = {n: self._ctx.Array("i", [-1, -1])
+                      for n in ["capture"] + [f"ocr-{i}" for i in range(self.workers)]}
+        self._procs: dict[str, mp.Process] = {}
+        self._started_at: dict[str, float] = {}
+        self.restarts: dict[str, int] = {}
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self.events = 0
+
+    # ---------------- processes ----------------
+    def _spawn(self, name: str):
+        if name == "capture":
+            target, args = _capture_main, (self.source_spec, self.realtime, self.zones, self.policies,
+                                           self.persistence, self.layout, self._shm.name, self._free_qs, self._task_qs,
+                                           self._gens, self._event_q, self._stop_evt, self._held[name],
+                                           self.initializer)
+        else:
+            i = int(name.split("-")[1])
+            target, args = _ocr_main, (name, self.zones_path, self.layout, self._shm.name, self._task_qs[i],
+                                       self._free_qs, self._gens, self._event_q, self._held[name], self.initializer)
+        p = self._ctx.Process(target=target, args=args, name=f"scout-{name}", daemon=True)
+        p.start()
+        self._procs[name] = p
+        self._started_at[name] = time.monotonic()
+
+    def _recover_slot(self, name: str):
+        """
+        Give back the slot a dead process was holding (OCR: its queued tasks go
+        to the replacement). The slot gets a new generation, so a copy the
+        process put on a queue just before dying is dropped as stale.
+        """
+        held = self._held[name]
+        if held[0] >= 0:
+            zone = next(z for z, lay in self.layout.items() if lay[5] == held[0])
+            gens = self._gens[zone]
+            gens[held[1]] += 1
+            self._free_qs[zone].put((held[1], gens[held[1]], None))
+            held[0] = -1
+
+    def _watchdog(self):
+        while not self._stopping.wait(0.5):
+            for name, p in list(self._procs.items()):
+                if p.is_alive() or self._stop_evt.is_set():
+                    continue
+                if p.exitcode == 0 and not (name == "capture" and self._is_live()):
+                    continue  # replay finished: capture and workers exit cleanly
+                if time.monotonic() - self._started_at[name] < RESTART_MIN_INTERVAL_SEC:
+                    continue
+                self.restarts[name] = self.restarts.get(name, 0) + 1
+                print(f"[SUPERVISOR] {name} exited (code {p.exitcode}), restarting "
+                      f"(#{self.restarts[name]})")
+                self._recover_slot(name)
+                self._spawn(name)
+
+    def _is_live(self) -> bool:
+        return not self.source_spec or self.source_spec == "live"
+
+    # ---------------- events ----------------
+    def _event_loop(self):
+        while not (self._stopping.is_set() and self._event_q.empty()):
+            try:
+                ev = self._event_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            if isinstance(ev, tuple):   # ("metrics", process name, snapshot)
+                metrics.REGISTRY.merge(ev[1], ev[2])
+                continue
+            if ev.kind == "center" and not self._should_post(ev):
+                continue
+            self.events += 1
+            try:
+                self.on_event(ev)
+            except Exception as e:
+                print(f"[SUPERVISOR] event handler error: {type(e).__name__}: {e}")
+
+    def _should_post(self, ev) -> bool:
+        with self._dedup_lock:
+            return self._dedup.should_post(ev.day, ev.clock, ev.obj, ev.action)
+
+    # ---------------- lifecycle ----------------
+    def start(self):
+        for i in range(self.workers):
+            self._spawn(f"ocr-{i}")
+        self._spawn("capture")
+        for target, name in ((self._event_loop, "SUP-EVENTS"), (self._watchdog, "SUP-WATCHDOG")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._threads.append(t)
+        print(f"[SUPERVISOR] capture + {self.workers} OCR process(es), zones: "
+              + ", ".join(f"{z}->ocr-{lay[4]}" for z, lay in self.layout.items()))
+
+    def alive(self) -> bool:
+        return any(p.is_alive() for p in self._procs.values())
+
+    def join(self, timeout: float | None = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for p in list(self._procs.values()):
+            p.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_evt.set()
+        for q in self._task_qs:
+            q.put(None)
+        self.join(timeout)
+        self._stopping.set()
+        for p in self._procs.values():
+            if p.is_alive():
+                p.terminate()
+                p.join(1.0)
+        for t in self._threads:
+            t.join(2.0)
+        self._shm.close()
+        self._shm.unlink()
+
+    def stats(self) -> dict:
+        return {"events": self.events, "restarts": dict(self.restarts),
+                "alive": {n: p.is_alive() for n, p in self._procs.items()}}
@@ -0,0 +1,128 @@
+"""
+Expiring key cache with O(1) amortized insert / lookup / expiry.
+
+Every entry lives exactly `ttl` seconds from its insertion, so insertion order
+is also expiry order: expired entries are popped from the front of an
+OrderedDict. `max_items` is a hard cap (the oldest entry is evicted first).
+String keys are stored by their built-in hash (64-bit, per process), so the
+cache never holds the lines themselves; `stable_keys=True` uses a hash that
+is the same in every process instead, so export() / restore() can carry the
+cache across a restart.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+def stable_hash(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8", "surrogatepass"), digest_size=8).digest(),
+                          "little", signed=True)
+
+class TTLCache:
+    def __init__(self, ttl: float, max_items: int = 4096, clock=time.monotonic, stable_keys: bool = False):
+        self.ttl = ttl
+        self.max_items = max(1, max_items)
+        self.clock = clock
+        if stable_keys:
+            self._key = self._stable_key
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _key(key):
+        return hash(key) if isinstance(key, str) else key
+
+    @staticmethod
+    def _stable_key(key):
+        return stable_hash(key) if isinstance(key, str) else key
+
+    def _expire(self, now: float):
+        data = self._data
+        while data:
+            key, (expires_at, _) = next(iter(data.items()))
+            if expires_at > now:
+                break
+            data.popitem(last=False)
+            self.expirations += 1
+
+    def _insert(self, key, value, now: float):
+        self._data[key] = (now + self.ttl, value)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def add(self, key) -> bool:
+        """True if `key` was not live (and is now recorded), False for a duplicate."""
+        now = self.clock()
+        self._expire(now)
+        key = self._key(key)
+        if key in self._data:
+            self.hits += 1
+            return False
+        self.misses += 1
+        self._insert(key, None, now)
+        return True
+
+    def get(self, key, default=None):
+        now = self.clock()
+        self._expire(now)
+        entry = self._data.get(self._key(key))
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value):
+        """Stores `value`; re-setting a live key keeps its original expiry."""
+        now = self.clock()
+        self._expire(now)
+        key = self._key(key)
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data[key] = (entry[0], value)
+        else:
+            self._insert(key, value, now)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(self._key(key), None)
+        return default if entry is None else entry[1]
+
+    def __contains__(self, key) -> bool:
+        self._expire(self.clock())
+        return self._key(key) in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def export(self, limit: int | None = None) -> list:
+        """[[key, wall-clock expiry, value]] of the newest `limit` live entries (keys as stored)."""
+        now, wall = self.clock(), time.time()
+        self._expire(now)
+        items = list(self._data.items())
+        if limit is not None:
+            items = items[-limit:] if limit > 0 else []
+        return [[key, round(wall + expires_at - now, 3), value] for key, (expires_at, value) in items]
+
+    def restore(self, entries, value=lambda v: v):
+        """Loads export() output, each entry keeping its remaining lifetime; `value` converts stored values."""
+        now, wall = self.clock(), time.time()
+        merged = list(self._data.items())
+        for key, wall_expiry, v in entries:
+            if wall_expiry > wall:
+                key = tuple(key) if isinstance(key, list) else key   # JSON round trip
+                merged.append((key, (now + wall_expiry - wall, value(v))))
+        merged.sort(key=lambda kv: kv[1][0])   # insertion order must stay expiry order
+        self._data = OrderedDict(merged)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations}
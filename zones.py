@@ -0,0 +1,140 @@
+"""
+Declarative capture zones.
+
+zones.json (path overridable with ASCENDEDSCOUT_ZONES or --zones) lists any
+number of zones; each one gets its own capture rectangle, preprocessing,
+OCR settings, parser and OCR worker:
+
+    {"zones": [
+      {"name": "top", "parser": "player",
+       "rect": {"top": 0, "left": 750, "width": 550, "height": 100},
+       "preprocess": ["gray", "upscale:2", "bilateral:7:55:55", "otsu", "dilate:2"],
+       "ocr": "--oem 3 --psm 7 -l eng", "queue": "drop-oldest"},
+      {"name": "client2.center", "parser": "center", "window": "ArkAscended",
+       "relative": true, "rect": {"top": 0.195, "left": 0.402, "width": 0.195, "height": 0.5},
+       "passes": ["red", "blue", "green", "general"], "scale": 2}
+    ]}
+
+"calibrated_for" ({"width", "height"}) is the screen size calibrate.py
+measured the zone on; the zone is recalibrated on any other resolution.
+
+rect is in screen pixels by default; with "monitor" (mss index) or "window"
+(title substring, Windows only) it is relative to that monitor / window client
+area, and with "relative": true it is a fraction of its size.
+"""
+import ctypes
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+
+PARSERS = ("player", "center")
+
+@dataclass
+class ZoneSpec:
+    name: str
+    rect: dict
+    parser: str                            # "player" | "center"
+    monitor: int | None = None
+    window: str | None = None
+    relative: bool = False
+    preprocess: list = field(default_factory=list)   # player zones: preprocess.build_chain() steps
+    passes: list = field(default_factory=list)       # center zones: segmenter passes
+    ocr: str | None = None                 # tesseract config, parser default if None
+    scale: int = 2                         # OCR upscale factor (center segmenter)
+    queue: str | None = None               # capture_pipeline policy, parser default if None
+    enabled: bool = True
+    calibrated_for: dict | None = None     # screen size of the last calibration (calibrate.py)
+
+    def __post_init__(self):
+        if self.parser not in PARSERS:
+            raise ValueError(f"Zone {self.name}: unsupported parser {self.parser!r}")
+        missing = {"top", "left", "width", "height"} - set(self.rect)
+        if missing:
+            raise ValueError(f"Zone {self.name}: rect is missing {sorted(missing)}")
+
+DEFAULT_ZONES = [
+    ZoneSpec("top", {"top": 0, "left": 750, "width": 550, "height": 100}, "player"),
+    ZoneSpec("center", {"top": 211, "left": 772, "width": 374, "height": 539}, "center"),
+]
+
+def default_path() -> str:
+    return os.getenv("ASCENDEDSCOUT_ZONES") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "zones.json")
+
+def load_zones(path: str | None = None, enabled_only: bool = True) -> list[ZoneSpec]:
+    """Enabled zones from the config file; the built-in 1920x1080 layout if there is none."""
+    path = path or default_path()
+    if not os.path.exists(path):
+        return list(DEFAULT_ZONES)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    specs = [ZoneSpec(**z) for z in data.get("zones", [])]
+    names = [z.name for z in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: duplicate zone names")
+    return [z for z in specs if z.enabled or not enabled_only]
+
+def save_zones(specs: list[ZoneSpec], path: str | None = None):
+    path = path or default_path()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"zones": [asdict(z) for z in specs]}, f, indent=2)
+        f.write("\n")
+
+# --------------------------------------------------------------------
+# Resolution to absolute mss rectangles
+# --------------------------------------------------------------------
+def window_rect(title: str) -> dict | None:
+    """Client area of the first visible window whose title contains `title` (Windows only)."""
+    if sys.platform != "win32":
+        return None
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    found = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def _enum(hwnd, _):
+        if user32.IsWindowVisible(hwnd):
+            buf = ctypes.create_unicode_buffer(512)
+            user32.GetWindowTextW(hwnd, buf, 512)
+            if title.lower() in buf.value.lower():
+                found.append(hwnd)
+                return False
+        return True
+
+    user32.EnumWindows(_enum, 0)
+    if not found:
+        return None
+    rc = wintypes.RECT()
+    user32.GetClientRect(found[0], ctypes.byref(rc))
+    origin = wintypes.POINT(0, 0)
+    user32.ClientToScreen(found[0], ctypes.byref(origin))
+    return {"top": origin.y, "left": origin.x, "width": rc.right - rc.left, "height": rc.bottom - rc.top}
+
+def _monitors() -> list[dict]:
+    from mss import mss
+    with mss() as sct:
+        return list(sct.monitors)
+
+def resolve(specs: list[ZoneSpec]) -> dict[str, dict]:
+    """{zone name: absolute mss rectangle}."""
+    monitors = None
+    out = {}
+    for z in specs:
+        parent = None
+        if z.window:
+            parent = window_rect(z.window)
+            if parent is None:
+                print(f"[ZONES] {z.name}: window {z.window!r} not found, using monitor coordinates")
+        if parent is None and z.monitor is not None:
+            monitors = monitors or _monitors()
+            parent = monitors[z.monitor]
+        r = z.rect
+        if z.relative:
+            if parent is None:
+                raise ValueError(f"Zone {z.name}: relative rect needs a monitor or window")
+            r = {"top": r["top"] * parent["height"], "left": r["left"] * parent["width"],
+                 "width": r["width"] * parent["width"], "height": r["height"] * parent["height"]}
+        ox, oy = (parent["left"], parent["top"]) if parent else (0, 0)
+        out[z.name] = {"top": int(round(oy + r["top"])), "left": int(round(ox + r["left"])),
+                       "width": max(1, int(round(r["width"]))), "height": max(1, int(round(r["height"])))}
+    return out